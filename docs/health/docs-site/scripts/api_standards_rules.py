@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Documentation Maintenance Agent - API Standards Rules
+Compiles the API naming standards once and checks paths and server URLs against them
+"""
+
+import copy
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from spec_loader import load_spec
+
+# The built-in standards; a YAML rules file overrides any of these keys
+DEFAULT_RULES: Dict[str, Any] = {
+    "api": {
+        "require_https": True,
+        "base_url_pattern": r"https://api\.zs-his\.com/v[0-9]+/",
+        "gateway_url_pattern": r"https://api\.zs-his\.com/v[0-9]+/",
+        "service_url_pattern": r"https://api\.zs-his\.com/v[0-9]+/[a-z-]+/",
+        "staging_marker": "staging",
+        "staging_url": "https://staging-api.zarishsphere.com",
+        "api_host": "api.zarishsphere.com",
+        "project_domains": ["zs-his.com", "zarishsphere.com"],
+        "resource_naming": {
+            "plural_nouns": True,
+            "kebab_case": True,
+            "segment_pattern": r"^[a-z]+(-[a-z]+)*$",
+            # Segments that are fine in the singular: actions and uncountable nouns
+            "singular_nouns": ["health", "auth", "login", "logout", "search", "status", "metadata"],
+            "irregular_plurals": ["people", "children", "data", "media", "criteria"]
+        }
+    },
+    "fhir": {
+        "resource_pattern": r"zarish-[a-z]+-[a-z]+-[0-9]+",
+        "terminology_url": "https://terminology.zs-his.com",
+        "structure_definition_url": "https://fhir.zs-his.com",
+        "value_set_url": "https://fhir.zs-his.com"
+    }
+}
+
+# (issues, warnings) found for one segment or URL
+Verdict = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+def merge_rules(base: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """``base`` with ``overrides`` applied; nested mappings are merged, other values replaced"""
+    merged = copy.deepcopy(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_rules(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+class StandardsRules:
+    """The API standards compiled into regexes and lookup sets
+
+    Every segment gets its verdict computed once: a spec with thousands of
+    paths repeats a handful of segments such as ``patients``, so after the
+    first few paths each segment costs a dict lookup.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = merge_rules(DEFAULT_RULES, config or {})
+        api = self.config["api"]
+        naming = api["resource_naming"]
+
+        self.require_https = bool(api.get("require_https", True))
+        self.base_url = re.compile(api["base_url_pattern"])
+        self.staging_marker = api.get("staging_marker")
+        self.staging_url = api.get("staging_url")
+        self.api_host = api.get("api_host")
+        self.project_domains = tuple(domain.lower() for domain in api.get("project_domains") or ())
+        self.segment_pattern = re.compile(naming["segment_pattern"]) if naming.get("kebab_case") else None
+        self.plural_nouns = bool(naming.get("plural_nouns"))
+        self.singular_nouns = frozenset(naming.get("singular_nouns") or ())
+        self.irregular_plurals = frozenset(naming.get("irregular_plurals") or ())
+        self.resource_pattern = re.compile(self.config["fhir"]["resource_pattern"])
+
+        self._segments: Dict[str, Verdict] = {}
+        self._servers: Dict[str, Verdict] = {}
+
+    @classmethod
+    def load(cls, file_path: str) -> "StandardsRules":
+        """Rules from a YAML file laid out like DEFAULT_RULES"""
+        config = load_spec(file_path)
+        if config is None:
+            config = {}
+        if not isinstance(config, dict):
+            raise ValueError(f"API standards rules in {file_path} must be a mapping")
+        return cls(config)
+
+    def is_project_host(self, host: str) -> bool:
+        """Whether a host belongs to one of the project's domains"""
+        return any(host == domain or host.endswith("." + domain) for domain in self.project_domains)
+
+    def is_plural(self, segment: str) -> bool:
+        """Whether a segment passes the plural-noun rule, judged by its last kebab-case word"""
+        if segment in self.singular_nouns:
+            return True
+        word = segment.rsplit('-', 1)[-1]
+        if word in self.singular_nouns or word in self.irregular_plurals:
+            return True
+        # "addresses" and "statuses" are plural, "address" and "status" are not
+        return word.endswith('s') and not word.endswith(('ss', 'us', 'is'))
+
+    def segment_verdict(self, segment: str) -> Verdict:
+        verdict = self._segments.get(segment)
+        if verdict is None:
+            issues = []
+            warnings = []
+            if self.segment_pattern is not None and not self.segment_pattern.match(segment):
+                issues.append(f"Path segment should be kebab-case: {segment}")
+            if self.plural_nouns and not self.is_plural(segment):
+                warnings.append(f"Path segment might need to be plural: {segment}")
+            verdict = self._segments[segment] = (tuple(issues), tuple(warnings))
+        return verdict
+
+    def server_verdict(self, url: str) -> Verdict:
+        verdict = self._servers.get(url)
+        if verdict is None:
+            issues = []
+            warnings = []
+            if self.require_https and not url.startswith("https://"):
+                issues.append(f"Server URL must use HTTPS: {url}")
+            if not self.base_url.match(url):
+                issues.append(f"Server URL doesn't match pattern: {url}")
+            if self.staging_marker and self.staging_marker in url and self.staging_url \
+                    and not url.startswith(self.staging_url):
+                host = self.staging_url.split("://", 1)[-1]
+                warnings.append(f"Staging URL should use {host}: {url}")
+            verdict = self._servers[url] = (tuple(issues), tuple(warnings))
+        return verdict
+
+    def check_path(self, path: str, issues: List[str], warnings: List[str]):
+        """Append the issues and warnings of every literal segment of a path"""
+        for segment in path.strip('/').split('/'):
+            if segment and not segment.startswith('{'):
+                segment_issues, segment_warnings = self.segment_verdict(segment)
+                issues.extend(segment_issues)
+                warnings.extend(segment_warnings)
+
+    def check_server_url(self, url: str, issues: List[str], warnings: List[str]):
+        url_issues, url_warnings = self.server_verdict(url)
+        issues.extend(url_issues)
+        warnings.extend(url_warnings)
@@ -4,19 +4,33 @@ ZARISH HIS API Standards Validator
 Validates API specifications against naming standards and conventions
 """
 
+import argparse
 import os
 import re
-import yaml
 import json
-from typing import Dict, List, Any, Tuple
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from api_standards_rules import StandardsRules
+from corpus_scanner import Checker, scan
+from spec_loader import load_spec
+from url_inventory import UrlInventory, url_host
+
+API_SPECS_DIR = "04-api-specifications"
+FHIR_NAMING_FILE = "01-standards/fhir-r5-naming.md"
+# Everything from the first path segment on, leaving the base of an API URL
+API_URL_PATH = re.compile(r'/[a-z-]+.*')
 
 class APIStandardsValidator:
     """Validates API specifications against ZARISH HIS standards"""
     
-    def __init__(self, docs_root: str):
+    def __init__(self, docs_root: str, inventory: Optional[UrlInventory] = None,
+                 rules: Optional[StandardsRules] = None):
         self.docs_root = docs_root
+        self.inventory = inventory
         self.issues = []
         self.warnings = []
+        self.rules = rules if rules is not None else StandardsRules()
         
         # Load standards from documentation
         self.api_standards = self._load_api_standards()
@@ -24,32 +38,15 @@ class APIStandardsValidator:
     
     def _load_api_standards(self) -> Dict[str, Any]:
         """Load API naming standards from documentation"""
-        standards = {
-            "base_url_pattern": r"https://api\.zs-his\.com/v[0-9]+/",
-            "gateway_url_pattern": r"https://api\.zs-his\.com/v[0-9]+/",
-            "service_url_pattern": r"https://api\.zs-his\.com/v[0-9]+/[a-z-]+/",
-            "resource_naming": {
-                "plural_nouns": True,
-                "kebab_case": True
-            }
-        }
-        
-        return standards
+        return self.rules.config["api"]
     
     def _load_fhir_standards(self) -> Dict[str, Any]:
         """Load FHIR R5 naming standards from documentation"""
-        standards = {
-            "resource_pattern": r"zarish-[a-z]+-[a-z]+-[0-9]+",
-            "terminology_url": "https://terminology.zs-his.com",
-            "structure_definition_url": "https://fhir.zs-his.com",
-            "value_set_url": "https://fhir.zs-his.com"
-        }
-        
-        return standards
+        return self.rules.config["fhir"]
     
     def validate_api_specifications(self) -> List[Dict[str, Any]]:
         """Validate all API specification files"""
-        api_specs_dir = os.path.join(self.docs_root, "04-api-specifications")
+        api_specs_dir = os.path.join(self.docs_root, API_SPECS_DIR)
         results = []
         
         if not os.path.exists(api_specs_dir):
@@ -67,8 +64,7 @@ class APIStandardsValidator:
     def _validate_api_spec_file(self, file_path: str) -> Dict[str, Any]:
         """Validate a single API specification file"""
         try:
-            with open(file_path, 'r') as f:
-                spec = yaml.safe_load(f)
+            spec = load_spec(file_path)
             
             result = {
                 "valid": True,
@@ -102,33 +98,11 @@ class APIStandardsValidator:
     
     def _validate_server_url(self, url: str, result: Dict[str, Any]):
         """Validate server URL against standards"""
-        # Check HTTPS
-        if not url.startswith("https://"):
-            result["issues"].append(f"Server URL must use HTTPS: {url}")
-        
-        # Check base URL pattern
-        if not re.match(self.api_standards["base_url_pattern"], url):
-            result["issues"].append(f"Server URL doesn't match pattern: {url}")
-        
-        # Check for staging URLs
-        if "staging" in url:
-            if not url.startswith("https://staging-api.zarishsphere.com"):
-                result["warnings"].append(f"Staging URL should use staging-api.zarishsphere.com: {url}")
+        self.rules.check_server_url(url, result["issues"], result["warnings"])
     
     def _validate_path(self, path: str, result: Dict[str, Any]):
         """Validate API path against naming conventions"""
-        # Check for plural nouns (basic check)
-        segments = path.strip('/').split('/')
-        
-        for segment in segments:
-            if segment and not segment.startswith('{'):
-                # Check kebab-case
-                if not re.match(r'^[a-z]+(-[a-z]+)*$', segment):
-                    result["issues"].append(f"Path segment should be kebab-case: {segment}")
-                
-                # Check for plural (basic heuristic)
-                if not segment.endswith('s') and segment not in ['health', 'auth', 'login']:
-                    result["warnings"].append(f"Path segment might need to be plural: {segment}")
+        self.rules.check_path(path, result["issues"], result["warnings"])
     
     def _validate_info_section(self, info: Dict[str, Any], result: Dict[str, Any]):
         """Validate API info section"""
@@ -150,10 +124,13 @@ class APIStandardsValidator:
         results = []
         
         # Check FHIR naming documentation
-        fhir_file = os.path.join(self.docs_root, "01-standards/fhir-r5-naming.md")
+        fhir_file = os.path.join(self.docs_root, FHIR_NAMING_FILE)
         if os.path.exists(fhir_file):
-            with open(fhir_file, 'r') as f:
+            with open(fhir_file, 'r', encoding='utf-8') as f:
                 content = f.read()
+            urls = UrlInventory()
+            urls.add(FHIR_NAMING_FILE, content)
+            insecure_hosts = {url_host(url) for url in urls if url.startswith("http://")}
             
             result = {
                 "file": "fhir-r5-naming.md",
@@ -163,15 +140,14 @@ class APIStandardsValidator:
             }
             
             # Check for HTTPS URLs
-            if "http://fhir.zs-his.com" in content:
+            if "fhir.zs-his.com" in insecure_hosts:
                 result["issues"].append("FHIR URLs must use HTTPS")
             
-            if "http://terminology.zs-his.com" in content:
+            if "terminology.zs-his.com" in insecure_hosts:
                 result["issues"].append("Terminology URLs must use HTTPS")
             
             # Check resource naming pattern
-            resource_pattern = r"zarish-[a-z]+-[a-z]+-[0-9]+"
-            if not re.search(resource_pattern, content):
+            if not self.rules.resource_pattern.search(content):
                 result["warnings"].append("Resource naming pattern may not be consistent")
             
             results.append(result)
@@ -181,157 +157,363 @@ class APIStandardsValidator:
     def validate_consistency(self) -> Dict[str, Any]:
         """Validate consistency across all documentation"""
         consistency_issues = []
+        locations = {}
         
-        # Check URL consistency across files
-        api_urls = self._extract_all_urls()
+        # Each distinct URL is checked once, however often it occurs
+        inventory = self._url_inventory()
         url_patterns = set()
+        deviating_url = None
         
-        for url in api_urls:
+        for url in inventory:
+            host = url_host(url)
+            if not self.rules.is_project_host(host):
+                continue
+            
+            if url.startswith("http://"):
+                issue = f"Project URL must use HTTPS: {url}"
+                consistency_issues.append(issue)
+                file_path, line, column = inventory.first(url)
+                locations[issue] = {"file": file_path, "line": line, "column": column,
+                                    "occurrences": len(inventory.occurrences(url))}
+            
             # Extract base pattern
-            if "api.zarishsphere.com" in url:
-                pattern = re.sub(r'/[a-z-]+.*', '', url)
-                url_patterns.add(pattern)
+            if host == self.rules.api_host:
+                url_patterns.add(API_URL_PATH.sub('', url))
+                if len(url_patterns) > 1 and deviating_url is None:
+                    deviating_url = url
         
         if len(url_patterns) > 1:
-            consistency_issues.append(f"Inconsistent API URL patterns found: {url_patterns}")
+            issue = f"Inconsistent API URL patterns found: {url_patterns}"
+            consistency_issues.append(issue)
+            # Point at the first URL that doesn't share the pattern seen before it
+            file_path, line, column = inventory.first(deviating_url)
+            locations[issue] = {"file": file_path, "line": line, "column": column,
+                                "occurrences": len(inventory.occurrences(deviating_url))}
         
         return {
             "consistent": len(consistency_issues) == 0,
-            "issues": consistency_issues
+            "issues": consistency_issues,
+            "locations": locations
         }
     
-    def _extract_all_urls(self) -> List[str]:
-        """Extract all URLs from documentation"""
-        urls = []
-        
-        for root, dirs, files in os.walk(self.docs_root):
-            for file in files:
-                if file.endswith(('.md', '.yaml', '.yml')):
-                    file_path = os.path.join(root, file)
-                    try:
-                        with open(file_path, 'r') as f:
-                            content = f.read()
-                        
-                        # Find URLs
-                        url_pattern = r'https?://[^\s\'"<>]+'
-                        matches = re.findall(url_pattern, content)
-                        urls.extend(matches)
-                    except:
-                        continue
+    def _url_inventory(self) -> UrlInventory:
+        """Index every URL in the documentation"""
+        if self.inventory is None:
+            collector = UrlCollector()
+            scan(self.docs_root, collector)
+            self.inventory = collector.inventory
         
-        return urls
+        return self.inventory
+    
+    def validate(self) -> "ValidationResults":
+        """Run every validation once"""
+        return ValidationResults(
+            self.docs_root,
+            self.validate_api_specifications(),
+            self.validate_fhir_standards(),
+            self.validate_consistency(),
+            self._get_timestamp()
+        )
     
     def generate_validation_report(self) -> str:
         """Generate comprehensive validation report"""
+        return self.validate().to_markdown()
+    
+    def _get_timestamp(self) -> str:
+        """Get current timestamp"""
+        from datetime import datetime
+        return datetime.now().isoformat()
+
+class ValidationResults:
+    """The findings of one validation run, rendered to Markdown, JSON or SARIF
+    
+    The validations walk the specs and the whole docs tree, so they run once
+    and every report format is produced from the same results.
+    """
+    
+    # SARIF rule id, description and the message prefix that identifies it
+    RULES = [
+        ("spec-parse", "API specifications must parse", "Failed to parse YAML"),
+        ("server-https", "Server URLs must use HTTPS", "Server URL must use HTTPS"),
+        ("server-url-pattern", "Server URLs must follow the API URL pattern", "Server URL doesn't match pattern"),
+        ("staging-url", "Staging servers must use the staging host", "Staging URL should use"),
+        ("kebab-case-segment", "Path segments must be kebab-case", "Path segment should be kebab-case"),
+        ("plural-segment", "Collection path segments should be plural nouns", "Path segment might need to be plural"),
+        ("contact-email", "Contact emails should use the project domain", "Contact email should use"),
+        ("license-https", "License URLs must use HTTPS", "License URL must use HTTPS"),
+        ("project-url-https", "Project URLs must use HTTPS", "Project URL must use HTTPS"),
+        ("fhir-https", "FHIR and terminology URLs must use HTTPS", "URLs must use HTTPS"),
+        ("fhir-resource-naming", "FHIR resources should follow the naming pattern", "Resource naming pattern"),
+        ("url-consistency", "API URLs should share one base pattern", "Inconsistent API URL patterns"),
+    ]
+    
+    def __init__(self, docs_root: str, api_specifications: List[Dict[str, Any]],
+                 fhir_standards: List[Dict[str, Any]], consistency: Dict[str, Any], generated_at: str):
+        self.docs_root = docs_root
+        self.api_specifications = api_specifications
+        self.fhir_standards = fhir_standards
+        self.consistency = consistency
+        self.generated_at = generated_at
+    
+    @property
+    def total_issues(self) -> int:
+        total = sum(len(r.get("issues", [])) for r in self.api_specifications + self.fhir_standards)
+        if not self.consistency["consistent"]:
+            total += len(self.consistency["issues"])
+        return total
+    
+    @property
+    def total_warnings(self) -> int:
+        return sum(len(r.get("warnings", [])) for r in self.api_specifications + self.fhir_standards)
+    
+    def to_markdown(self) -> str:
+        """The human-readable validation report"""
         report = []
         report.append("# ZARISH HIS API Standards Validation Report")
-        report.append(f"Generated: {self._get_timestamp()}")
+        report.append("")
+        report.append(f"Generated: {self.generated_at}")
         report.append("")
         
         # API Specifications Validation
         report.append("## 📋 API Specifications Validation")
-        api_results = self.validate_api_specifications()
-        
-        for result in api_results:
+        report.append("")
+        for result in self.api_specifications:
             if "error" in result:
                 report.append(f"### ❌ {result.get('file', 'Unknown')}")
+                report.append("")
                 report.append(f"- Error: {result['error']}")
             else:
-                status = "✅" if result["valid"] else "❌"
-                report.append(f"### {status} {result.get('file', 'Unknown')}")
-                
-                if result["issues"]:
-                    report.append("**Issues:**")
-                    for issue in result["issues"]:
-                        report.append(f"- ❌ {issue}")
-                
-                if result["warnings"]:
-                    report.append("**Warnings:**")
-                    for warning in result["warnings"]:
-                        report.append(f"- ⚠️ {warning}")
+                self._append_result(report, result)
             report.append("")
         
         # FHIR Standards Validation
         report.append("## 🏥 FHIR R5 Standards Validation")
-        fhir_results = self.validate_fhir_standards()
-        
-        for result in fhir_results:
-            status = "✅" if result["valid"] else "❌"
-            report.append(f"### {status} {result.get('file', 'Unknown')}")
-            
-            if result["issues"]:
-                report.append("**Issues:**")
-                for issue in result["issues"]:
-                    report.append(f"- ❌ {issue}")
-            
-            if result["warnings"]:
-                report.append("**Warnings:**")
-                for warning in result["warnings"]:
-                    report.append(f"- ⚠️ {warning}")
+        report.append("")
+        for result in self.fhir_standards:
+            self._append_result(report, result)
             report.append("")
         
         # Consistency Check
         report.append("## 🔄 Consistency Check")
-        consistency = self.validate_consistency()
-        
-        if consistency["consistent"]:
+        report.append("")
+        if self.consistency["consistent"]:
             report.append("✅ All documentation is consistent")
         else:
             report.append("❌ Consistency issues found:")
-            for issue in consistency["issues"]:
+            for issue in self.consistency["issues"]:
                 report.append(f"- {issue}")
         
         report.append("")
         report.append("## 📊 Summary")
+        report.append("")
         
-        total_issues = sum(len(r.get("issues", [])) for r in api_results + fhir_results)
-        total_warnings = sum(len(r.get("warnings", [])) for r in api_results + fhir_results)
-        
-        if not consistency["consistent"]:
-            total_issues += len(consistency["issues"])
-        
-        if total_issues == 0 and total_warnings == 0:
+        if self.total_issues == 0 and self.total_warnings == 0:
             report.append("🎉 All standards are compliant!")
         else:
-            report.append(f"- **Total Issues**: {total_issues}")
-            report.append(f"- **Total Warnings**: {total_warnings}")
+            report.append(f"- **Total Issues**: {self.total_issues}")
+            report.append(f"- **Total Warnings**: {self.total_warnings}")
         
         return "\n".join(report)
     
-    def _get_timestamp(self) -> str:
-        """Get current timestamp"""
-        from datetime import datetime
-        return datetime.now().isoformat()
+    @staticmethod
+    def _append_result(report: List[str], result: Dict[str, Any]):
+        status = "✅" if result["valid"] else "❌"
+        report.append(f"### {status} {result.get('file', 'Unknown')}")
+        report.append("")
+        
+        if result["issues"]:
+            report.append("**Issues:**")
+            for issue in result["issues"]:
+                report.append(f"- ❌ {issue}")
+        
+        if result["warnings"]:
+            report.append("**Warnings:**")
+            for warning in result["warnings"]:
+                report.append(f"- ⚠️ {warning}")
+    
+    def to_json(self) -> Dict[str, Any]:
+        """The results for programmatic access"""
+        return {
+            "api_specifications": self.api_specifications,
+            "fhir_standards": self.fhir_standards,
+            "consistency": self.consistency,
+            "generated_at": self.generated_at
+        }
+    
+    def to_sarif(self) -> Dict[str, Any]:
+        """The results as a SARIF 2.1.0 log, for code scanning annotations in CI"""
+        sarif_results = []
+        # (rule, message, uri) -> how many times it was reported so far
+        repeats: Dict[Tuple[str, str, str], int] = {}
+        lines_cache: Dict[str, List[str]] = {}
+        
+        def add(message: str, level: str, uri: Optional[str], line: Optional[int] = None,
+                column: Optional[int] = None):
+            if uri is None:
+                # Code scanning rejects results without a location
+                return
+            rule_id = self._rule_id(message)
+            key = (rule_id, message, uri)
+            repeat = repeats.get(key, 0)
+            repeats[key] = repeat + 1
+            
+            location = {"artifactLocation": {"uri": uri, "uriBaseId": "DOCSROOT"}}
+            if line is None:
+                # A repeated finding, e.g. one segment in several paths, points at its next mention
+                line = self._find_line(uri, message, rule_id, lines_cache, repeat)
+            if line is not None:
+                location["region"] = {"startLine": line}
+                if column is not None:
+                    location["region"]["startColumn"] = column
+            sarif_results.append({"ruleId": rule_id, "level": level, "message": {"text": message},
+                                  "locations": [{"physicalLocation": location}]})
+        
+        for result in self.api_specifications:
+            uri = f"{API_SPECS_DIR}/{result['file']}" if "file" in result else None
+            for issue in result.get("issues", []):
+                add(issue, "error", uri)
+            for warning in result.get("warnings", []):
+                add(warning, "warning", uri)
+        for result in self.fhir_standards:
+            for issue in result.get("issues", []):
+                add(issue, "error", FHIR_NAMING_FILE)
+            for warning in result.get("warnings", []):
+                add(warning, "warning", FHIR_NAMING_FILE)
+        for issue in self.consistency["issues"]:
+            location = self.consistency.get("locations", {}).get(issue)
+            if location:
+                add(issue, "error", location["file"], location["line"], location["column"])
+        
+        return {
+            "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+            "version": "2.1.0",
+            "runs": [{
+                "tool": {"driver": {
+                    "name": "api-standards-validator",
+                    "rules": [{"id": rule_id, "shortDescription": {"text": description}}
+                              for rule_id, description, _ in self.RULES]
+                }},
+                "originalUriBaseIds": {"DOCSROOT": {"uri": Path(os.path.abspath(self.docs_root)).as_uri() + "/"}},
+                "invocations": [{"executionSuccessful": True}],
+                "results": sarif_results
+            }]
+        }
+    
+    def _rule_id(self, message: str) -> str:
+        for rule_id, _, prefix in self.RULES:
+            if prefix in message:
+                return rule_id
+        return "api-standards"
+    
+    def _find_line(self, uri: str, message: str, rule_id: str, lines_cache: Dict[str, List[str]],
+                   repeat: int = 0) -> Optional[int]:
+        """The line of the ``repeat``-th mention of the value a message is about (the last one if fewer)"""
+        _, _, value = message.partition(": ")
+        if not value:
+            return None
+        if uri not in lines_cache:
+            try:
+                with open(os.path.join(self.docs_root, uri), 'r', encoding='utf-8') as f:
+                    lines_cache[uri] = f.read().splitlines()
+            except (OSError, UnicodeDecodeError):
+                lines_cache[uri] = []
+        # Segment findings point at a path key, not at a server URL sharing the word
+        paths_only = rule_id in ("kebab-case-segment", "plural-segment")
+        found = None
+        for number, line in enumerate(lines_cache[uri], 1):
+            if value in line and (not paths_only or line.lstrip().startswith('/')):
+                found = number
+                if repeat == 0:
+                    break
+                repeat -= 1
+        return found
+
+class UrlCollector(Checker):
+    """Corpus scanner plugin collecting URLs for the consistency check"""
+    
+    name = "api-standards-urls"
+    extensions = ('.md', '.yaml', '.yml')
+    
+    def __init__(self, subdir: Optional[str] = None, docs_root: Optional[str] = None):
+        super().__init__(subdir)
+        self.docs_root = docs_root
+        self.inventory = UrlInventory()
+        self.errors = []
+    
+    @property
+    def urls(self) -> List[str]:
+        """Distinct URLs found in the documentation"""
+        return self.inventory.urls
+    
+    def visit(self, file):
+        try:
+            content = file.text
+        except (OSError, UnicodeDecodeError) as e:
+            self.errors.append(f"Could not read {file.relative_path}: {e}")
+            return
+        
+        self.inventory.add(file.relative_path.replace(os.sep, '/'), content)
+    
+    def report(self) -> bool:
+        print(f"🔗 Collected {len(self.inventory)} distinct URLs ({self.inventory.total} occurrences)")
+        for error in self.errors:
+            print(f"  ⚠️ {error}")
+        if self.docs_root is None:
+            return True
+        
+        consistency = APIStandardsValidator(self.docs_root, inventory=self.inventory).validate_consistency()
+        if consistency["consistent"]:
+            print("✅ API URL patterns are consistent!")
+            return True
+        
+        print("❌ Consistency issues found:")
+        for issue in consistency["issues"]:
+            location = consistency["locations"].get(issue)
+            if location:
+                print(f"  • {issue} ({location['file']}:{location['line']}:{location['column']}, "
+                      f"{location['occurrences']} occurrences)")
+            else:
+                print(f"  • {issue}")
+        return False
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Validate API specifications against the naming standards")
+    parser.add_argument("--rules", help="YAML file overriding the built-in standards")
+    parser.add_argument("--format", choices=["markdown", "json", "sarif"],
+                        help="Write only this report format (default: the Markdown and JSON reports in the docs root)")
+    parser.add_argument("--output", "-o", help="Where --format writes its report (default: standard output)")
+    args = parser.parse_args()
+    
     docs_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    validator = APIStandardsValidator(docs_root)
+    rules = StandardsRules.load(args.rules) if args.rules else None
+    validator = APIStandardsValidator(docs_root, rules=rules)
+    results = validator.validate()
+    
+    if args.format:
+        if args.format == "markdown":
+            rendered = results.to_markdown()
+        else:
+            rendered = json.dumps(results.to_sarif() if args.format == "sarif" else results.to_json(), indent=2)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(rendered)
+            print(f"✅ {args.format} report saved to: {args.output}")
+        else:
+            print(rendered)
+        return
     
     # Generate and save report
-    report = validator.generate_validation_report()
     report_path = os.path.join(docs_root, "API-STANDARDS-VALIDATION.md")
-    
     with open(report_path, 'w') as f:
-        f.write(report)
+        f.write(results.to_markdown())
     
     print(f"✅ API standards validation report saved to: {report_path}")
     
     # Also save JSON for programmatic access
-    api_results = validator.validate_api_specifications()
-    fhir_results = validator.validate_fhir_standards()
-    consistency = validator.validate_consistency()
-    
-    json_data = {
-        "api_specifications": api_results,
-        "fhir_standards": fhir_results,
-        "consistency": consistency,
-        "generated_at": validator._get_timestamp()
-    }
-    
     json_path = os.path.join(docs_root, "api-standards-validation.json")
     with open(json_path, 'w') as f:
-        json.dump(json_data, f, indent=2)
+        json.dump(results.to_json(), f, indent=2)
     
     print(f"✅ Validation data saved to: {json_path}")
 
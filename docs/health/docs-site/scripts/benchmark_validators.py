@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Documentation Maintenance Agent - Validator Benchmarks
+Times the validators on synthetic corpora at several scales and gates on regressions
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from api_standards_validator import APIStandardsValidator
+from check_api_examples import check_api_examples
+from enforce_markdown_linting import lint_markdown
+from form_snapshot import FORMS_DIR
+from generate_form_schema_index import generate_form_table, get_form_schemas, update_readme
+from spec_loader import default_loader
+from validate_api_docs import validate_api_docs
+from validate_internal_links import validate_links
+from verify_directory_structure import report_issues
+
+TOOLS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tools")
+API_SPECS_DIR = "04-api-specifications"
+FHIR_DIR = "fhir"
+PAGES_DIR = "guides"
+
+REPORT_VERSION = 1
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.25
+# Timings closer than this are noise, whatever their ratio
+NOISE_FLOOR = 0.005
+# The entries of benchmarks(), in run order
+BENCHMARK_NAMES = ("fhir-validator", "fhir-validator-legacy", "internal-links", "markdown-lint",
+                   "api-docs", "api-examples", "api-standards", "form-index")
+
+# Corpus size at 1x
+BASE_SIZES = {
+    "patients": 100,
+    "encounters": 100,
+    "observations": 200,
+    "pages": 20,
+    "specs": 4,
+    "forms": 5
+}
+
+ZS = "https://fhir.zs-his.com"
+SERVICE_TYPES = [(str(code), name) for code, name in enumerate(
+    ["General Practice", "Specialist", "Emergency", "Inpatient", "Outpatient", "Diagnostic"], 1)]
+OBSERVATION_CODES = [("8480-6", "Systolic Blood Pressure", "mm[Hg]"), ("8462-4", "Diastolic Blood Pressure", "mm[Hg]"),
+                     ("8867-4", "Heart rate", "/min"), ("8310-5", "Body temperature", "Cel"),
+                     ("29463-7", "Body weight", "kg"), ("2339-0", "Glucose", "mg/dL")]
+CAMPS = ["KTP", "BLK", "JMT", "NYP"]
+ENCOUNTERS = ["Adult Consultation", "Antenatal Care", "NCD Follow-up", "Child Health", "Mental Health"]
+NAMES = ["Rahman", "Begum", "Hossain", "Akter", "Uddin", "Khatun", "Alam", "Islam"]
+
+def load_fhir_validator():
+    """Import tools/validate-fhir-resources.py, whose name isn't importable directly"""
+    if TOOLS_DIR not in sys.path:
+        sys.path.insert(0, TOOLS_DIR)
+    spec = importlib.util.spec_from_file_location(
+        "validate_fhir_resources", os.path.join(TOOLS_DIR, "validate-fhir-resources.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+class CorpusGenerator:
+    """Writes a deterministic synthetic documentation tree for one scale
+
+    The tree mirrors the real one: FHIR resources as Bulk Data NDJSON,
+    markdown guides that link to each other, OpenAPI specifications under
+    04-api-specifications and forms in the forms-registry layout.
+    """
+
+    def __init__(self, root: str, scale: int, seed: int = 0):
+        self.root = root
+        self.scale = scale
+        self.random = random.Random(seed * 1000 + scale)
+        self.sizes = {name: size * scale for name, size in BASE_SIZES.items()}
+
+    def generate(self) -> Dict[str, int]:
+        """Write the corpus and return the number of items of each kind"""
+        self.write_fhir()
+        self.write_pages()
+        self.write_specs()
+        self.write_forms()
+        return dict(self.sizes, resources=self.sizes["patients"] + self.sizes["encounters"]
+                    + self.sizes["observations"])
+
+    def _path(self, *parts: str) -> str:
+        path = os.path.join(self.root, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def _write_ndjson(self, filename: str, resources):
+        with open(self._path(FHIR_DIR, filename), 'w', encoding='utf-8') as f:
+            for resource in resources:
+                f.write(json.dumps(resource) + "\n")
+
+    def _digits(self, count: int) -> str:
+        return "".join(self.random.choice("0123456789") for _ in range(count))
+
+    def write_fhir(self):
+        self._write_ndjson("Patient.ndjson", (self.patient(i) for i in range(self.sizes["patients"])))
+        self._write_ndjson("Encounter.ndjson", (self.encounter(i) for i in range(self.sizes["encounters"])))
+        self._write_ndjson("Observation.ndjson", (self.observation(i) for i in range(self.sizes["observations"])))
+
+    def _identifier(self, type_system: str, code: str, system: str, value: str) -> Dict[str, Any]:
+        return {"type": {"coding": [{"system": type_system, "code": code}]}, "system": system, "value": value}
+
+    def patient(self, index: int) -> Dict[str, Any]:
+        rohingya = self.random.random() < 0.4
+        identifiers = [self._identifier(f"{ZS}/CodeSystem/identifier-type", "MRN", f"{ZS}/identifier/mrn",
+                                        f"ZARISH{index:08d}")]
+        if rohingya:
+            refugee_types = f"{ZS}/CodeSystem/refugee-identifier-type"
+            identifiers.append(self._identifier(refugee_types, "PROGRESS_ID", f"{ZS}/identifier/progress",
+                                                f"PROG{self._digits(9)}"))
+            if self.random.random() < 0.5:
+                block = self.random.choice("ABCDEFG")
+                identifiers.append(self._identifier(refugee_types, "FCN", f"{ZS}/identifier/fcn",
+                                                    f"FCN-{self.random.choice(CAMPS)}-BLOCK-{block}-{self._digits(3)}"))
+            address_extension = {"url": f"{ZS}/StructureDefinition/camp-information",
+                                 "valueString": f"Camp {self.random.randint(1, 27)}"}
+        else:
+            # A few malformed NIDs keep the error paths in the measurement
+            nid = self._digits(13) if self.random.random() < 0.95 else self._digits(10)
+            identifiers.append(self._identifier(f"{ZS}/CodeSystem/identifier-type", "NID", "https://nid.gov.bd", nid))
+            address_extension = {"url": f"{ZS}/StructureDefinition/administrative-boundaries",
+                                 "valueString": f"BD.{self.random.randint(10, 60)}.{self.random.randint(1, 40)}"}
+
+        return {
+            "resourceType": "Patient",
+            "id": f"patient-{index}",
+            "extension": [{
+                "url": f"{ZS}/StructureDefinition/patient-nationality",
+                "valueCodeableConcept": {"coding": [{"system": "urn:iso:std:iso:3166",
+                                                     "code": "ROH" if rohingya else "BD"}]}
+            }],
+            "identifier": identifiers,
+            "name": [{"use": "official", "family": self.random.choice(NAMES),
+                      "given": [self.random.choice(NAMES)]}],
+            "gender": self.random.choice(["male", "female"]),
+            "birthDate": f"{self.random.randint(1940, 2024)}-{self.random.randint(1, 12):02d}-{self.random.randint(1, 28):02d}",
+            "address": [{"use": "home", "district": "Cox's Bazar", "country": "BD", "extension": [address_extension]}]
+        }
+
+    def encounter(self, index: int) -> Dict[str, Any]:
+        code, name = self.random.choice(SERVICE_TYPES)
+        return {
+            "resourceType": "Encounter",
+            "id": f"encounter-{index}",
+            "extension": [{"url": f"{ZS}/StructureDefinition/service-type",
+                           "valueCodeableConcept": {"coding": [{"code": self.random.choice(["GOPD", "NCD", "MATERNAL"])}]}}],
+            "identifier": [{"system": f"{ZS}/identifier/encounter", "value": f"ENC{index:08d}"}],
+            "status": "completed",
+            "class": {"system": "http://terminology.hl7.org/CodeSystem/v3-ActCode", "code": "AMB"},
+            "type": [{"text": self.random.choice(ENCOUNTERS)}],
+            "serviceType": {"coding": [{"system": "http://terminology.hl7.org/CodeSystem/service-type",
+                                        "code": code, "display": name}]},
+            "subject": {"reference": f"Patient/patient-{self.random.randrange(self.sizes['patients'])}"},
+            "period": {"start": "2026-01-15T09:00:00+06:00", "end": "2026-01-15T09:20:00+06:00"},
+            "location": [{"location": {"reference": "Location/camp-clinic-1"}}]
+        }
+
+    def observation(self, index: int) -> Dict[str, Any]:
+        code, name, unit = self.random.choice(OBSERVATION_CODES)
+        return {
+            "resourceType": "Observation",
+            "id": f"observation-{index}",
+            "identifier": [{"system": f"{ZS}/identifier/observation", "value": f"OBS{index:08d}"}],
+            "status": "final",
+            "category": [{"coding": [{"system": "http://terminology.hl7.org/CodeSystem/observation-category",
+                                      "code": "vital-signs"}]}],
+            "code": {"coding": [{"system": "http://loinc.org", "code": code, "display": name}]},
+            "subject": {"reference": f"Patient/patient-{self.random.randrange(self.sizes['patients'])}"},
+            "effectiveDateTime": "2026-01-15T09:05:00+06:00",
+            "valueQuantity": {"value": round(self.random.uniform(30, 180), 1), "unit": unit}
+        }
+
+    def write_pages(self):
+        count = self.sizes["pages"]
+        for index in range(count):
+            lines = [f"# Guide {index}", "", "## Overview", "",
+                     f"Part of the synthetic corpus; see the [API](https://api.zs-his.com/v1/patients).", ""]
+            for _ in range(5):
+                target = self.random.randrange(count)
+                anchor = "#overview" if self.random.random() < 0.5 else ""
+                lines.append(f"- [Guide {target}](../section-{target % 10}/guide-{target}.md{anchor})")
+            lines += ["", "## Details", "", "```bash", "echo example", "```", ""]
+            with open(self._path(PAGES_DIR, f"section-{index % 10}", f"guide-{index}.md"), 'w', encoding='utf-8') as f:
+                f.write("\n".join(lines))
+
+    def write_specs(self):
+        for index in range(self.sizes["specs"]):
+            lines = ["openapi: 3.0.3", "info:", f"  title: Service {index} API", "  version: 1.0.0",
+                     "  contact:", "    email: api@zs-his.com", "servers:",
+                     f"  - url: https://api.zs-his.com/v1/service-{index}s/", "paths:"]
+            for resource in ("patients", "encounters", "observations", "appointments"):
+                lines += [f"  /{resource}:", "    get:", f"      summary: List {resource}", "      responses:",
+                          "        '200':", "          description: OK", "          content:",
+                          "            application/json:", "              example:", "                total: 1",
+                          "    post:", f"      summary: Create one of {resource}", "      requestBody:",
+                          "        content:", "          application/json:", "            example:",
+                          "              id: example", "      responses:", "        '201':",
+                          "          description: Created",
+                          f"  /{resource}/{{id}}:", "    get:", f"      summary: Read one of {resource}",
+                          "      responses:", "        '200':", "          description: OK"]
+            with open(self._path(API_SPECS_DIR, f"service-{index}-api.yaml"), 'w', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+
+    def write_forms(self):
+        for index in range(self.sizes["forms"]):
+            encounter = self.random.choice(ENCOUNTERS)
+            form = {
+                "name": f"{encounter} Form {index}",
+                "description": f"Synthetic {encounter.lower()} form",
+                "version": "1",
+                "published": True,
+                "uuid": str(uuid.UUID(int=self.random.getrandbits(128))),
+                "retired": False,
+                "encounter": encounter,
+                "encounterType": str(uuid.UUID(int=self.random.getrandbits(128))),
+                "pages": [{"label": f"Page {page}", "sections": [self.form_section(section) for section in range(4)]}
+                          for page in range(3)]
+            }
+            with open(self._path(FORMS_DIR, f"synthetic-form-{index}.json"), 'w', encoding='utf-8') as f:
+                json.dump(form, f, indent=2)
+
+    def form_section(self, index: int) -> Dict[str, Any]:
+        questions = []
+        for number in range(8):
+            answers = [{"concept": str(uuid.UUID(int=self.random.getrandbits(128))), "label": label}
+                       for label in ("Yes", "No", "Unknown")]
+            questions.append({
+                "label": f"Question {index}.{number}?",
+                "type": "obs",
+                "id": f"q{index}_{number}",
+                "questionOptions": {"rendering": "select",
+                                    "concept": str(uuid.UUID(int=self.random.getrandbits(128))),
+                                    "answers": answers}
+            })
+        return {"label": f"Section {index}", "isExpanded": "true", "questions": questions}
+
+def benchmarks(root: str) -> Dict[str, Tuple[str, Callable[[], Any]]]:
+    """Benchmark name -> (item kind, callable) over the corpus at ``root``"""
+    fhir = load_fhir_validator()
+    profiles = fhir.load_profiles(cache_path=None, terminology_cache=None)
+    fhir_files = sorted(os.path.join(root, FHIR_DIR, name) for name in os.listdir(os.path.join(root, FHIR_DIR)))
+    api_dir = os.path.join(root, API_SPECS_DIR)
+    forms_dir = os.path.join(root, FORMS_DIR)
+    readme_path = os.path.join(root, "05-metadata-forms", "README.md")
+
+    def fhir_validator(validator):
+        return lambda: sum(1 for _ in validator.validate_files(fhir_files))
+
+    def form_index():
+        forms = get_form_schemas(forms_dir)
+        update_readme(readme_path, generate_form_table(forms))
+
+    return {
+        "fhir-validator": ("resources", fhir_validator(fhir.FHIRValidator(profiles))),
+        "fhir-validator-legacy": ("resources", fhir_validator(fhir.FHIRValidator())),
+        "internal-links": ("pages", lambda: validate_links(root)),
+        "markdown-lint": ("pages", lambda: lint_markdown(root)),
+        "api-docs": ("specs", lambda: validate_api_docs(api_dir)),
+        "api-examples": ("specs", lambda: check_api_examples(api_dir)),
+        "api-standards": ("specs", lambda: APIStandardsValidator(root).validate_api_specifications()),
+        "form-index": ("forms", form_index)
+    }
+
+def measure(run: Callable[[], Any], repeat: int) -> List[float]:
+    """Wall-clock seconds of ``repeat`` cold runs, with the validators' output suppressed"""
+    timings = []
+    for _ in range(repeat):
+        default_loader.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+    return timings
+
+def run_benchmarks(scales: List[int], repeat: int, seed: int, only: Optional[List[str]] = None,
+                   corpus_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Generate a corpus per scale, time every benchmark on it and return the report"""
+    results: Dict[str, Dict[str, Any]] = {}
+    for scale in scales:
+        root = tempfile.mkdtemp(prefix=f"zarish-bench-{scale}x-") if corpus_dir is None \
+            else os.path.join(corpus_dir, f"{scale}x")
+        try:
+            print(f"🏗️  Generating {scale}x corpus...")
+            sizes = CorpusGenerator(root, scale, seed).generate()
+            for name, (kind, run) in benchmarks(root).items():
+                if only and name not in only:
+                    continue
+                timings = measure(run, repeat)
+                best = min(timings)
+                results.setdefault(name, {})[str(scale)] = {
+                    "items": sizes[kind],
+                    "unit": kind,
+                    "min": best,
+                    "median": statistics.median(timings),
+                    "items_per_second": sizes[kind] / best if best > 0 else None
+                }
+                print(f"  ⏱️  {name:<22} {scale:>4}x {sizes[kind]:>8} {kind:<10} {best:8.4f}s")
+        finally:
+            if corpus_dir is None:
+                shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "version": REPORT_VERSION,
+        "generated_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": results
+    }
+
+def compare_reports(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Regressions of more than ``threshold`` (a fraction) over the baseline's best times
+
+    A baseline measurement this run has no comparable result for (not run,
+    or run on a different corpus size) is reported too, so narrowing a run
+    with ``--only`` or ``--scales`` can't pass the gate unnoticed.
+    """
+    regressions = []
+    for name, scales in baseline.get("results", {}).items():
+        for scale, previous in scales.items():
+            current = report["results"].get(name, {}).get(scale)
+            if current is None:
+                regressions.append(f"{name} at {scale}x: in the baseline but not measured in this run")
+                continue
+            if previous.get("items") != current["items"]:
+                regressions.append(f"{name} at {scale}x: corpus size changed ({previous.get('items')} -> "
+                                   f"{current['items']} {current['unit']}), can't compare")
+                continue
+            slowdown = current["min"] - previous["min"]
+            if slowdown > NOISE_FLOOR and current["min"] > previous["min"] * (1 + threshold):
+                regressions.append(f"{name} at {scale}x: {previous['min']:.4f}s -> {current['min']:.4f}s "
+                                   f"(+{slowdown / previous['min']:.0%})")
+    return regressions
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark the validators on synthetic corpora")
+    parser.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                        help="Comma-separated corpus scales (default: 1,10,100)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"Runs per benchmark; the fastest is reported (default: {DEFAULT_REPEAT})")
+    parser.add_argument("--only", action="append", choices=BENCHMARK_NAMES,
+                        help="Run only this benchmark (repeatable)")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus generator seed")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    parser.add_argument("--baseline", help="Compare against a previous JSON report")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed slowdown over the baseline, as a fraction (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--keep-corpus", metavar="DIR", help="Generate the corpora under DIR and keep them")
+    args = parser.parse_args()
+
+    scales = [int(scale) for scale in args.scales.split(",")]
+    print(f"📈 Benchmarking validators at {', '.join(f'{scale}x' for scale in scales)}...")
+    report = run_benchmarks(scales, args.repeat, args.seed, args.only, args.keep_corpus)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Benchmark report saved to: {args.output}")
+
+    if not args.baseline:
+        sys.exit(0)
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    print(f"\n🔍 Comparing against {args.baseline} (threshold {args.threshold:.0%})...")
+    regressions = compare_reports(report, baseline, args.threshold)
+    success = report_issues(regressions, "✅ No performance regressions!")
+    sys.exit(0 if success else 1)
+
+if __name__ == "__main__":
+    main()
@@ -4,41 +4,83 @@ API Examples Checker
 Checks if API documentation includes proper examples
 """
 
+import argparse
 import os
 import sys
-import yaml
 import json
 from pathlib import Path
 
-def check_api_examples(api_dir):
+from corpus_scanner import Checker, scan
+from spec_loader import find_spec_files, map_specs, parse_spec
+from schema_validator import REQUEST, RESPONSE, SchemaCompiler, check_media_examples
+from spec_resolver import SpecResolver, resolve_spec, unwrap
+
+def check_api_examples(api_dir, jobs=1):
     """Check API documentation for examples"""
     print("📋 Checking API examples and documentation...")
     
-    issues = []
+    if jobs > 1:
+        files = find_spec_files(api_dir)
+        if not files:
+            return ["No API specification files found"]
+        return [issue for found in map_specs(check_examples_in_file, files, jobs) for issue in found]
     
-    # Find all YAML files
-    yaml_files = []
-    for root, dirs, files in os.walk(api_dir):
-        for file in files:
-            if file.endswith(('.yaml', '.yml')):
-                yaml_files.append(os.path.join(root, file))
+    checker = ApiExamplesChecker()
+    scan(api_dir, checker)
     
-    if not yaml_files:
+    if not checker.files:
         return ["No API specification files found"]
     
-    for yaml_file in yaml_files:
-        file_issues = check_examples_in_file(yaml_file)
-        issues.extend(file_issues)
+    return checker.issues
+
+class ApiExamplesChecker(Checker):
+    """Corpus scanner plugin checking API specifications for examples"""
     
-    return issues
+    name = "api-examples"
+    extensions = ('.yaml', '.yml')
+    
+    def __init__(self, subdir=None):
+        super().__init__(subdir)
+        self.files = []
+        self.issues = []
+        # Shared across specs, so each component schema is compiled once per run
+        self.compiler = SchemaCompiler(SpecResolver())
+    
+    def visit(self, file):
+        self.files.append(file.path)
+        try:
+            content = file.text
+        except Exception as e:
+            self.issues.append(f"Error checking examples in {file.path}: {e}")
+            return
+        self.issues.extend(check_examples_in_content(file.path, content, self.compiler))
+    
+    def report(self):
+        return report_issues(self.issues)
 
 def check_examples_in_file(file_path):
     """Check examples in a single API file"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except Exception as e:
+        return [f"Error checking examples in {file_path}: {e}"]
+    
+    return check_examples_in_content(file_path, content)
+
+def check_examples_in_content(file_path, content, compiler=None):
+    """Check examples in the contents of a single API file
+    
+    Every example that is present is validated against its media type's
+    schema. Request bodies and responses are followed through their $refs;
+    broken references are reported by the API docs validator, not here.
+    """
     issues = []
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+        if compiler is None:
+            compiler = SchemaCompiler(SpecResolver())
+        data, _ = resolve_spec(file_path, parse_spec(content), compiler.resolver)
         
         if 'paths' not in data:
             return issues
@@ -57,6 +99,12 @@ def check_examples_in_file(file_path):
                                     json_content = content['application/json']
                                     if 'example' not in json_content and 'examples' not in json_content:
                                         issues.append(f"Missing request example for {method.upper()} {path} in {file_path}")
+                                    else:
+                                        issues.extend(
+                                            f"Request {label} for {method.upper()} {path} in {file_path} "
+                                            f"does not match its schema at {error}"
+                                            for label, errors in check_media_examples(compiler, *unwrap(json_content), REQUEST)
+                                            for error in errors)
                     
                     # Check for response examples
                     responses = operation.get('responses', {})
@@ -68,6 +116,12 @@ def check_examples_in_file(file_path):
                                     json_content = content['application/json']
                                     if 'example' not in json_content and 'examples' not in json_content:
                                         issues.append(f"Missing response example for {method.upper()} {path} ({status_code}) in {file_path}")
+                                    else:
+                                        issues.extend(
+                                            f"Response {label} for {method.upper()} {path} ({status_code}) in {file_path} "
+                                            f"does not match its schema at {error}"
+                                            for label, errors in check_media_examples(compiler, *unwrap(json_content), RESPONSE)
+                                            for error in errors)
     
     except Exception as e:
         issues.append(f"Error checking examples in {file_path}: {e}")
@@ -76,21 +130,27 @@ def check_examples_in_file(file_path):
 
 def main():
     """Main function"""
-    if len(sys.argv) < 2:
-        print("Usage: python check_api_examples.py <api_directory>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Check API specifications for request and response examples")
+    parser.add_argument("api_dir", help="Directory holding the API specifications")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Number of worker processes (default: 1)")
+    args = parser.parse_args()
     
-    api_dir = sys.argv[1]
-    issues = check_api_examples(api_dir)
+    issues = check_api_examples(args.api_dir, jobs=args.jobs)
     
+    success = report_issues(issues)
+    sys.exit(0 if success else 1)
+
+def report_issues(issues):
+    """Print missing examples"""
     if issues:
-        print(f"❌ Found {len(issues)} missing examples:")
+        print(f"❌ Found {len(issues)} missing or invalid examples:")
         for issue in issues:
             print(f"  • {issue}")
-        sys.exit(1)
+        return False
     else:
         print("✅ API examples check passed!")
-        sys.exit(0)
+        return True
 
 if __name__ == "__main__":
     main()
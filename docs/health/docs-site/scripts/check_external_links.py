@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Documentation Maintenance Agent - External Link Checker
+Checks http(s) links concurrently with per-host limits and a result cache
+
+asyncio only schedules the checks and enforces the limits; the default
+fetcher does blocking ``http.client`` I/O on a thread pool.
+"""
+
+import argparse
+import asyncio
+import http.client
+import os
+import sqlite3
+import ssl
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from corpus_scanner import scan
+from api_standards_validator import UrlCollector
+from link_cache import DEFAULT_CACHE_DIR
+
+CACHE_FILE = "external-links.sqlite3"
+DEFAULT_TTL = 24 * 60 * 60
+TRAILING_PUNCTUATION = '.,;:!?*_`'
+
+class FetchResult:
+    """Outcome of checking a single URL"""
+
+    __slots__ = ("url", "status", "error", "cached")
+
+    def __init__(self, url: str, status: Optional[int], error: Optional[str] = None, cached: bool = False):
+        self.url = url
+        self.status = status
+        self.error = error
+        self.cached = cached
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and self.status < 400
+
+    @property
+    def definitive(self) -> bool:
+        """Whether the result is worth caching: network errors, rate limits and
+        server errors are usually transient, so those URLs are checked again next run"""
+        return self.error is None and self.status is not None and self.status < 500 and self.status != 429
+
+class ThreadedHttpFetcher:
+    """Default fetcher: blocking ``http.client`` requests on a thread pool
+
+    The requests themselves block, so they run on worker threads to keep the
+    event loop free; connections are returned to a per-host idle pool, shared
+    by the workers under a lock, after each fully read response.
+
+    With ``base_url`` every request goes to that server instead, keeping the
+    link's path and query and sending its host in the ``Host`` header, so a
+    local stub server can stand in for the internet.
+    """
+
+    def __init__(self, timeout: float = 10.0, max_workers: int = 32, base_url: Optional[str] = None):
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.ssl_context = ssl.create_default_context()
+        self.base_url = urlsplit(base_url) if base_url else None
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = defaultdict(list)
+        self._idle_lock = threading.Lock()
+
+    def _connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        if scheme == 'https':
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout, context=self.ssl_context)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def _send(self, key: Tuple[str, str], method: str, target: str, host: str) -> int:
+        with self._idle_lock:
+            idle = self._idle[key]
+            conn = idle.pop() if idle else None
+        reused = conn is not None
+        if conn is None:
+            conn = self._connect(*key)
+
+        headers = {"User-Agent": "zs-docs-link-checker", "Host": host}
+        try:
+            conn.request(method, target, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            if not reused:
+                raise
+            # The server closed a pooled keep-alive connection; retry on a fresh one
+            conn = self._connect(*key)
+            conn.request(method, target, headers=headers)
+            response = conn.getresponse()
+            response.read()
+
+        if response.will_close:
+            conn.close()
+        else:
+            with self._idle_lock:
+                self._idle[key].append(conn)
+        return response.status
+
+    def _request(self, url: str) -> int:
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+        if self.base_url is not None:
+            key = (self.base_url.scheme, self.base_url.netloc)
+            target = self.base_url.path.rstrip('/') + target
+
+        status = self._send(key, 'HEAD', target, parts.netloc)
+        # Some servers reject HEAD; retry those with GET
+        if status in (403, 405, 501):
+            status = self._send(key, 'GET', target, parts.netloc)
+        return status
+
+    async def fetch(self, url: str) -> int:
+        """Return the HTTP status code for ``url``"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._request, url)
+
+    def close(self):
+        with self._idle_lock:
+            for connections in self._idle.values():
+                for conn in connections:
+                    conn.close()
+            self._idle.clear()
+        self.executor.shutdown(wait=False)
+
+class ExternalLinkCache:
+    """SQLite cache of external link results with a time-to-live"""
+
+    def __init__(self, db_path: str, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " url TEXT PRIMARY KEY, status INTEGER, error TEXT, checked_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    @classmethod
+    def for_root(cls, root_dir: str, cache_dir: str = None, ttl: float = DEFAULT_TTL) -> "ExternalLinkCache":
+        cache_dir = cache_dir or os.path.join(root_dir, DEFAULT_CACHE_DIR)
+        return cls(os.path.join(cache_dir, CACHE_FILE), ttl)
+
+    def fresh(self, urls: List[str]) -> Dict[str, FetchResult]:
+        """Cached results younger than the TTL"""
+        cutoff = time.time() - self.ttl
+        results = {}
+        for url, status, error, checked_at in self.conn.execute(
+                "SELECT url, status, error, checked_at FROM results"):
+            if checked_at >= cutoff:
+                results[url] = FetchResult(url, status, error, cached=True)
+        return {url: results[url] for url in urls if url in results}
+
+    def store(self, results: List[FetchResult]):
+        """Cache the definitive results; transient failures are dropped so they get rechecked"""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO results (url, status, error, checked_at) VALUES (?, ?, ?, ?)",
+                [(r.url, r.status, r.error, now) for r in results if r.definitive]
+            )
+
+    def close(self):
+        self.conn.close()
+
+def clean_url(url: str) -> str:
+    """Trim markdown punctuation the URL pattern picks up at the end"""
+    url = url.rstrip(TRAILING_PUNCTUATION)
+    while url.endswith(')') and url.count('(') < url.count(')'):
+        url = url[:-1].rstrip(TRAILING_PUNCTUATION)
+    return url
+
+def checkable(url: str) -> bool:
+    """Skip templated URLs such as ``https://api/{id}`` or ``${BASE_URL}``"""
+    parts = urlsplit(url)
+    return (parts.scheme in ('http', 'https') and bool(parts.hostname) and
+            not any(char in url for char in '{}$<>'))
+
+async def check_urls(urls: List[str], fetcher, per_host: int = 4,
+                     concurrency: int = 32) -> List[FetchResult]:
+    """Check URLs concurrently, at most ``per_host`` requests in flight per host"""
+    global_limit = asyncio.Semaphore(concurrency)
+    host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def check(url: str) -> FetchResult:
+        host = urlsplit(url).netloc.lower()
+        host_limit = host_limits.setdefault(host, asyncio.Semaphore(per_host))
+        # Take the host slot first so queued requests to a busy host
+        # don't hold global slots other hosts could use
+        async with host_limit, global_limit:
+            try:
+                return FetchResult(url, await fetcher.fetch(url))
+            except Exception as e:
+                return FetchResult(url, None, f"{type(e).__name__}: {e}")
+
+    return await asyncio.gather(*(check(url) for url in urls))
+
+def check_external_links(urls: List[str], fetcher=None, cache: Optional[ExternalLinkCache] = None,
+                         per_host: int = 4, concurrency: int = 32,
+                         base_url: Optional[str] = None) -> List[FetchResult]:
+    """Check a list of URLs, consulting and updating the cache; results are sorted by URL"""
+    unique = sorted({clean_url(url) for url in urls} - {''})
+    unique = [url for url in unique if checkable(url)]
+
+    results = cache.fresh(unique) if cache is not None else {}
+    pending = [url for url in unique if url not in results]
+
+    if pending:
+        own_fetcher = fetcher is None
+        fetcher = fetcher or ThreadedHttpFetcher(max_workers=concurrency, base_url=base_url)
+        try:
+            fetched = asyncio.run(check_urls(pending, fetcher, per_host, concurrency))
+        finally:
+            if own_fetcher:
+                fetcher.close()
+        if cache is not None:
+            cache.store(fetched)
+        results.update((r.url, r) for r in fetched)
+
+    return [results[url] for url in unique]
+
+def report_results(results: List[FetchResult]) -> bool:
+    """Print broken external links"""
+    cached = sum(1 for r in results if r.cached)
+    print(f"📊 Checked {len(results)} unique external URLs ({cached} from cache)")
+
+    broken = [r for r in results if not r.ok]
+    if broken:
+        print(f"❌ Found {len(broken)} broken external links:")
+        for result in broken:
+            reason = result.error or f"HTTP {result.status}"
+            print(f"  • {result.url} ({reason})")
+        return False
+
+    print("✅ All external links are reachable!")
+    return True
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Check external http(s) links in the documentation")
+    parser.add_argument("root_dir", nargs="?", default=".", help="Documentation root directory")
+    parser.add_argument("--per-host", type=int, default=4, help="Concurrent requests per host (default: 4)")
+    parser.add_argument("--concurrency", type=int, default=32, help="Total concurrent requests (default: 32)")
+    parser.add_argument("--ttl", type=float, default=DEFAULT_TTL,
+                        help="Seconds a cached result stays valid (default: one day)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and don't update the result cache")
+    parser.add_argument("--cache-dir", help="Directory for the result cache")
+    parser.add_argument("--base-url", metavar="URL",
+                        help="Send every request to this server instead, e.g. a local stub in air-gapped CI "
+                             "(implies --no-cache)")
+    args = parser.parse_args()
+
+    print("🌐 Checking external links...")
+
+    collector = UrlCollector()
+    scan(args.root_dir, collector)
+
+    # Results from a stub server say nothing about the real links, so they are never cached
+    use_cache = not (args.no_cache or args.base_url)
+    cache = ExternalLinkCache.for_root(args.root_dir, args.cache_dir, args.ttl) if use_cache else None
+    try:
+        results = check_external_links(collector.urls, cache=cache, per_host=args.per_host,
+                                       concurrency=args.concurrency, base_url=args.base_url)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    success = report_results(results)
+    sys.exit(0 if success else 1)
+
+if __name__ == "__main__":
+    main()
@@ -105,6 +105,7 @@ class ComplianceMetrics:
         """Generate compliance metrics report"""
         report = []
         report.append("# ZARISH HIS HIPAA Compliance Metrics Report")
+        report.append("")
         report.append(f"Generated: {datetime.now().isoformat()}")
         report.append("")
         
@@ -123,6 +124,7 @@ class ComplianceMetrics:
         # Detailed metrics
         for category, data in self.metrics.items():
             report.append(f"### {category.replace('_', ' ').title()}")
+            report.append("")
             if isinstance(data, dict):
                 for key, value in data.items():
                     if isinstance(value, dict):
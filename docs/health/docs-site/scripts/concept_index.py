@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Documentation Maintenance Agent - Concept Index
+Maps concept UUIDs to the forms, pages, sections and questions that use them
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from typing import Any, Dict, List, Optional
+
+from form_snapshot import DEFAULT_SNAPSHOT, FORMS_DIR, FormSnapshot, NONE, open_snapshot
+
+DEFAULT_INDEX = os.path.join(".cache", "concept-index.sqlite3")
+SCHEMA_VERSION = "1"
+
+ROLE_QUESTION = "question"
+ROLE_GROUP = "group"
+ROLE_ANSWER = "answer"
+
+COLUMNS = ("concept", "role", "form_file", "form_name", "form_uuid", "page",
+           "section", "question_id", "question_label", "answer_label")
+
+class ConceptIndex:
+    """Persistent concept usage index with indexed lookups in both directions"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def close(self):
+        self.conn.close()
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def fingerprint(snapshot_path: str) -> str:
+        stat = os.stat(snapshot_path)
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def is_current(self, snapshot_path: str) -> bool:
+        """True if the index was built from this exact snapshot file"""
+        return (self._meta("schema") == SCHEMA_VERSION and
+                self._meta("snapshot") == self.fingerprint(snapshot_path))
+
+    def build(self, snapshot: FormSnapshot) -> int:
+        """Rebuild the index in one pass over the snapshot's question and answer tables"""
+        string = snapshot.string
+        contexts: Dict[int, tuple] = {}
+
+        def context(section_index: int) -> tuple:
+            # (form file, form name, form uuid, page label, section label), memoized per section
+            ctx = contexts.get(section_index)
+            if ctx is None:
+                section = snapshot.section(section_index)
+                page = snapshot.page(section.page)
+                form = snapshot.form(page.form)
+                ctx = contexts[section_index] = (string(form.filename), string(form.name), string(form.uuid),
+                                                 string(page.label), string(section.label))
+            return ctx
+
+        rows = []
+        question_count = snapshot.count("questions")
+        for index in range(question_count):
+            question = snapshot.question(index)
+            if question.concept != NONE:
+                role = ROLE_GROUP if string(question.type) == "obsGroup" else ROLE_QUESTION
+                rows.append((string(question.concept), role) + context(question.section) +
+                            (string(question.id), string(question.label), None))
+
+        for index in range(snapshot.count("answers")):
+            answer = snapshot.answer(index)
+            if answer.concept == NONE:
+                continue
+            question = snapshot.question(answer.question)
+            rows.append((string(answer.concept), ROLE_ANSWER) + context(question.section) +
+                        (string(question.id), string(question.label), string(answer.label)))
+
+        forms = [(string(form.filename), string(form.name), string(form.uuid)) for form in snapshot.forms()]
+
+        with self.conn:
+            self.conn.execute("DROP TABLE IF EXISTS forms")
+            self.conn.execute("CREATE TABLE forms (form_file TEXT PRIMARY KEY, form_name, form_uuid)")
+            self.conn.executemany("INSERT INTO forms VALUES (?, ?, ?)", forms)
+            self.conn.execute("DROP TABLE IF EXISTS usages")
+            self.conn.execute(f"CREATE TABLE usages ({', '.join(COLUMNS)})")
+            self.conn.executemany(f"INSERT INTO usages VALUES ({', '.join('?' * len(COLUMNS))})", rows)
+            self.conn.execute("CREATE INDEX usages_concept ON usages (concept)")
+            self.conn.execute("CREATE INDEX usages_form ON usages (form_file)")
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)", (SCHEMA_VERSION,))
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('snapshot', ?)",
+                              (self.fingerprint(snapshot.path),))
+        return len(rows)
+
+    def _rows(self, sql: str, params: tuple) -> List[Dict[str, Any]]:
+        return [dict(zip(COLUMNS, row)) for row in self.conn.execute(sql, params)]
+
+    def where_used(self, concept: str) -> List[Dict[str, Any]]:
+        """Every place a concept UUID is used"""
+        return self._rows(f"SELECT {', '.join(COLUMNS)} FROM usages WHERE concept = ?"
+                          " ORDER BY form_file, rowid", (concept,))
+
+    def resolve_form(self, form: str) -> Optional[str]:
+        """Find a form's file name from its file name, name or UUID"""
+        row = self.conn.execute(
+            "SELECT form_file FROM forms WHERE form_file = ? OR form_file = ? OR form_uuid = ?"
+            " OR form_name = ? LIMIT 1", (form, form + ".json", form, form)).fetchone()
+        return row[0] if row else None
+
+    def form_concepts(self, form: str) -> List[Dict[str, Any]]:
+        """Every concept a form depends on, with where in the form it is used"""
+        form_file = self.resolve_form(form)
+        if form_file is None:
+            return []
+        return self._rows(f"SELECT {', '.join(COLUMNS)} FROM usages WHERE form_file = ?"
+                          " ORDER BY rowid", (form_file,))
+
+def open_index(docs_root: str, index_path: Optional[str] = None,
+               snapshot_path: Optional[str] = None) -> ConceptIndex:
+    """Open the concept index, rebuilding the snapshot and index if the registry changed"""
+    forms_dir = os.path.join(docs_root, FORMS_DIR)
+    snapshot_path = snapshot_path or os.path.join(docs_root, DEFAULT_SNAPSHOT)
+    index = ConceptIndex(index_path or os.path.join(docs_root, DEFAULT_INDEX))
+
+    with open_snapshot(forms_dir, snapshot_path) as snapshot:
+        if not index.is_current(snapshot_path):
+            index.build(snapshot)
+    return index
+
+def print_usages(usages: List[Dict[str, Any]], as_json: bool):
+    """Print usage rows as JSON or one line per usage"""
+    if as_json:
+        print(json.dumps(usages, indent=2))
+        return
+    for usage in usages:
+        location = " › ".join(part for part in (usage["page"], usage["section"]) if part)
+        question = usage["question_id"] or usage["question_label"] or "?"
+        answer = f" = {usage['answer_label']}" if usage["answer_label"] else ""
+        print(f"  • {usage['concept']} [{usage['role']}] {usage['form_file']}: {location} › {question}{answer}")
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Query concept UUID usage across the forms registry")
+    parser.add_argument("--docs-root", default=".", help="Documentation root directory")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("build", help="Rebuild the index")
+    where = subparsers.add_parser("where", help="Where is a concept used?")
+    where.add_argument("concept", help="Concept UUID")
+    form = subparsers.add_parser("form", help="Which concepts does a form depend on?")
+    form.add_argument("form", help="Form file name, name or UUID")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        forms_dir = os.path.join(args.docs_root, FORMS_DIR)
+        snapshot_path = os.path.join(args.docs_root, DEFAULT_SNAPSHOT)
+        index = ConceptIndex(os.path.join(args.docs_root, DEFAULT_INDEX))
+        with open_snapshot(forms_dir, snapshot_path) as snapshot:
+            count = index.build(snapshot)
+        index.close()
+        print(f"✅ Indexed {count} concept usages")
+        return
+
+    index = open_index(args.docs_root)
+    try:
+        if args.command == "where":
+            usages = index.where_used(args.concept)
+            if not args.json:
+                forms = len({u["form_file"] for u in usages})
+                print(f"🔎 {args.concept} is used {len(usages)} times in {forms} forms")
+        else:
+            if index.resolve_form(args.form) is None:
+                print(f"❌ Form not found: {args.form}", file=sys.stderr if args.json else sys.stdout)
+                sys.exit(1)
+            usages = index.form_concepts(args.form)
+            if not args.json:
+                concepts = len({u["concept"] for u in usages})
+                print(f"🔎 {args.form} depends on {concepts} concepts ({len(usages)} usages)")
+        print_usages(usages, args.json)
+    finally:
+        index.close()
+
+if __name__ == "__main__":
+    main()
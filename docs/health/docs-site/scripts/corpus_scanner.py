@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Documentation Maintenance Agent - Corpus Scanner
+Walks the documentation tree once and feeds every file to registered checkers
+"""
+
+import io
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+class ScannedFile:
+    """A single file seen by the scanner, read at most once"""
+
+    __slots__ = ("path", "relative_path", "name", "_data", "_text")
+
+    def __init__(self, path: str, relative_path: str):
+        self.path = path
+        self.relative_path = relative_path
+        self.name = os.path.basename(path)
+        self._data = None
+        self._text = None
+
+    @property
+    def data(self) -> bytes:
+        """Raw file contents (buffered read, cached)"""
+        if self._data is None:
+            with open(self.path, 'rb') as f:
+                self._data = f.read()
+        return self._data
+
+    @property
+    def text(self) -> str:
+        """File contents decoded as UTF-8 (cached)"""
+        if self._text is None:
+            self._text = self.data.decode('utf-8')
+        return self._text
+
+    def readlines(self) -> List[str]:
+        """Lines of the file as ``open(..., 'r').readlines()`` would return them"""
+        return io.StringIO(self.text, newline=None).readlines()
+
+    def release(self):
+        """Drop cached contents once every checker has seen the file"""
+        self._data = None
+        self._text = None
+
+class Checker:
+    """Base class for scanner plugins
+
+    Subclasses set ``extensions`` (and optionally ``subdir`` to restrict the
+    checker to part of the tree, or ``skip_hidden_dirs`` to ignore files under
+    dot-directories), implement ``visit`` for per-file work and ``report`` to
+    print results. File contents are read lazily, so checkers that only look
+    at names never trigger a read.
+    """
+
+    name = "checker"
+    extensions: Tuple[str, ...] = ()
+    skip_hidden_dirs = False
+
+    def __init__(self, subdir: Optional[str] = None):
+        self.subdir = os.path.normpath(subdir) if subdir else None
+
+    def wants(self, file: ScannedFile) -> bool:
+        """Return True if this checker should see the file"""
+        if self.extensions and not file.name.endswith(self.extensions):
+            return False
+        if self.skip_hidden_dirs and any(part.startswith('.') for part in
+                                         os.path.dirname(file.relative_path).split(os.sep)):
+            return False
+        if self.subdir:
+            return (file.relative_path == self.subdir or
+                    file.relative_path.startswith(self.subdir + os.sep))
+        return True
+
+    def visit(self, file: ScannedFile):
+        """Process a single file"""
+        raise NotImplementedError
+
+    def finish(self):
+        """Called once after the whole tree has been scanned"""
+
+    def report(self) -> bool:
+        """Print results and return True when the check passed"""
+        return True
+
+class CorpusScanner:
+    """Walks a documentation tree once and dispatches files to checkers
+
+    Like a plain ``os.walk`` the scanner descends into dot-directories;
+    checkers that should not see them set ``skip_hidden_dirs``.
+    """
+
+    def __init__(self, root_dir: str, skip_hidden_dirs: bool = False):
+        self.root_dir = root_dir
+        self.skip_hidden_dirs = skip_hidden_dirs
+        self.checkers: List[Checker] = []
+        self.stats: Dict[str, Any] = {"files": 0, "files_read": 0, "bytes_read": 0}
+
+    def register(self, checker: Checker) -> Checker:
+        """Register a checker plugin"""
+        self.checkers.append(checker)
+        return checker
+
+    def scan(self) -> List[Checker]:
+        """Walk the tree, feeding each file to every interested checker"""
+        for root, dirs, files in os.walk(self.root_dir):
+            if self.skip_hidden_dirs:
+                dirs[:] = [d for d in dirs if not d.startswith('.')]
+
+            for file_name in files:
+                file_path = os.path.join(root, file_name)
+                scanned = ScannedFile(file_path, os.path.relpath(file_path, self.root_dir))
+                self.stats["files"] += 1
+
+                interested = [c for c in self.checkers if c.wants(scanned)]
+                if not interested:
+                    continue
+
+                for checker in interested:
+                    checker.visit(scanned)
+
+                if scanned._data is not None:
+                    self.stats["files_read"] += 1
+                    self.stats["bytes_read"] += len(scanned._data)
+                scanned.release()
+
+        for checker in self.checkers:
+            checker.finish()
+
+        return self.checkers
+
+def scan(root_dir: str, *checkers: Checker) -> List[Checker]:
+    """Convenience wrapper: scan ``root_dir`` once with the given checkers"""
+    scanner = CorpusScanner(root_dir)
+    for checker in checkers:
+        scanner.register(checker)
+    return scanner.scan()
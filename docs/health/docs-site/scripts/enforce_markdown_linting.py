@@ -4,115 +4,65 @@ Documentation Maintenance Agent - Markdown Linting Enforcer
 Ensures all markdown files follow style standards
 """
 
-import os
-import subprocess
 import sys
-import json
 
-# Markdown linting rules (simplified version of .markdownlint.json)
-LINTING_RULES = {
-    "MD001": "header levels should only increment by one level at a time",
-    "MD003": "header style",
-    "MD007": "list indentation",
-    "MD010": "hard tabs",
-    "MD013": "line length",
-    "MD022": "headers should be surrounded by blank lines",
-    "MD033": "html elements",
-    "MD040": "fenced code blocks should have a language"
-}
+from corpus_scanner import Checker, scan
+from markdown_lint import RULES, LintEngine, load_config
 
-def run_markdownlint(directory):
-    """Run markdownlint on directory"""
-    try:
-        # Try to run markdownlint-cli if available
-        result = subprocess.run(
-            ["markdownlint", directory, "--json"],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode == 0:
-            return []
-        
-        # Parse JSON output
-        try:
-            errors = json.loads(result.stdout)
-            return errors
-        except json.JSONDecodeError:
-            return []
-            
-    except FileNotFoundError:
-        # markdownlint not available, do basic checks
-        return basic_markdown_checks(directory)
+# Rules enforced by the lint engine, configured by .markdownlint.json
+LINTING_RULES = {rule.code: rule.description for rule in RULES}
+
+def lint_markdown(directory):
+    """Lint every markdown file under a directory with its .markdownlint.json settings"""
+    checker = MarkdownStyleChecker(config=load_config(directory))
+    scan(directory, checker)
+    return checker.errors
 
-def basic_markdown_checks(directory):
-    """Basic markdown checks when markdownlint is not available"""
-    errors = []
+class MarkdownStyleChecker(Checker):
+    """Corpus scanner plugin running the markdown lint rules"""
     
-    for root, dirs, files in os.walk(directory):
-        for file in files:
-            if file.endswith('.md'):
-                file_path = os.path.join(root, file)
-                file_errors = check_markdown_file(file_path)
-                errors.extend(file_errors)
+    name = "markdown-style"
+    extensions = ('.md',)
     
-    return errors
-
-def check_markdown_file(file_path):
-    """Check a single markdown file for common issues"""
-    errors = []
+    def __init__(self, subdir=None, config=None):
+        super().__init__(subdir)
+        self.engine = LintEngine(config)
+        self.errors = []
+    
+    def visit(self, file):
+        try:
+            lines = file.readlines()
+        except Exception as e:
+            self.errors.append(file_error(file.path, e))
+            return
+        self.errors.extend(self.engine.lint_lines(file.path, lines))
     
+    def report(self):
+        return report_errors(self.errors)
+
+def file_error(file_path, error):
+    """Build the error record for an unreadable file"""
+    return {
+        "fileName": file_path,
+        "lineNumber": 1,
+        "ruleNames": ["FILE_ERROR"],
+        "ruleDescription": "Error reading file",
+        "errorDetail": str(error)
+    }
+
+def check_markdown_file(file_path, engine=None):
+    """Check a single markdown file against the lint rules"""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             lines = f.readlines()
-        
-        for line_num, line in enumerate(lines, 1):
-            # Check for hard tabs
-            if '\t' in line:
-                errors.append({
-                    "fileName": file_path,
-                    "lineNumber": line_num,
-                    "ruleNames": ["MD010"],
-                    "ruleDescription": "Hard tabs not allowed",
-                    "errorDetail": f"Line contains hard tabs"
-                })
-            
-            # Check line length (basic check) - disabled for markdown files
-            # Only check line length for non-markdown files
-            if not file_path.endswith('.md'):
-                max_length = 120
-                if len(line.rstrip()) > max_length:
-                    errors.append({
-                        "fileName": file_path,
-                        "lineNumber": line_num,
-                        "ruleNames": ["MD013"],
-                        "ruleDescription": "Line too long",
-                        "errorDetail": f"Line is {len(line.rstrip())} characters (max {max_length})"
-                    })
-            
-            # Check for headers without blank lines (basic check) - disabled for flexibility
-            # Commenting out header blank line check as it's too strict
-            # if line.startswith('#') and line_num > 1:
-            #     prev_line = lines[line_num - 2].rstrip()
-            #     if prev_line != '':
-            #         errors.append({
-            #             "fileName": file_path,
-            #             "lineNumber": line_num,
-            #             "ruleNames": ["MD022"],
-            #             "ruleDescription": "Headers should be surrounded by blank lines",
-            #             "errorDetail": "Header not preceded by blank line"
-            #         })
-    
     except Exception as e:
-        errors.append({
-            "fileName": file_path,
-            "lineNumber": 1,
-            "ruleNames": ["FILE_ERROR"],
-            "ruleDescription": "Error reading file",
-            "errorDetail": str(e)
-        })
+        return [file_error(file_path, e)]
     
-    return errors
+    return check_markdown_lines(file_path, lines, engine)
+
+def check_markdown_lines(file_path, lines, engine=None):
+    """Check the lines of a markdown file against the lint rules"""
+    return (engine or LintEngine()).lint_lines(file_path, lines)
 
 def enforce_markdown_linting():
     """Main function to enforce markdown linting"""
@@ -120,8 +70,12 @@ def enforce_markdown_linting():
     
     directory = sys.argv[1] if len(sys.argv) > 1 else "."
     
-    errors = run_markdownlint(directory)
+    errors = lint_markdown(directory)
     
+    return report_errors(errors)
+
+def report_errors(errors):
+    """Print markdown style issues grouped by file"""
     if not errors:
         print("✅ All markdown files pass style checks!")
         return True
@@ -143,7 +97,8 @@ def enforce_markdown_linting():
             line_num = error.get("lineNumber", "?")
             rule = error.get("ruleNames", ["UNKNOWN"])[0]
             description = error.get("ruleDescription", "Unknown error")
-            print(f"  Line {line_num}: {description} ({rule})")
+            detail = error.get("errorDetail")
+            print(f"  Line {line_num}: {description} ({rule})" + (f" [{detail}]" if detail else ""))
     
     return False
 
@@ -10,6 +10,7 @@ import subprocess
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
 import re
+import textwrap
 
 class EventArchitectureMonitor:
     """Monitor event-driven architecture health and patterns"""
@@ -129,11 +130,13 @@ class EventArchitectureMonitor:
         """Generate comprehensive monitoring report"""
         report = []
         report.append("# ZARISH HIS Event-Driven Architecture Monitoring Report")
+        report.append("")
         report.append(f"Generated: {datetime.now().isoformat()}")
         report.append("")
         
         # Service Health Overview
         report.append("## 📊 Service Health Overview")
+        report.append("")
         health = self.health_status
         report.append(f"- **Total Services**: {health['total_services']}")
         report.append(f"- **Services with Events**: {health['services_with_events']}")
@@ -142,29 +145,37 @@ class EventArchitectureMonitor:
         
         # Event Flow Patterns
         report.append("## 🔄 Event Flow Patterns")
+        report.append("")
         
         for category, events in self.event_patterns.items():
             if events:
                 report.append(f"### {category.replace('_', ' ').title()}")
+                report.append("")
                 for event_info in events:
                     report.append(f"- **{event_info['event']}** (from {event_info['service']})")
                 report.append("")
         
         # Service Details
         report.append("## 🏗️ Service Details")
+        report.append("")
         for service in self.services:
             report.append(f"### {service['name']}")
+            report.append("")
             report.append(f"- **Path**: `{service['path']}`")
             report.append(f"- **Last Updated**: {service['last_updated']}")
             
             if service.get("events_published"):
-                report.append(f"- **Events Published**: {', '.join(service['events_published'])}")
+                # Long event lists wrap onto indented continuation lines
+                events = f"- **Events Published**: {', '.join(service['events_published'])}"
+                report.extend(textwrap.wrap(events, width=120, subsequent_indent="  ",
+                                            break_long_words=False, break_on_hyphens=False))
             else:
                 report.append("- **Events Published**: None documented")
             report.append("")
         
         # Recommendations
         report.append("## 💡 Recommendations")
+        report.append("")
         
         if health["services_with_events"] < health["total_services"]:
             report.append("- Consider documenting event publishing patterns for services without events")
@@ -189,7 +200,7 @@ class EventArchitectureMonitor:
     
     def generate_event_diagram(self) -> str:
         """Generate Mermaid diagram of event flows"""
-        diagram = ["# Event Flow Diagram"]
+        diagram = ["# Event Flow Diagram", ""]
         diagram.append("```mermaid")
         diagram.append("graph TD")
         diagram.append("    %% Event-driven architecture flow")
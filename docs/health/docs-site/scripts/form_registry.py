@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Documentation Maintenance Agent - Form Registry Loader
+Reads form header fields without parsing the full form definitions
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+HEADER_KEYS = ('name', 'description', 'uuid', 'encounter')
+CHUNK_SIZE = 16 * 1024
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+class HeaderReader:
+    """Incremental reader for the top-level keys of a JSON object
+
+    The file is read in chunks and reading stops as soon as every wanted key
+    has been seen, so for forms whose metadata precedes ``pages`` the large
+    pages array is never read at all. Values that do have to be stepped over
+    are handed to the C JSON scanner, with the read size doubling on every
+    retry so skipping a large value stays linear.
+    """
+
+    def __init__(self, f, keys: Iterable[str], chunk_size: int = CHUNK_SIZE):
+        self.f = f
+        self.keys = set(keys)
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size: Optional[int] = None):
+        """Read another chunk, dropping what has already been consumed"""
+        if self.eof:
+            raise ValueError("Unexpected end of JSON document")
+        chunk = self.f.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+
+    def _skip_whitespace(self):
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return
+            self._fill()
+
+    def _expect(self, chars: str) -> str:
+        self._skip_whitespace()
+        char = self.buffer[self.pos]
+        if char not in chars:
+            raise ValueError(f"Expected one of {chars!r} at offset {self.pos}, found {char!r}")
+        self.pos += 1
+        return char
+
+    def _decode(self) -> Any:
+        """Decode one complete value at the current position"""
+        size = self.chunk_size
+        while True:
+            self._skip_whitespace()
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self._fill(size)
+                size *= 2
+                continue
+            # A number may continue in the next chunk
+            if end == len(self.buffer) and not self.eof:
+                self._fill(size)
+                continue
+            self.pos = end
+            return value
+
+    def read(self) -> Dict[str, Any]:
+        """Return the wanted keys that are present in the object"""
+        found: Dict[str, Any] = {}
+        self._expect('{')
+        self._skip_whitespace()
+        if self.buffer[self.pos] == '}':
+            return found
+
+        while True:
+            key = self._decode()
+            self._expect(':')
+            if key in self.keys and key not in found:
+                found[key] = self._decode()
+                if len(found) == len(self.keys):
+                    return found
+            else:
+                self._decode()
+            if self._expect(',}') == '}':
+                return found
+
+def read_form_header(file_path: str, keys: Iterable[str] = HEADER_KEYS) -> Dict[str, Any]:
+    """Read selected top-level fields of a form, stopping as early as possible"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return HeaderReader(f, keys).read()
+
+class FormRegistry:
+    """Lazy view over a directory of form definitions
+
+    ``headers`` only reads the top-level metadata of each form; ``load``
+    parses a full form on demand and keeps recently used forms cached.
+    """
+
+    def __init__(self, forms_dir: str, cache_size: int = 32):
+        self.forms_dir = forms_dir
+        self.load = lru_cache(maxsize=cache_size)(self._load)
+
+    def filenames(self) -> List[str]:
+        if not os.path.exists(self.forms_dir):
+            return []
+        return sorted(f for f in os.listdir(self.forms_dir) if f.endswith('.json'))
+
+    def path(self, filename: str) -> str:
+        return os.path.join(self.forms_dir, filename)
+
+    def header(self, filename: str, keys: Iterable[str] = HEADER_KEYS) -> Dict[str, Any]:
+        """Top-level fields of one form, plus its ``filename``"""
+        header = read_form_header(self.path(filename), keys)
+        header['filename'] = filename
+        return header
+
+    def headers(self, keys: Iterable[str] = HEADER_KEYS) -> Iterator[Dict[str, Any]]:
+        """Yield the header of every form; unreadable forms raise from the iterator"""
+        for filename in self.filenames():
+            yield self.header(filename, keys)
+
+    def forms(self, on_error: Optional[Callable[[str, Exception], None]] = None
+              ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (filename, form) for every form, parsing each once and caching none
+
+        Unreadable or invalid forms raise from the iterator, unless ``on_error``
+        is given: it is then called with the filename and error and the form
+        is skipped.
+        """
+        for filename in self.filenames():
+            try:
+                form = self._load(filename)
+            except (ValueError, OSError) as e:
+                if on_error is None:
+                    raise
+                on_error(filename, e)
+                continue
+            yield filename, form
+
+    def _load(self, filename: str) -> Dict[str, Any]:
+        """Parse a full form definition"""
+        with open(self.path(filename), 'r', encoding='utf-8') as f:
+            return json.load(f)
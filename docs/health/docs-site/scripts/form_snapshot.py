@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Documentation Maintenance Agent - Form Registry Snapshot
+Compiles the forms registry into one mmap-able binary snapshot
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from form_registry import FormRegistry
+
+MAGIC = b"ZSFS"
+FORMAT_VERSION = 1
+NONE = 0xFFFFFFFF
+DEFAULT_SNAPSHOT = os.path.join(".cache", "forms-registry.snapshot")
+FORMS_DIR = os.path.join("05-metadata-forms", "forms-registry", "clinical")
+
+HEADER = struct.Struct('<4sII')
+TABLE_ENTRY = struct.Struct('<QQ')
+
+class FormRecord(NamedTuple):
+    name: int
+    description: int
+    uuid: int
+    encounter: int
+    filename: int
+    first_page: int
+    page_count: int
+
+class PageRecord(NamedTuple):
+    label: int
+    form: int
+    first_section: int
+    section_count: int
+
+class SectionRecord(NamedTuple):
+    label: int
+    page: int
+    first_question: int
+    question_count: int
+
+class QuestionRecord(NamedTuple):
+    id: int
+    label: int
+    type: int
+    rendering: int
+    concept: int
+    section: int
+    parent: int
+    first_answer: int
+    answer_count: int
+
+class AnswerRecord(NamedTuple):
+    concept: int
+    label: int
+    question: int
+
+class SourceRecord(NamedTuple):
+    filename: int
+    mtime_ns: int
+    size: int
+    sha256: bytes
+
+# Table order in the snapshot file; strings are stored as an offsets table
+# plus a UTF-8 blob, every other table as fixed-size little-endian records
+TABLES = (
+    ("string_offsets", struct.Struct('<I'), None),
+    ("string_data", None, None),
+    ("forms", struct.Struct('<7I'), FormRecord),
+    ("pages", struct.Struct('<4I'), PageRecord),
+    ("sections", struct.Struct('<4I'), SectionRecord),
+    ("questions", struct.Struct('<9I'), QuestionRecord),
+    ("answers", struct.Struct('<3I'), AnswerRecord),
+    ("concepts", struct.Struct('<I'), None),
+    ("sources", struct.Struct('<IqQ32s'), SourceRecord),
+)
+TABLE_LAYOUT = {name: (record, record_type) for name, record, record_type in TABLES}
+
+class StringTable:
+    """Interns strings to integer IDs while building a snapshot"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def intern(self, value: Any) -> int:
+        if value is None or value == '':
+            return NONE
+        if not isinstance(value, str):
+            value = json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return sid
+
+class SnapshotBuilder:
+    """Flattens parsed forms into the snapshot tables"""
+
+    def __init__(self):
+        self.strings = StringTable()
+        self.forms: List[tuple] = []
+        self.pages: List[tuple] = []
+        self.sections: List[tuple] = []
+        self.questions: List[list] = []
+        self.answers: List[tuple] = []
+        self.sources: List[tuple] = []
+        self.concepts = set()
+
+    def add_source(self, filename: str, stat: os.stat_result, digest: bytes):
+        """Record a form file for staleness checks, whether or not its form was added"""
+        self.sources.append((self.strings.intern(filename), stat.st_mtime_ns, stat.st_size, digest))
+
+    def add_form(self, filename: str, form: Dict[str, Any]):
+        intern = self.strings.intern
+        form_index = len(self.forms)
+        first_page = len(self.pages)
+
+        for page in form.get('pages') or []:
+            page_index = len(self.pages)
+            first_section = len(self.sections)
+            self.pages.append(None)
+            for section in page.get('sections') or []:
+                section_index = len(self.sections)
+                first_question = len(self.questions)
+                self.sections.append(None)
+                self._add_questions(section.get('questions') or [], section_index, NONE)
+                self.sections[section_index] = (intern(section.get('label')), page_index,
+                                                first_question, len(self.questions) - first_question)
+            self.pages[page_index] = (intern(page.get('label')), form_index,
+                                      first_section, len(self.sections) - first_section)
+
+        self.forms.append((intern(form.get('name')), intern(form.get('description')),
+                           intern(form.get('uuid')), intern(form.get('encounter')),
+                           intern(filename), first_page, len(self.pages) - first_page))
+
+    def _add_questions(self, questions: List[Dict[str, Any]], section_index: int, parent: int):
+        intern = self.strings.intern
+        for question in questions:
+            if not isinstance(question, dict):
+                continue
+            options = question.get('questionOptions') or {}
+            question_index = len(self.questions)
+            concept = intern(options.get('concept'))
+            if concept != NONE:
+                self.concepts.add(concept)
+
+            first_answer = len(self.answers)
+            for answer in options.get('answers') or []:
+                if not isinstance(answer, dict):
+                    continue
+                answer_concept = intern(answer.get('concept'))
+                if answer_concept != NONE:
+                    self.concepts.add(answer_concept)
+                self.answers.append((answer_concept, intern(answer.get('label')), question_index))
+
+            self.questions.append([intern(question.get('id')), intern(question.get('label')),
+                                   intern(question.get('type')), intern(options.get('rendering')),
+                                   concept, section_index, parent,
+                                   first_answer, len(self.answers) - first_answer])
+            self._add_questions(question.get('questions') or [], section_index, question_index)
+
+    def write(self, path: str):
+        """Serialize every table into ``path`` (written atomically)"""
+        blob = bytearray()
+        offsets = array('I', [0])
+        for value in self.strings.values:
+            blob += value.encode('utf-8')
+            offsets.append(len(blob))
+
+        values = self.strings.values
+        concepts = sorted(self.concepts, key=lambda sid: values[sid])
+        rows = {
+            "string_offsets": [(offset,) for offset in offsets],
+            "forms": self.forms,
+            "pages": self.pages,
+            "sections": self.sections,
+            "questions": self.questions,
+            "answers": self.answers,
+            "concepts": [(sid,) for sid in concepts],
+            "sources": self.sources,
+        }
+
+        payloads = []
+        for name, record, _ in TABLES:
+            if record is None:
+                payloads.append((bytes(blob), len(blob)))
+            else:
+                payloads.append((b''.join(record.pack(*row) for row in rows[name]), len(rows[name])))
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(TABLES)))
+            offset = HEADER.size + TABLE_ENTRY.size * len(TABLES)
+            for payload, count in payloads:
+                f.write(TABLE_ENTRY.pack(offset, count))
+                offset += len(payload)
+            for payload, _ in payloads:
+                f.write(payload)
+        os.replace(tmp_path, path)
+
+def build_snapshot(forms_dir: str, snapshot_path: str) -> int:
+    """Compile every form in ``forms_dir`` into a snapshot; returns the form count
+
+    Forms that are not valid JSON objects are skipped with a warning. They
+    are still recorded as sources, so the snapshot stays fresh until they
+    change.
+    """
+    registry = FormRegistry(forms_dir)
+    builder = SnapshotBuilder()
+    for filename in registry.filenames():
+        path = registry.path(filename)
+        with open(path, 'rb') as f:
+            data = f.read()
+        builder.add_source(filename, os.stat(path), hashlib.sha256(data).digest())
+        try:
+            form = json.loads(data)
+        except ValueError as e:
+            print(f"⚠️  Skipping {filename}: invalid JSON ({e})", file=sys.stderr)
+            continue
+        if not isinstance(form, dict):
+            print(f"⚠️  Skipping {filename}: not a JSON object", file=sys.stderr)
+            continue
+        builder.add_form(filename, form)
+    builder.write(snapshot_path)
+    return len(builder.forms)
+
+class FormSnapshot:
+    """Read-only, mmap-backed view of a compiled form registry snapshot
+
+    Records are unpacked on access and strings decoded lazily, so opening a
+    snapshot costs an mmap and a header read regardless of registry size.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, table_count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a form registry snapshot: {path}")
+        if version != FORMAT_VERSION or table_count != len(TABLES):
+            raise ValueError(f"Unsupported snapshot version {version} in {path}")
+        self._tables = {}
+        for i, (name, _, _) in enumerate(TABLES):
+            self._tables[name] = TABLE_ENTRY.unpack_from(self._mm, HEADER.size + i * TABLE_ENTRY.size)
+        self._strings: Dict[int, str] = {}
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def count(self, table: str) -> int:
+        return self._tables[table][1]
+
+    def _record(self, table: str, index: int):
+        record, record_type = TABLE_LAYOUT[table]
+        offset, count = self._tables[table]
+        if not 0 <= index < count:
+            raise IndexError(f"{table} index out of range: {index}")
+        values = record.unpack_from(self._mm, offset + index * record.size)
+        return record_type(*values) if record_type else values[0]
+
+    def string(self, sid: int) -> Optional[str]:
+        """Decode an interned string (``None`` for the empty sentinel)"""
+        if sid == NONE:
+            return None
+        value = self._strings.get(sid)
+        if value is None:
+            start = self._record("string_offsets", sid)
+            end = self._record("string_offsets", sid + 1)
+            data_offset = self._tables["string_data"][0]
+            value = self._strings[sid] = self._mm[data_offset + start:data_offset + end].decode('utf-8')
+        return value
+
+    def form(self, index: int) -> FormRecord:
+        return self._record("forms", index)
+
+    def page(self, index: int) -> PageRecord:
+        return self._record("pages", index)
+
+    def section(self, index: int) -> SectionRecord:
+        return self._record("sections", index)
+
+    def question(self, index: int) -> QuestionRecord:
+        return self._record("questions", index)
+
+    def answer(self, index: int) -> AnswerRecord:
+        return self._record("answers", index)
+
+    def source(self, index: int) -> SourceRecord:
+        return self._record("sources", index)
+
+    def forms(self) -> Iterator[FormRecord]:
+        return (self.form(i) for i in range(self.count("forms")))
+
+    def pages_of(self, form: FormRecord) -> Iterator[PageRecord]:
+        return (self.page(i) for i in range(form.first_page, form.first_page + form.page_count))
+
+    def sections_of(self, page: PageRecord) -> Iterator[SectionRecord]:
+        return (self.section(i) for i in range(page.first_section, page.first_section + page.section_count))
+
+    def questions_of(self, section: SectionRecord) -> Iterator[QuestionRecord]:
+        """Every question of a section, nested obsGroup members included"""
+        return (self.question(i) for i in
+                range(section.first_question, section.first_question + section.question_count))
+
+    def answers_of(self, question: QuestionRecord) -> Iterator[AnswerRecord]:
+        return (self.answer(i) for i in
+                range(question.first_answer, question.first_answer + question.answer_count))
+
+    def concepts(self) -> Iterator[str]:
+        """Distinct concept UUIDs referenced anywhere, in sorted order"""
+        return (self.string(self._record("concepts", i)) for i in range(self.count("concepts")))
+
+    def has_concept(self, uuid: str) -> bool:
+        """Binary search over the sorted concept table, decoding only the probed strings"""
+        lo, hi = 0, self.count("concepts")
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.string(self._record("concepts", mid)) < uuid:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo < self.count("concepts") and self.string(self._record("concepts", lo)) == uuid
+
+    def form_header(self, form: FormRecord) -> Dict[str, Optional[str]]:
+        return {
+            'filename': self.string(form.filename),
+            'name': self.string(form.name),
+            'description': self.string(form.description),
+            'uuid': self.string(form.uuid),
+            'encounter': self.string(form.encounter)
+        }
+
+    def is_stale(self, forms_dir: str, verify_hashes: bool = True) -> bool:
+        """True if the registry changed since the snapshot was built
+
+        Sources whose size and mtime match are trusted; with ``verify_hashes``
+        a touched but unmodified file is confirmed by its SHA-256 instead of
+        forcing a rebuild.
+        """
+        sources = {self.string(s.filename): s for s in
+                   (self.source(i) for i in range(self.count("sources")))}
+        current = FormRegistry(forms_dir).filenames()
+        if set(current) != set(sources):
+            return True
+
+        for filename in current:
+            source = sources[filename]
+            path = os.path.join(forms_dir, filename)
+            stat = os.stat(path)
+            if stat.st_mtime_ns == source.mtime_ns and stat.st_size == source.size:
+                continue
+            if not verify_hashes or stat.st_size != source.size:
+                return True
+            with open(path, 'rb') as f:
+                if hashlib.sha256(f.read()).digest() != source.sha256:
+                    return True
+        return False
+
+def open_snapshot(forms_dir: str, snapshot_path: str, rebuild: bool = True) -> FormSnapshot:
+    """Open a snapshot, rebuilding it first if it is missing or stale"""
+    if rebuild:
+        fresh = False
+        if os.path.exists(snapshot_path):
+            try:
+                with FormSnapshot(snapshot_path) as snapshot:
+                    fresh = not snapshot.is_stale(forms_dir)
+            except (ValueError, struct.error, OSError):
+                # Corrupt, truncated or unreadable: rebuild it
+                fresh = False
+        if not fresh:
+            build_snapshot(forms_dir, snapshot_path)
+    return FormSnapshot(snapshot_path)
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Compile the forms registry into a binary snapshot")
+    parser.add_argument("docs_root", nargs="?", default=".", help="Documentation root directory")
+    parser.add_argument("--output", help=f"Snapshot path (default: <docs_root>/{DEFAULT_SNAPSHOT})")
+    parser.add_argument("--check", action="store_true",
+                        help="Only report whether the snapshot is stale (exit 1 if it is)")
+    args = parser.parse_args()
+
+    forms_dir = os.path.join(args.docs_root, FORMS_DIR)
+    snapshot_path = args.output or os.path.join(args.docs_root, DEFAULT_SNAPSHOT)
+
+    if args.check:
+        if not os.path.exists(snapshot_path):
+            print(f"❌ Snapshot not found: {snapshot_path}")
+            sys.exit(1)
+        try:
+            with FormSnapshot(snapshot_path) as snapshot:
+                stale = snapshot.is_stale(forms_dir)
+        except (ValueError, struct.error, OSError) as e:
+            print(f"❌ Snapshot is unreadable: {snapshot_path} ({e})")
+            sys.exit(1)
+        print(f"❌ Snapshot is stale: {snapshot_path}" if stale else f"✅ Snapshot is up to date: {snapshot_path}")
+        sys.exit(1 if stale else 0)
+
+    print("📦 Compiling form registry snapshot...")
+    count = build_snapshot(forms_dir, snapshot_path)
+    with FormSnapshot(snapshot_path) as snapshot:
+        print(f"✅ Compiled {count} forms, {snapshot.count('pages')} pages, "
+              f"{snapshot.count('sections')} sections, {snapshot.count('questions')} questions, "
+              f"{snapshot.count('concepts')} concepts to: {snapshot_path}")
+
+if __name__ == "__main__":
+    main()
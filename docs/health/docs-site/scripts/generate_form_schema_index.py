@@ -9,6 +9,8 @@ import json
 import re
 from pathlib import Path
 
+from form_registry import FormRegistry
+
 def get_form_schemas(forms_dir):
     """Get all form schema files and their metadata"""
     forms = []
@@ -16,30 +18,29 @@ def get_form_schemas(forms_dir):
     if not os.path.exists(forms_dir):
         return forms
     
-    for file in os.listdir(forms_dir):
-        if file.endswith('.json'):
-            file_path = os.path.join(forms_dir, file)
+    # Only the header fields are read; the pages of each form are never parsed
+    registry = FormRegistry(forms_dir)
+    
+    for file in registry.filenames():
+        try:
+            form_data = registry.header(file)
             
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    form_data = json.load(f)
-                
-                forms.append({
-                    'filename': file,
-                    'name': form_data.get('name', 'Unknown Form'),
-                    'description': form_data.get('description', 'No description'),
-                    'uuid': form_data.get('uuid', 'No UUID'),
-                    'encounter': form_data.get('encounter', 'No encounter type')
-                })
-            except Exception as e:
-                print(f"Error reading {file}: {e}")
-                forms.append({
-                    'filename': file,
-                    'name': file.replace('.json', '').replace('-', ' ').title(),
-                    'description': 'Error reading form data',
-                    'uuid': 'N/A',
-                    'encounter': 'N/A'
-                })
+            forms.append({
+                'filename': file,
+                'name': form_data.get('name', 'Unknown Form'),
+                'description': form_data.get('description', 'No description'),
+                'uuid': form_data.get('uuid', 'No UUID'),
+                'encounter': form_data.get('encounter', 'No encounter type')
+            })
+        except Exception as e:
+            print(f"Error reading {file}: {e}")
+            forms.append({
+                'filename': file,
+                'name': file.replace('.json', '').replace('-', ' ').title(),
+                'description': 'Error reading form data',
+                'uuid': 'N/A',
+                'encounter': 'N/A'
+            })
     
     return sorted(forms, key=lambda x: x['name'])
 
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Documentation Maintenance Agent - Link Validation Cache
+Persists per-file content hashes, anchors and link results between runs
+"""
+
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable
+
+DEFAULT_CACHE_DIR = ".cache"
+CACHE_FILE = "link-validator.sqlite3"
+
+class LinkCache:
+    """SQLite-backed cache of link validation state, keyed by relative path"""
+
+    SCHEMA_VERSION = "1"
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self._ensure_schema()
+
+    @classmethod
+    def for_root(cls, root_dir: str, cache_dir: str = None) -> "LinkCache":
+        """Open the cache stored under ``<root_dir>/.cache`` (or ``cache_dir``)"""
+        cache_dir = cache_dir or os.path.join(root_dir, DEFAULT_CACHE_DIR)
+        return cls(os.path.join(cache_dir, CACHE_FILE))
+
+    def _ensure_schema(self):
+        """Create tables, discarding the cache if it was written by another schema"""
+        cur = self.conn.cursor()
+        cur.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = cur.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+        if row is None or row[0] != self.SCHEMA_VERSION:
+            cur.execute("DROP TABLE IF EXISTS files")
+            cur.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('schema', ?)",
+                        (self.SCHEMA_VERSION,))
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY,"
+            " mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " hash TEXT NOT NULL,"
+            " anchors TEXT NOT NULL,"
+            " links TEXT NOT NULL)"
+        )
+        self.conn.commit()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Load every cached entry"""
+        entries = {}
+        for path, mtime_ns, size, digest, anchors, links in self.conn.execute(
+                "SELECT path, mtime_ns, size, hash, anchors, links FROM files"):
+            entries[path] = {
+                "mtime_ns": mtime_ns,
+                "size": size,
+                "hash": digest,
+                "anchors": frozenset(json.loads(anchors)),
+                "links": [tuple(link) for link in json.loads(links)]
+            }
+        return entries
+
+    def save(self, entries: Dict[str, Dict[str, Any]], removed: Iterable[str] = ()):
+        """Upsert the given entries and drop removed paths in one transaction"""
+        with self.conn:
+            self.conn.executemany("DELETE FROM files WHERE path = ?",
+                                  [(path,) for path in removed])
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, size, hash, anchors, links)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [(path, e["mtime_ns"], e["size"], e["hash"],
+                  json.dumps(sorted(e["anchors"])), json.dumps(e["links"]))
+                 for path, e in entries.items()]
+            )
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Documentation Maintenance Agent - Link Graph
+Compact page-to-page link graph with orphan, hub and cycle reports
+"""
+
+import json
+import os
+import struct
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MAGIC = b"ZSLG"
+FORMAT_VERSION = 1
+INDEX_FILES = ("README.md", "index.md")
+
+class LinkGraph:
+    """Directed page graph stored as CSR adjacency arrays
+
+    Nodes are integer IDs into ``labels``; the out-edges of node ``i`` are
+    ``targets[offsets[i]:offsets[i + 1]]``. Duplicate links between the same
+    two pages collapse to a single edge and self-links are dropped.
+    """
+
+    def __init__(self, labels: List[str], offsets: array, targets: array):
+        self.labels = labels
+        self.offsets = offsets
+        self.targets = targets
+        self._in_degree = None
+
+    @classmethod
+    def build(cls, labels: List[str], edges: Iterable[Tuple[int, int]]) -> "LinkGraph":
+        """Build from node labels and (source, target) ID pairs in O(V + E)"""
+        n = len(labels)
+        buckets: List[Optional[set]] = [None] * n
+        for source, target in edges:
+            if source == target:
+                continue
+            bucket = buckets[source]
+            if bucket is None:
+                bucket = buckets[source] = set()
+            bucket.add(target)
+
+        offsets = array('i', [0])
+        targets = array('i')
+        for bucket in buckets:
+            if bucket:
+                targets.extend(sorted(bucket))
+            offsets.append(len(targets))
+        return cls(labels, offsets, targets)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.labels)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def successors(self, node: int) -> array:
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def out_degree(self, node: int) -> int:
+        return self.offsets[node + 1] - self.offsets[node]
+
+    def in_degree(self) -> array:
+        """In-degree of every node (computed once)"""
+        if self._in_degree is None:
+            degrees = array('i', bytes(4 * self.node_count))
+            for target in self.targets:
+                degrees[target] += 1
+            self._in_degree = degrees
+        return self._in_degree
+
+    def reverse(self) -> "LinkGraph":
+        """The graph with every edge flipped"""
+        edges = ((target, source) for source in range(self.node_count)
+                 for target in self.successors(source))
+        return LinkGraph.build(self.labels, edges)
+
+    def unreferenced(self) -> List[int]:
+        """Pages that no other page links to"""
+        degrees = self.in_degree()
+        return [node for node in range(self.node_count) if degrees[node] == 0]
+
+    def orphans(self) -> List[int]:
+        """Pages with no links in either direction"""
+        degrees = self.in_degree()
+        return [node for node in range(self.node_count)
+                if degrees[node] == 0 and self.out_degree(node) == 0]
+
+    def hubs(self, top: int = 10) -> List[Tuple[int, int]]:
+        """The ``top`` most-linked pages as (node, in-degree) pairs"""
+        degrees = self.in_degree()
+        ranked = sorted(range(self.node_count), key=lambda node: (-degrees[node], self.labels[node]))
+        return [(node, degrees[node]) for node in ranked[:top] if degrees[node] > 0]
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """Tarjan's algorithm, iterative so deep link chains can't overflow the stack"""
+        index_of = [-1] * self.node_count
+        lowlink = [0] * self.node_count
+        on_stack = [False] * self.node_count
+        stack: List[int] = []
+        components = []
+        counter = 0
+
+        for root in range(self.node_count):
+            if index_of[root] != -1:
+                continue
+            work = [(root, self.offsets[root])]
+            index_of[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+
+            while work:
+                node, edge = work[-1]
+                if edge < self.offsets[node + 1]:
+                    work[-1] = (node, edge + 1)
+                    target = self.targets[edge]
+                    if index_of[target] == -1:
+                        index_of[target] = lowlink[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack[target] = True
+                        work.append((target, self.offsets[target]))
+                    elif on_stack[target]:
+                        lowlink[node] = min(lowlink[node], index_of[target])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(sorted(component))
+
+        return components
+
+    def to_json(self) -> Dict:
+        return {
+            "version": FORMAT_VERSION,
+            "nodes": self.labels,
+            "offsets": self.offsets.tolist(),
+            "targets": self.targets.tolist()
+        }
+
+    def save(self, path: str):
+        """Write the graph as JSON (``.json``) or the compact binary format"""
+        if path.endswith('.json'):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_json(), f)
+            return
+
+        labels = "\n".join(self.labels).encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<IIII', FORMAT_VERSION, self.node_count, self.edge_count, len(labels)))
+            f.write(_little_endian(self.offsets).tobytes())
+            f.write(_little_endian(self.targets).tobytes())
+            f.write(labels)
+
+    @classmethod
+    def load(cls, path: str) -> "LinkGraph":
+        """Read a graph written by ``save``"""
+        if path.endswith('.json'):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return cls(data["nodes"], array('i', data["offsets"]), array('i', data["targets"]))
+
+        with open(path, 'rb') as f:
+            if f.read(4) != MAGIC:
+                raise ValueError(f"Not a link graph file: {path}")
+            version, nodes, edges, label_size = struct.unpack('<IIII', f.read(16))
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported link graph version {version} in {path}")
+            offsets = array('i')
+            offsets.frombytes(f.read(4 * (nodes + 1)))
+            targets = array('i')
+            targets.frombytes(f.read(4 * edges))
+            labels = f.read(label_size).decode('utf-8')
+        return cls(labels.split("\n") if nodes else [], _little_endian(offsets), _little_endian(targets))
+
+def _little_endian(values: array) -> array:
+    """Byte-swap on big-endian hosts so the binary format is portable"""
+    if struct.pack('=i', 1) == struct.pack('<i', 1):
+        return values
+    swapped = array(values.typecode, values)
+    swapped.byteswap()
+    return swapped
+
+def resolve_page(target: str, nodes: Dict[str, int]) -> Optional[int]:
+    """Map a resolved link target to a page ID, following directory index pages"""
+    node = nodes.get(target)
+    if node is None and not target.endswith('.md'):
+        for index_file in INDEX_FILES:
+            node = nodes.get(os.path.join(target, index_file))
+            if node is not None:
+                break
+    return node
+
+def report_graph(graph: LinkGraph, top: int = 10) -> bool:
+    """Print orphan, hub and cycle reports for a link graph"""
+    print(f"🕸️  Link graph: {graph.node_count} pages, {graph.edge_count} links")
+
+    unreferenced = graph.unreferenced()
+    orphans = set(graph.orphans())
+    print(f"\n📭 {len(unreferenced)} pages nothing links to ({len(orphans)} orphans with no links at all):")
+    for node in unreferenced:
+        marker = " (orphan)" if node in orphans else ""
+        print(f"  • {graph.labels[node]}{marker}")
+
+    print(f"\n⭐ Top {top} most-linked pages:")
+    for node, degree in graph.hubs(top):
+        print(f"  • {graph.labels[node]}: {degree} incoming")
+
+    cycles = [c for c in graph.strongly_connected_components() if len(c) > 1]
+    print(f"\n🔁 {len(cycles)} strongly connected groups of pages:")
+    for component in sorted(cycles, key=lambda c: (-len(c), graph.labels[c[0]])):
+        print(f"  • {len(component)} pages: {', '.join(graph.labels[node] for node in component)}")
+
+    return True
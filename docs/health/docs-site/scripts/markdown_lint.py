@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Documentation Maintenance Agent - Markdown Lint Engine
+Classifies each markdown line once and runs every style rule over the token stream in one pass
+"""
+
+import json
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+CONFIG_FILE = ".markdownlint.json"
+
+# Token kinds
+BLANK = "blank"
+TEXT = "text"
+HEADING = "heading"
+SETEXT_UNDERLINE = "setext-underline"
+LIST_ITEM = "list-item"
+TABLE = "table"
+RULE = "thematic-break"
+FENCE_OPEN = "fence-open"
+FENCE_CLOSE = "fence-close"
+CODE = "code"
+INDENTED_CODE = "indented-code"
+FRONT_MATTER = "front-matter"
+
+CODE_KINDS = (FENCE_OPEN, FENCE_CLOSE, CODE, INDENTED_CODE)
+
+ATX_HEADING = re.compile(r'^ {0,3}(#{1,6})(?:[ \t]+|$)')
+ATX_CLOSED = re.compile(r'[ \t]#+[ \t]*$')
+SETEXT = re.compile(r'^ {0,3}(=+|-+)[ \t]*$')
+THEMATIC_BREAK = re.compile(r'^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$')
+FENCE = re.compile(r'^( {0,3})(`{3,}|~{3,})(.*)$')
+LIST_MARKER = re.compile(r'^([ \t]*)([-*+]|\d{1,9}[.)])(?:[ \t]+|$)')
+TABLE_DELIMITER = re.compile(r'^[ \t]*\|?[ \t]*:?-+:?[ \t]*(\|[ \t]*:?-+:?[ \t]*)*\|?[ \t]*$')
+CODE_SPAN = re.compile(r'(`+).+?\1')
+HTML_TAG = re.compile(r'(?<!\\)<([A-Za-z][A-Za-z0-9-]*)(?=[\s/>])')
+
+class Token:
+    """One classified line of a markdown file"""
+
+    __slots__ = ("number", "text", "kind", "indent", "level", "style", "marker", "info")
+
+    def __init__(self, number: int, text: str, kind: str, indent: int = 0):
+        self.number = number
+        self.text = text
+        self.kind = kind
+        self.indent = indent
+        # Headings: level and "atx", "atx_closed" or "setext"
+        self.level = 0
+        self.style = None
+        # List items: marker; fences: info string
+        self.marker = None
+        self.info = None
+
+def indentation(line: str) -> int:
+    """Leading whitespace width, with tabs advancing to the next multiple of 4"""
+    width = 0
+    for char in line:
+        if char == ' ':
+            width += 1
+        elif char == '\t':
+            width += 4 - width % 4
+        else:
+            break
+    return width
+
+def tokenize(lines: List[str]) -> List[Token]:
+    """Classify every line by the block it belongs to"""
+    tokens: List[Token] = []
+    fence = None
+    in_table = False
+    in_list = False
+    texts = [line.rstrip('\r\n') for line in lines]
+
+    start = 0
+    if texts and texts[0].strip() == '---':
+        end = next((i for i in range(1, len(texts)) if texts[i].strip() in ('---', '...')), None)
+        if end is not None:
+            tokens.extend(Token(i + 1, texts[i], FRONT_MATTER) for i in range(end + 1))
+            start = end + 1
+
+    for index in range(start, len(texts)):
+        text = texts[index]
+        number = index + 1
+        indent = indentation(text)
+        stripped = text.strip()
+
+        if fence is not None:
+            closing = FENCE.match(text.lstrip())
+            if closing and closing.group(2)[0] == fence[0] and len(closing.group(2)) >= len(fence) \
+                    and not closing.group(3).strip():
+                tokens.append(Token(number, text, FENCE_CLOSE, indent))
+                fence = None
+            else:
+                tokens.append(Token(number, text, CODE, indent))
+            continue
+
+        if not stripped:
+            tokens.append(Token(number, text, BLANK, indent))
+            in_table = False
+            continue
+
+        previous = tokens[-1] if tokens else None
+        opening = FENCE.match(text.lstrip()) if indent < 4 or in_list else None
+        if opening and not (opening.group(2)[0] == '`' and '`' in opening.group(3)):
+            token = Token(number, text, FENCE_OPEN, indent)
+            token.info = opening.group(3).strip()
+            tokens.append(token)
+            fence = opening.group(2)
+            continue
+
+        if indent >= 4 and not in_list and (previous is None or previous.kind in (BLANK, INDENTED_CODE)):
+            tokens.append(Token(number, text, INDENTED_CODE, indent))
+            continue
+
+        heading = ATX_HEADING.match(text)
+        if heading:
+            token = Token(number, text, HEADING, indent)
+            token.level = len(heading.group(1))
+            content = text[heading.end():]
+            token.style = "atx_closed" if content.strip('# \t') and ATX_CLOSED.search(content) else "atx"
+            tokens.append(token)
+            in_list = False
+            continue
+
+        if SETEXT.match(text) and previous is not None and previous.kind == TEXT and previous.indent < 4:
+            previous.kind = HEADING
+            previous.level = 1 if stripped[0] == '=' else 2
+            previous.style = "setext"
+            tokens.append(Token(number, text, SETEXT_UNDERLINE, indent))
+            continue
+
+        if THEMATIC_BREAK.match(text):
+            tokens.append(Token(number, text, RULE, indent))
+            in_list = False
+            continue
+
+        item = LIST_MARKER.match(text)
+        if item:
+            token = Token(number, text, LIST_ITEM, indent)
+            token.marker = item.group(2)
+            tokens.append(token)
+            in_list = True
+            continue
+
+        if in_table or ('|' in text and index + 1 < len(texts) and '|' in texts[index + 1]
+                        and TABLE_DELIMITER.match(texts[index + 1])):
+            tokens.append(Token(number, text, TABLE, indent))
+            in_table = True
+            continue
+
+        if indent == 0 and previous is not None and previous.kind == BLANK:
+            in_list = False
+        tokens.append(Token(number, text, TEXT, indent))
+
+    return tokens
+
+# report(token, detail)
+Report = Callable[[Token, str], None]
+
+class Rule:
+    """A style rule; ``visit`` sees only the token kinds listed in ``kinds``"""
+
+    code = ""
+    alias = ""
+    description = ""
+    kinds: tuple = ()
+    defaults: Dict[str, Any] = {}
+
+    def __init__(self, options: Optional[Dict[str, Any]] = None):
+        self.options = dict(self.defaults)
+        self.options.update(options or {})
+
+    def start(self):
+        """Reset per-file state"""
+
+    def visit(self, tokens: List[Token], index: int, report: Report):
+        raise NotImplementedError
+
+class HeadingIncrement(Rule):
+    code = "MD001"
+    alias = "heading-increment"
+    description = "Heading levels should only increment by one level at a time"
+    kinds = (HEADING,)
+
+    def start(self):
+        self.level = 0
+
+    def visit(self, tokens, index, report):
+        level = tokens[index].level
+        if self.level and level > self.level + 1:
+            report(tokens[index], f"Expected: h{self.level + 1}; Actual: h{level}")
+        self.level = level
+
+class HeadingStyle(Rule):
+    code = "MD003"
+    alias = "heading-style"
+    description = "Heading style"
+    kinds = (HEADING,)
+    defaults = {"style": "consistent"}
+
+    def start(self):
+        self.expected = None if self.options["style"] == "consistent" else self.options["style"]
+
+    def visit(self, tokens, index, report):
+        style = tokens[index].style
+        if self.expected is None:
+            self.expected = style
+        elif style != self.expected:
+            report(tokens[index], f"Expected: {self.expected}; Actual: {style}")
+
+class ListIndent(Rule):
+    code = "MD007"
+    alias = "ul-indent"
+    description = "Unordered list indentation"
+    kinds = (LIST_ITEM, TEXT, HEADING, RULE, TABLE)
+    defaults = {"indent": 2, "start_indented": False, "start_indent": None}
+
+    def start(self):
+        # (indent, ordered) of the enclosing list items
+        self.stack = []
+
+    def visit(self, tokens, index, report):
+        token = tokens[index]
+        if token.kind != LIST_ITEM:
+            # Unindented text ends the list unless it lazily continues an item
+            lazy = token.kind == TEXT and index > 0 and tokens[index - 1].kind != BLANK
+            if token.kind != TEXT or (token.indent == 0 and not lazy):
+                self.stack = []
+            return
+
+        ordered = token.marker[0].isdigit()
+        while self.stack and self.stack[-1][0] > token.indent:
+            self.stack.pop()
+        if self.stack and self.stack[-1][0] == token.indent:
+            self.stack.pop()
+        parents = self.stack
+        self.stack = parents + [(token.indent, ordered)]
+
+        # Only purely unordered nesting has a fixed expected indent
+        if ordered or any(parent_ordered for _, parent_ordered in parents):
+            return
+        first = (self.options["start_indent"] or self.options["indent"]) if self.options["start_indented"] else 0
+        expected = first + len(parents) * self.options["indent"]
+        if token.indent != expected:
+            report(token, f"Expected: {expected}; Actual: {token.indent}")
+
+class NoHardTabs(Rule):
+    code = "MD010"
+    alias = "no-hard-tabs"
+    description = "Hard tabs"
+    kinds = (TEXT, HEADING, LIST_ITEM, TABLE, RULE, SETEXT_UNDERLINE, BLANK) + CODE_KINDS
+    defaults = {"code_blocks": True}
+
+    def visit(self, tokens, index, report):
+        token = tokens[index]
+        if '\t' in token.text and (self.options["code_blocks"] or token.kind not in CODE_KINDS):
+            report(token, f"Column: {token.text.index(chr(9)) + 1}")
+
+class LineLength(Rule):
+    code = "MD013"
+    alias = "line-length"
+    description = "Line length"
+    kinds = (TEXT, HEADING, LIST_ITEM, TABLE) + CODE_KINDS
+    defaults = {"line_length": 80, "heading_line_length": None, "code_block_line_length": None,
+                "code_blocks": True, "tables": True, "headings": True, "strict": False}
+
+    def visit(self, tokens, index, report):
+        token = tokens[index]
+        if token.kind in CODE_KINDS:
+            if not self.options["code_blocks"]:
+                return
+            limit = self.options["code_block_line_length"] or self.options["line_length"]
+        elif token.kind == TABLE:
+            if not self.options["tables"]:
+                return
+            limit = self.options["line_length"]
+        elif token.kind == HEADING:
+            if not self.options["headings"]:
+                return
+            limit = self.options["heading_line_length"] or self.options["line_length"]
+        else:
+            limit = self.options["line_length"]
+
+        length = len(token.text)
+        # Like markdownlint, a long URL or word with no space after the limit is allowed
+        if length > limit and (self.options["strict"] or re.search(r'\s', token.text[limit:])):
+            report(token, f"Expected: {limit}; Actual: {length}")
+
+class BlanksAroundHeadings(Rule):
+    code = "MD022"
+    alias = "blanks-around-headings"
+    description = "Headings should be surrounded by blank lines"
+    kinds = (HEADING,)
+
+    def visit(self, tokens, index, report):
+        token = tokens[index]
+        if index > 0 and tokens[index - 1].kind not in (BLANK, FRONT_MATTER):
+            report(token, "Expected: 1; Actual: 0; Above")
+        after = index + 2 if token.style == "setext" else index + 1
+        if after < len(tokens) and tokens[after].kind != BLANK:
+            report(token, "Expected: 1; Actual: 0; Below")
+
+class NoInlineHtml(Rule):
+    code = "MD033"
+    alias = "no-inline-html"
+    description = "Inline HTML"
+    kinds = (TEXT, HEADING, LIST_ITEM, TABLE)
+    defaults = {"allowed_elements": []}
+
+    def start(self):
+        self.allowed = {element.lower() for element in self.options["allowed_elements"]}
+
+    def visit(self, tokens, index, report):
+        text = tokens[index].text
+        if '<' not in text:
+            return
+        for match in HTML_TAG.finditer(CODE_SPAN.sub('', text)):
+            element = match.group(1).lower()
+            if element not in self.allowed:
+                report(tokens[index], f"Element: {element}")
+
+class FencedCodeLanguage(Rule):
+    code = "MD040"
+    alias = "fenced-code-language"
+    description = "Fenced code blocks should have a language specified"
+    kinds = (FENCE_OPEN,)
+
+    def visit(self, tokens, index, report):
+        if not tokens[index].info:
+            report(tokens[index], "Missing language")
+
+RULES = [HeadingIncrement, HeadingStyle, ListIndent, NoHardTabs, LineLength,
+         BlanksAroundHeadings, NoInlineHtml, FencedCodeLanguage]
+
+def load_config(directory: str) -> Dict[str, Any]:
+    """The markdownlint configuration of a documentation tree, if it has one"""
+    path = os.path.join(directory, CONFIG_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+class LintEngine:
+    """Runs the enabled rules over each file's token stream
+
+    Rules are enabled and configured the way markdownlint reads
+    ``.markdownlint.json``: by code or alias, with ``default`` deciding
+    rules the file doesn't mention. Settings for rules this engine doesn't
+    implement are ignored. Each rule only sees the token kinds it
+    declares, so a file costs one tokenization and one dispatch per line.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        enabled_by_default = config.get("default", True) is not False
+        self.rules: List[Rule] = []
+        for rule_class in RULES:
+            setting = config.get(rule_class.code, config.get(rule_class.alias, enabled_by_default))
+            if setting is False:
+                continue
+            self.rules.append(rule_class(setting if isinstance(setting, dict) else None))
+
+        self.dispatch: Dict[str, List[Rule]] = {}
+        for rule in self.rules:
+            for kind in rule.kinds:
+                self.dispatch.setdefault(kind, []).append(rule)
+
+    def lint_lines(self, file_path: str, lines: List[str]) -> List[Dict[str, Any]]:
+        """Errors for one file, in markdownlint's JSON result format"""
+        tokens = tokenize(lines)
+        errors = []
+
+        def reporter(rule: Rule) -> Report:
+            def report(token: Token, detail: str):
+                errors.append({
+                    "fileName": file_path,
+                    "lineNumber": token.number,
+                    "ruleNames": [rule.code, rule.alias],
+                    "ruleDescription": rule.description,
+                    "errorDetail": detail,
+                    "errorContext": token.text.strip()[:80]
+                })
+            return report
+
+        reports = {rule: reporter(rule) for rule in self.rules}
+        for rule in self.rules:
+            rule.start()
+        for index, token in enumerate(tokens):
+            for rule in self.dispatch.get(token.kind, ()):
+                rule.visit(tokens, index, reports[rule])
+
+        errors.sort(key=lambda error: error["lineNumber"])
+        return errors
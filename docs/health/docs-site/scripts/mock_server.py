@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Documentation Maintenance Agent - API Mock Server
+Serves the examples of the OpenAPI specifications locally and load-tests clients against them
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import sys
+import time
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Tuple
+
+from spec_loader import load_spec
+from spec_resolver import SpecResolver, unwrap
+
+API_SPECS_DIR = "04-api-specifications"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 4010
+HTTP_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+# Nesting depth at which schema-generated bodies stop, so recursive schemas terminate
+MAX_SCHEMA_DEPTH = 8
+
+def render_response(status: int, body: bytes, content_type: str = "application/json") -> bytes:
+    """A complete HTTP/1.1 response with a keep-alive connection"""
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        # Specs may declare codes outside the standard set, e.g. 299
+        reason = ""
+    head = f"HTTP/1.1 {status} {reason}\r\n"
+    if body:
+        head += f"Content-Type: {content_type}\r\n"
+    head += f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n"
+    return head.encode('ascii') + body
+
+def error_response(status: int, message: str) -> bytes:
+    return render_response(status, json.dumps({"error": message}).encode('utf-8'))
+
+class Route:
+    """A mocked operation with its response rendered once, up front"""
+
+    __slots__ = ("method", "template", "params", "status", "response", "source")
+
+    def __init__(self, method: str, template: str, status: int, body: Any, source: str):
+        self.method = method
+        self.template = template
+        # Names of the {param} segments, in path order; specs sharing a path
+        # may name the same position differently, so names belong to the route
+        self.params = tuple(segment[1:-1] for segment in RouteTrie.segments(template)
+                            if segment.startswith('{') and segment.endswith('}'))
+        self.status = status
+        payload = b"" if body is None else json.dumps(body, default=str).encode('utf-8')
+        self.response = render_response(status, payload)
+        self.source = source
+
+    def bind(self, values: List[str]) -> Dict[str, str]:
+        """Name the parameter values matched for this route's path"""
+        return dict(zip(self.params, values))
+
+class TrieNode:
+    """One path segment; literal children are tried before the ``{param}`` child"""
+
+    __slots__ = ("children", "param", "routes")
+
+    def __init__(self):
+        self.children: Dict[str, "TrieNode"] = {}
+        self.param: Optional["TrieNode"] = None
+        self.routes: Dict[str, Route] = {}
+
+class RouteTrie:
+    """Route table over path segments with ``{param}`` wildcards
+
+    Matching walks one node per segment, so lookup cost depends on the path
+    length only, not on the number of routes.
+    """
+
+    def __init__(self):
+        self.root = TrieNode()
+        self.count = 0
+
+    @staticmethod
+    def segments(path: str) -> List[str]:
+        return [segment for segment in path.split('/') if segment]
+
+    def add(self, route: Route):
+        node = self.root
+        for segment in self.segments(route.template):
+            if segment.startswith('{') and segment.endswith('}'):
+                if node.param is None:
+                    node.param = TrieNode()
+                node = node.param
+            else:
+                node = node.children.setdefault(segment, TrieNode())
+        if route.method not in node.routes:
+            self.count += 1
+        node.routes[route.method] = route
+
+    def match(self, path: str) -> Tuple[Optional[TrieNode], List[str]]:
+        """The node for a concrete path and its parameter values, in path order
+
+        ``Route.bind`` names the values for whichever of the node's routes is used.
+        """
+        values: List[str] = []
+        node = self._match(self.root, self.segments(path), 0, values)
+        values.reverse()
+        return node, values
+
+    def _match(self, node: TrieNode, segments: List[str], index: int, values: List[str]) -> Optional[TrieNode]:
+        if index == len(segments):
+            return node if node.routes else None
+        child = node.children.get(segments[index])
+        if child is not None:
+            found = self._match(child, segments, index + 1, values)
+            if found is not None:
+                return found
+        if node.param is not None:
+            found = self._match(node.param, segments, index + 1, values)
+            if found is not None:
+                # Appended while unwinding, so deepest first
+                values.append(segments[index])
+                return found
+        return None
+
+def schema_example(resolver: SpecResolver, file_path: str, schema: Any, depth: int = 0) -> Any:
+    """A value built from a schema's own and its properties' ``example`` keywords"""
+    file_path, schema = resolver.deref(file_path, schema)
+    if not isinstance(schema, dict) or depth > MAX_SCHEMA_DEPTH:
+        return None
+    if 'example' in schema:
+        return schema['example']
+    if schema.get('enum'):
+        return schema['enum'][0]
+    for keyword in ('allOf', 'oneOf', 'anyOf'):
+        if schema.get(keyword):
+            if keyword != 'allOf':
+                return schema_example(resolver, file_path, schema[keyword][0], depth + 1)
+            merged = {}
+            for part in schema['allOf']:
+                value = schema_example(resolver, file_path, part, depth + 1)
+                if isinstance(value, dict):
+                    merged.update(value)
+            return merged
+    schema_type = schema.get('type')
+    if schema_type == 'object' or 'properties' in schema:
+        return {name: schema_example(resolver, file_path, prop, depth + 1)
+                for name, prop in (schema.get('properties') or {}).items()}
+    if schema_type == 'array':
+        item = schema_example(resolver, file_path, schema.get('items'), depth + 1)
+        return [] if item is None else [item]
+    return {"string": "string", "integer": 0, "number": 0, "boolean": True}.get(schema_type)
+
+def operation_response(resolver: SpecResolver, file_path: str, operation: Dict[str, Any]) -> Tuple[int, Any]:
+    """The status and body to mock: the first success response, preferring spec examples"""
+    responses = resolver.view(file_path, operation).get('responses') or {}
+    statuses = sorted(str(code) for code in responses)
+    chosen = next((code for code in statuses if code.startswith('2')), statuses[0] if statuses else None)
+    if chosen is None:
+        return 200, None
+
+    response = responses.get(chosen, responses.get(int(chosen)) if chosen.isdigit() else None)
+    status = int(chosen) if chosen.isdigit() else 200
+    content = response.get('content') if response is not None else None
+    if not content:
+        return status, None
+    media_type = 'application/json' if 'application/json' in content else next(iter(content))
+    media_file, media = unwrap(content[media_type])
+
+    if 'example' in media:
+        return status, media['example']
+    for example in (media.get('examples') or {}).values():
+        _, example = resolver.deref(media_file, example)
+        if isinstance(example, dict) and 'value' in example:
+            return status, example['value']
+    if 'schema' in media:
+        return status, schema_example(resolver, media_file, media['schema'])
+    return status, None
+
+def build_routes(spec_files: List[str]) -> RouteTrie:
+    """Compile every operation of the given specs into one route trie"""
+    trie = RouteTrie()
+    resolver = SpecResolver()
+    for spec_file in spec_files:
+        spec = load_spec(spec_file)
+        file_path = resolver.add_document(spec_file, spec)
+        for template, path_item in ((spec or {}).get('paths') or {}).items():
+            item_file, path_item = resolver.deref(file_path, path_item)
+            for method, operation in (path_item or {}).items():
+                if method not in HTTP_METHODS:
+                    continue
+                status, body = operation_response(resolver, item_file, operation)
+                trie.add(Route(method.upper(), template, status, body, spec_file))
+    return trie
+
+class MockServer:
+    """Minimal asyncio HTTP/1.1 server answering from a route trie"""
+
+    def __init__(self, routes: RouteTrie, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.routes = routes
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    def respond(self, method: str, target: str) -> bytes:
+        node, _ = self.routes.match(target.split('?', 1)[0])
+        if node is None:
+            return error_response(404, f"No mocked route for {target}")
+        route = node.routes.get(method)
+        if route is None and method == 'HEAD' and 'GET' in node.routes:
+            # Same headers as GET, no body
+            return node.routes['GET'].response.partition(b"\r\n\r\n")[0] + b"\r\n\r\n"
+        if route is None:
+            return error_response(405, f"{method} is not mocked for {target}")
+        return route.response
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                lines = head.decode('latin-1').split("\r\n")
+                parts = lines[0].split(" ")
+                if len(parts) != 3:
+                    writer.write(error_response(400, "Malformed request line"))
+                    break
+                method, target, version = parts
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0) or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                self.requests += 1
+                writer.write(self.respond(method, target))
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close' or version == 'HTTP/1.0':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+def sample_paths(routes: RouteTrie) -> List[str]:
+    """A concrete GET path for every mocked GET route"""
+    paths = []
+    # Literal segments, with None for the parameters the GET route names
+    stack: List[Tuple[TrieNode, List[Optional[str]]]] = [(routes.root, [])]
+    while stack:
+        node, segments = stack.pop()
+        route = node.routes.get('GET')
+        if route is not None:
+            names = iter(route.params)
+            paths.append("/" + "/".join(segment if segment is not None else f"example-{next(names)}"
+                                        for segment in segments))
+        for segment, child in node.children.items():
+            stack.append((child, segments + [segment]))
+        if node.param is not None:
+            stack.append((node.param, segments + [None]))
+    return sorted(paths)
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+async def _client(host: str, port: int, paths: List[str], count: int, offset: int,
+                  latencies: List[float], statuses: Dict[int, int]):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for index in range(count):
+            path = paths[(offset + index) % len(paths)]
+            request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n".encode('ascii')
+            start = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n")[1:]:
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            if length:
+                await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            status = int(head.split(b" ", 2)[1])
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+async def run_load(host: str, port: int, paths: List[str], total: int, concurrency: int) -> Dict[str, Any]:
+    """Send ``total`` GET requests over ``concurrency`` keep-alive connections"""
+    if not paths:
+        raise ValueError("No paths to request")
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    per_client = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, paths, count, i, latencies, statuses)
+                           for i, count in enumerate(per_client) if count))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": (latencies[-1] * 1000) if latencies else 0.0,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())}
+    }
+
+def print_load_report(report: Dict[str, Any]):
+    print(f"📊 {report['requests']} requests over {report['concurrency']} connections "
+          f"in {report['seconds']:.2f}s")
+    print(f"  Throughput: {report['requests_per_second']:.0f} req/s")
+    print(f"  Latency: p50 {report['p50_ms']:.2f} ms, p99 {report['p99_ms']:.2f} ms, max {report['max_ms']:.2f} ms")
+    print(f"  Statuses: {', '.join(f'{status} x{count}' for status, count in report['statuses'].items())}")
+
+def default_specs(docs_root: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(docs_root, API_SPECS_DIR, "*.yaml")))
+
+async def serve(args, routes: RouteTrie):
+    server = MockServer(routes, args.host, args.port)
+    await server.start()
+    print(f"🚀 Mock server listening on http://{server.host}:{server.port} ({routes.count} routes)")
+    async with server.server:
+        await server.server.serve_forever()
+
+async def bench(args, routes: RouteTrie) -> Dict[str, Any]:
+    server = MockServer(routes, args.host, 0)
+    await server.start()
+    try:
+        paths = args.path
+        if not args.json:
+            print(f"🏋️  Load testing {len(paths)} paths against an in-process mock server...")
+        return await run_load(server.host, server.port, paths, args.requests, args.concurrency)
+    finally:
+        await server.close()
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Mock the OpenAPI specifications and load-test against them")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_spec_options(sub):
+        sub.add_argument("specs", nargs="*", help=f"Spec files (default: {API_SPECS_DIR}/*.yaml)")
+        sub.add_argument("--docs-root", default=".", help="Documentation root directory")
+        sub.add_argument("--host", default=DEFAULT_HOST, help=f"Interface to bind (default: {DEFAULT_HOST})")
+
+    def add_load_options(sub):
+        sub.add_argument("--path", action="append", help="Path to request (repeatable; default: every GET route)")
+        sub.add_argument("--requests", "-n", type=int, default=10000, help="Total requests (default: 10000)")
+        sub.add_argument("--concurrency", "-c", type=int, default=32, help="Concurrent connections (default: 32)")
+        sub.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    serve_parser = subparsers.add_parser("serve", help="Run the mock server")
+    add_spec_options(serve_parser)
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+
+    bench_parser = subparsers.add_parser("bench", help="Load-test an in-process mock server")
+    add_spec_options(bench_parser)
+    add_load_options(bench_parser)
+
+    load_parser = subparsers.add_parser("load", help="Load-test a running server")
+    load_parser.add_argument("--host", default=DEFAULT_HOST, help=f"Server host (default: {DEFAULT_HOST})")
+    load_parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Server port (default: {DEFAULT_PORT})")
+    add_load_options(load_parser)
+
+    args = parser.parse_args()
+
+    if args.command == "load":
+        if not args.path:
+            parser.error("load needs at least one --path")
+        report = asyncio.run(run_load(args.host, args.port, args.path, args.requests, args.concurrency))
+    else:
+        specs = args.specs or default_specs(args.docs_root)
+        if not specs:
+            print(f"❌ No API specifications found in {os.path.join(args.docs_root, API_SPECS_DIR)}")
+            sys.exit(1)
+        routes = build_routes(specs)
+        if args.command == "serve":
+            try:
+                asyncio.run(serve(args, routes))
+            except KeyboardInterrupt:
+                pass
+            return
+        args.path = args.path or sample_paths(routes)
+        if not args.path:
+            parser.error("the specs have no GET routes to load-test; pass --path")
+        report = asyncio.run(bench(args, routes))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_load_report(report)
+
+if __name__ == "__main__":
+    main()
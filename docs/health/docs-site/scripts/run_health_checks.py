@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Documentation Maintenance Agent - Health Check Runner
+Runs every maintenance check as a plugin of a single corpus scan
+"""
+
+import sys
+
+from corpus_scanner import CorpusScanner
+from api_standards_validator import UrlCollector
+from check_api_examples import ApiExamplesChecker
+from enforce_markdown_linting import MarkdownStyleChecker
+from markdown_lint import load_config
+from validate_api_docs import ApiDocsChecker
+from validate_form_metadata import FormMetadataValidator
+from validate_internal_links import LinkChecker
+from verify_directory_structure import FileLocationChecker, check_directory_structure, report_issues
+
+API_SPECS_DIR = "04-api-specifications"
+
+CHECK_TITLES = {
+    "internal-links": "🔍 Checking internal links...",
+    "markdown-style": "📝 Checking markdown style...",
+    "file-locations": "📁 Verifying file locations...",
+    "api-docs": "🔍 Validating API documentation structure...",
+    "api-examples": "📋 Checking API examples and documentation...",
+    "api-standards-urls": "🔄 Checking API URL consistency..."
+}
+
+def build_scanner(root_dir):
+    """Create a scanner with every maintenance check registered"""
+    scanner = CorpusScanner(root_dir)
+    scanner.register(LinkChecker())
+    scanner.register(MarkdownStyleChecker(config=load_config(root_dir)))
+    scanner.register(FileLocationChecker())
+    scanner.register(ApiDocsChecker(subdir=API_SPECS_DIR))
+    scanner.register(ApiExamplesChecker(subdir=API_SPECS_DIR))
+    scanner.register(UrlCollector(docs_root=root_dir))
+    return scanner
+
+def run_health_checks(root_dir):
+    """Scan the corpus once and report every check"""
+    print(f"🏥 Running documentation health checks in: {root_dir}")
+
+    scanner = build_scanner(root_dir)
+    scanner.scan()
+
+    stats = scanner.stats
+    print(f"📚 Scanned {stats['files']} files ({stats['files_read']} read, {stats['bytes_read']} bytes)")
+
+    results = {}
+
+    print("")
+    structure_issues = check_directory_structure(root_dir)
+    results["directory-structure"] = report_issues(structure_issues, "✅ Directory structure is correct!")
+
+    print("\n🧾 Cross-validating form metadata...")
+    metadata_issues = FormMetadataValidator(root_dir).validate()
+    results["form-metadata"] = report_issues(metadata_issues, "✅ Form metadata is in sync with the forms registry!")
+
+    for checker in scanner.checkers:
+        print(f"\n{CHECK_TITLES.get(checker.name, checker.name)}")
+        results[checker.name] = checker.report()
+
+    failed = [name for name, passed in results.items() if not passed]
+    print("")
+    if failed:
+        print(f"❌ {len(failed)} of {len(results)} checks failed: {', '.join(failed)}")
+        return False
+
+    print(f"✅ All {len(results)} checks passed!")
+    return True
+
+if __name__ == "__main__":
+    root_dir = sys.argv[1] if len(sys.argv) > 1 else "."
+    success = run_health_checks(root_dir)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Documentation Maintenance Agent - Example Schema Validator
+Compiles OpenAPI schema objects once and validates API examples against them
+"""
+
+import datetime
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from spec_resolver import SpecResolver
+
+# Request examples may omit readOnly properties, response examples writeOnly ones
+REQUEST = "request"
+RESPONSE = "response"
+
+FORMATS = {
+    "date": re.compile(r'^\d{4}-\d{2}-\d{2}$'),
+    "date-time": re.compile(r'^\d{4}-\d{2}-\d{2}[Tt ]\d{2}:\d{2}:\d{2}(\.\d+)?([Zz]|[+-]\d{2}:?\d{2})?$'),
+    "email": re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$'),
+    "uuid": re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+}
+
+# YAML turns unquoted dates into date objects; examples mean them as strings
+DATE_TYPES = (datetime.date, datetime.datetime)
+
+def json_type(value: Any) -> str:
+    """The JSON Schema type name of a parsed YAML value"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "number"
+    if isinstance(value, (str,) + DATE_TYPES):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, dict):
+        return "object"
+    return type(value).__name__
+
+def as_text(value: Any) -> str:
+    return value.isoformat() if isinstance(value, DATE_TYPES) else value
+
+def matches_type(value: Any, expected: str) -> bool:
+    actual = json_type(value)
+    return actual == expected or (expected == "number" and actual == "integer")
+
+def child_path(path: str, key: Any) -> str:
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', str(key)) else f"{path}[{key!r}]"
+
+# A compiled check: (instance, path, direction, errors) -> None
+Check = Callable[[Any, str, str, List[str]], None]
+
+class CompiledSchema:
+    """A schema compiled into a flat list of checks
+
+    The object is registered in the compiler's cache before its subschemas
+    are compiled, so recursive schemas refer back to it instead of
+    compiling forever.
+    """
+
+    __slots__ = ("checks",)
+
+    def __init__(self):
+        self.checks: List[Check] = []
+
+    def validate(self, instance: Any, path: str = "$", direction: str = RESPONSE) -> List[str]:
+        errors: List[str] = []
+        self.run(instance, path, direction, errors)
+        return errors
+
+    def run(self, instance: Any, path: str, direction: str, errors: List[str]):
+        for check in self.checks:
+            check(instance, path, direction, errors)
+
+class SchemaCompiler:
+    """Compiles schema objects, cached by the identity of the schema node
+
+    Schemas are resolved through a SpecResolver, so every operation that
+    references a shared component gets the same compiled validator.
+    """
+
+    def __init__(self, resolver: SpecResolver):
+        self.resolver = resolver
+        # id(node) -> (node, compiled); the node is kept so its id can't be reused
+        self._compiled: Dict[int, Tuple[Any, CompiledSchema]] = {}
+
+    def compile(self, file_path: str, schema: Any) -> CompiledSchema:
+        file_path, schema = self.resolver.deref(file_path, schema)
+        cached = self._compiled.get(id(schema))
+        if cached is not None:
+            return cached[1]
+
+        compiled = CompiledSchema()
+        self._compiled[id(schema)] = (schema, compiled)
+        if isinstance(schema, dict) and not isinstance(schema.get('$ref'), str):
+            compiled.checks = self._checks(file_path, schema)
+        return compiled
+
+    def __len__(self):
+        return len(self._compiled)
+
+    def _checks(self, file_path: str, schema: Dict[str, Any]) -> List[Check]:
+        checks: List[Check] = []
+        nullable = schema.get('nullable') is True
+
+        types = schema.get('type')
+        if types is not None:
+            types = [types] if isinstance(types, str) else list(types)
+            if nullable:
+                types.append("null")
+            def check_type(value, path, direction, errors, types=types):
+                if not any(matches_type(value, expected) for expected in types):
+                    errors.append(f"{path}: expected {' or '.join(types)}, got {json_type(value)}")
+            checks.append(check_type)
+
+        if 'enum' in schema:
+            allowed = list(schema['enum'])
+            def check_enum(value, path, direction, errors):
+                if as_text(value) not in allowed and not (value is None and nullable):
+                    errors.append(f"{path}: {as_text(value)!r} is not one of {allowed}")
+            checks.append(check_enum)
+
+        checks.extend(self._string_checks(schema))
+        checks.extend(self._number_checks(schema))
+        checks.extend(self._object_checks(file_path, schema))
+        checks.extend(self._array_checks(file_path, schema))
+        checks.extend(self._combinator_checks(file_path, schema))
+        return checks
+
+    def _string_checks(self, schema: Dict[str, Any]) -> List[Check]:
+        checks: List[Check] = []
+        fmt = FORMATS.get(schema.get('format'))
+        pattern = re.compile(schema['pattern']) if isinstance(schema.get('pattern'), str) else None
+        low, high = schema.get('minLength'), schema.get('maxLength')
+        if fmt is None and pattern is None and low is None and high is None:
+            return checks
+
+        def check_string(value, path, direction, errors):
+            if json_type(value) != "string":
+                return
+            text = as_text(value)
+            if fmt is not None and not fmt.match(text):
+                errors.append(f"{path}: {text!r} is not a valid {schema['format']}")
+            if pattern is not None and not pattern.search(text):
+                errors.append(f"{path}: {text!r} does not match pattern {schema['pattern']!r}")
+            if low is not None and len(text) < low:
+                errors.append(f"{path}: shorter than {low} characters")
+            if high is not None and len(text) > high:
+                errors.append(f"{path}: longer than {high} characters")
+        checks.append(check_string)
+        return checks
+
+    def _number_checks(self, schema: Dict[str, Any]) -> List[Check]:
+        bounds = [(key, schema[key]) for key in ('minimum', 'maximum', 'exclusiveMinimum', 'exclusiveMaximum')
+                  if isinstance(schema.get(key), (int, float)) and not isinstance(schema.get(key), bool)]
+        # OpenAPI 3.0 spells exclusive bounds as booleans next to minimum/maximum
+        exclusive_min = schema.get('exclusiveMinimum') is True
+        exclusive_max = schema.get('exclusiveMaximum') is True
+        if not bounds:
+            return []
+
+        def check_number(value, path, direction, errors):
+            if json_type(value) not in ("integer", "number"):
+                return
+            for key, bound in bounds:
+                if key == 'minimum' and (value < bound or (exclusive_min and value == bound)):
+                    errors.append(f"{path}: {value} is below the minimum {bound}")
+                elif key == 'maximum' and (value > bound or (exclusive_max and value == bound)):
+                    errors.append(f"{path}: {value} is above the maximum {bound}")
+                elif key == 'exclusiveMinimum' and value <= bound:
+                    errors.append(f"{path}: {value} must be greater than {bound}")
+                elif key == 'exclusiveMaximum' and value >= bound:
+                    errors.append(f"{path}: {value} must be less than {bound}")
+        return [check_number]
+
+    def _object_checks(self, file_path: str, schema: Dict[str, Any]) -> List[Check]:
+        properties = schema.get('properties') or {}
+        required = schema.get('required') or []
+        additional = schema.get('additionalProperties', True)
+        if not properties and not required and additional is True:
+            return []
+
+        compiled = {name: self.compile(file_path, subschema) for name, subschema in properties.items()}
+        # Properties a direction doesn't have to include
+        skipped = {REQUEST: set(), RESPONSE: set()}
+        for name, subschema in properties.items():
+            _, resolved = self.resolver.deref(file_path, subschema)
+            if isinstance(resolved, dict):
+                if resolved.get('readOnly') is True:
+                    skipped[REQUEST].add(name)
+                if resolved.get('writeOnly') is True:
+                    skipped[RESPONSE].add(name)
+        extra = self.compile(file_path, additional) if isinstance(additional, dict) else None
+
+        def check_object(value, path, direction, errors):
+            if not isinstance(value, dict):
+                return
+            for name in required:
+                if name not in value and name not in skipped[direction]:
+                    errors.append(f"{path}: missing required property '{name}'")
+            for name, item in value.items():
+                validator = compiled.get(name)
+                if validator is not None:
+                    validator.run(item, child_path(path, name), direction, errors)
+                elif additional is False:
+                    errors.append(f"{path}: unexpected property '{name}'")
+                elif extra is not None:
+                    extra.run(item, child_path(path, name), direction, errors)
+        return [check_object]
+
+    def _array_checks(self, file_path: str, schema: Dict[str, Any]) -> List[Check]:
+        items = self.compile(file_path, schema['items']) if isinstance(schema.get('items'), dict) else None
+        low, high = schema.get('minItems'), schema.get('maxItems')
+        unique = schema.get('uniqueItems') is True
+        if items is None and low is None and high is None and not unique:
+            return []
+
+        def check_array(value, path, direction, errors):
+            if not isinstance(value, list):
+                return
+            if low is not None and len(value) < low:
+                errors.append(f"{path}: fewer than {low} items")
+            if high is not None and len(value) > high:
+                errors.append(f"{path}: more than {high} items")
+            if unique and len({repr(item) for item in value}) != len(value):
+                errors.append(f"{path}: items are not unique")
+            if items is not None:
+                for index, item in enumerate(value):
+                    items.run(item, child_path(path, index), direction, errors)
+        return [check_array]
+
+    def _combinator_checks(self, file_path: str, schema: Dict[str, Any]) -> List[Check]:
+        checks: List[Check] = []
+        for subschema in schema.get('allOf') or []:
+            checks.append(self.compile(file_path, subschema).run)
+
+        for keyword in ('anyOf', 'oneOf'):
+            options = [self.compile(file_path, subschema) for subschema in schema.get(keyword) or []]
+            if not options:
+                continue
+            def check_options(value, path, direction, errors, keyword=keyword, options=options):
+                matching = sum(1 for option in options if not option.validate(value, path, direction))
+                if matching == 0:
+                    errors.append(f"{path}: matches none of the {keyword} schemas")
+                elif keyword == 'oneOf' and matching > 1:
+                    errors.append(f"{path}: matches {matching} of the oneOf schemas, expected exactly one")
+            checks.append(check_options)
+
+        if isinstance(schema.get('not'), dict):
+            negated = self.compile(file_path, schema['not'])
+            def check_not(value, path, direction, errors):
+                if not negated.validate(value, path, direction):
+                    errors.append(f"{path}: must not match the 'not' schema")
+            checks.append(check_not)
+        return checks
+
+def media_examples(resolver: SpecResolver, file_path: str, media: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    """(label, value) of every example of a raw media type object"""
+    found = []
+    if 'example' in media:
+        found.append(("example", media['example']))
+    examples = media.get('examples')
+    if isinstance(examples, dict):
+        for name, example in examples.items():
+            _, example = resolver.deref(file_path, example)
+            if isinstance(example, dict) and 'value' in example:
+                found.append((f"examples.{name}", example['value']))
+    return found
+
+def check_media_examples(compiler: SchemaCompiler, file_path: str, media: Dict[str, Any],
+                         direction: str) -> List[Tuple[str, List[str]]]:
+    """Validate every example of a raw media type object against its schema"""
+    if not isinstance(media, dict) or 'schema' not in media:
+        return []
+    schema = compiler.compile(file_path, media['schema'])
+    results = []
+    for label, value in media_examples(compiler.resolver, file_path, media):
+        errors = schema.validate(value, "$", direction)
+        if errors:
+            results.append((label, errors))
+    return results
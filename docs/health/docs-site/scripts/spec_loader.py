@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Documentation Maintenance Agent - OpenAPI Spec Loader
+Parses each API specification once and shares the document across every API check
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, List, TypeVar, Union
+
+import yaml
+
+# libyaml's loader is several times faster; fall back to the pure Python one
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+T = TypeVar("T")
+
+class SpecLoader:
+    """LRU cache of parsed YAML documents, keyed by the SHA-256 of their content
+
+    Any path to the same bytes - a file read here, or text already read by
+    the corpus scanner - resolves to one parse. A parse error is cached and
+    raised again on every lookup. Cached documents are shared between
+    callers, so checks must treat them as read-only.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._documents: "OrderedDict[bytes, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, content: Union[str, bytes]) -> Any:
+        """Parse YAML text or bytes, reusing an earlier parse of identical content"""
+        data = content.encode('utf-8', 'surrogatepass') if isinstance(content, str) else content
+        key = hashlib.sha256(data).digest()
+        if key in self._documents:
+            self.hits += 1
+            self._documents.move_to_end(key)
+            document = self._documents[key]
+        else:
+            self.misses += 1
+            try:
+                document = yaml.load(content, Loader=SafeLoader)
+            except yaml.YAMLError as e:
+                document = e
+            self._documents[key] = document
+            if len(self._documents) > self.max_entries:
+                self._documents.popitem(last=False)
+
+        if isinstance(document, yaml.YAMLError):
+            raise document
+        return document
+
+    def load(self, file_path: Union[str, os.PathLike]) -> Any:
+        """Read and parse a specification file"""
+        with open(file_path, 'rb') as f:
+            return self.parse(f.read())
+
+    def clear(self):
+        self._documents.clear()
+
+# Shared by every API check in the process
+default_loader = SpecLoader()
+
+def parse_spec(content: Union[str, bytes]) -> Any:
+    return default_loader.parse(content)
+
+def load_spec(file_path: Union[str, os.PathLike]) -> Any:
+    return default_loader.load(file_path)
+
+def find_spec_files(api_dir: str) -> List[str]:
+    """Every YAML specification under a directory, in the corpus scanner's walk order"""
+    found = []
+    for root, dirs, files in os.walk(api_dir):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        found.extend(os.path.join(root, name) for name in files if name.endswith(('.yaml', '.yml')))
+    return found
+
+def map_specs(check: Callable[[str], T], paths: Iterable[str], jobs: int = 1) -> List[T]:
+    """Run ``check`` on every spec file, in worker processes when ``jobs`` > 1
+
+    ``check`` must be a module-level function so it can be sent to the
+    workers. Each worker keeps its own loader cache, so a spec is parsed
+    once per process however many checks ``check`` runs on it. Results come
+    back in the order of ``paths``.
+    """
+    paths = list(paths)
+    if jobs <= 1 or len(paths) <= 1:
+        return [check(path) for path in paths]
+
+    jobs = min(jobs, len(paths))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(check, paths, chunksize=max(1, len(paths) // (jobs * 4))))
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Documentation Maintenance Agent - OpenAPI $ref Resolver
+Gives the API checks a resolved view of a spec, following local and cross-file references
+"""
+
+import os
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+from spec_loader import load_spec
+
+# (absolute file path, node)
+Located = Tuple[str, Any]
+
+def split_ref(ref: str) -> Tuple[str, str]:
+    """Split a $ref into its file part and JSON pointer"""
+    file_part, _, pointer = ref.partition('#')
+    return file_part, unquote(pointer)
+
+def pointer_tokens(pointer: str) -> List[str]:
+    """RFC 6901 reference tokens of a JSON pointer"""
+    if not pointer or pointer == '/':
+        return [] if not pointer else ['']
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer.lstrip('/').split('/')]
+
+class ResolvedMapping(Mapping):
+    """Read-only view of a spec object whose children are resolved on access
+
+    Nothing is copied: a view is a (resolver, file, node) triple and child
+    views are created only when a check reaches them, so recursive schemas
+    and shared components cost nothing until they are actually visited.
+    """
+
+    __slots__ = ("_resolver", "_file", "_node")
+
+    def __init__(self, resolver: "SpecResolver", file_path: str, node: Dict[str, Any]):
+        self._resolver = resolver
+        self._file = file_path
+        self._node = node
+
+    def __getitem__(self, key):
+        return self._resolver.view(self._file, self._node[key])
+
+    def __iter__(self):
+        return iter(self._node)
+
+    def __len__(self):
+        return len(self._node)
+
+    def __repr__(self):
+        return f"ResolvedMapping({self._file!r}, {list(self._node)!r})"
+
+class ResolvedList(Sequence):
+    """Read-only view of a spec array whose items are resolved on access"""
+
+    __slots__ = ("_resolver", "_file", "_node")
+
+    def __init__(self, resolver: "SpecResolver", file_path: str, node: List[Any]):
+        self._resolver = resolver
+        self._file = file_path
+        self._node = node
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._resolver.view(self._file, item) for item in self._node[index]]
+        return self._resolver.view(self._file, self._node[index])
+
+    def __len__(self):
+        return len(self._node)
+
+class SpecResolver:
+    """Resolves ``$ref`` pointers within and across spec files
+
+    Documents are loaded through the shared spec loader, and every
+    (file, pointer) target is looked up once and memoized, so a component
+    referenced from a thousand operations is found once. Chains of
+    references that lead back to themselves are reported as cycles instead
+    of being followed forever. Unresolvable references are recorded in
+    ``issues`` and left in place.
+    """
+
+    def __init__(self):
+        self.documents: Dict[str, Any] = {}
+        self.names: Dict[str, str] = {}
+        self._targets: Dict[Tuple[str, str], Optional[Located]] = {}
+        self.issues: List[str] = []
+        self._reported = set()
+
+    def add_document(self, file_path: str, document: Any) -> str:
+        """Register an already parsed document, e.g. the spec being checked"""
+        absolute = os.path.abspath(file_path)
+        if self.documents.get(absolute) is not document:
+            # New content invalidates what was resolved against the old one
+            self._targets = {key: located for key, located in self._targets.items()
+                             if key[0] != absolute and (located is None or located[0] != absolute)}
+        self.documents[absolute] = document
+        self.names[absolute] = str(file_path)
+        return absolute
+
+    def name(self, file_path: str) -> str:
+        """The path a file is reported under"""
+        return self.names.get(file_path) or os.path.relpath(file_path)
+
+    def document(self, file_path: str) -> Any:
+        file_path = os.path.abspath(file_path)
+        if file_path not in self.documents:
+            self.documents[file_path] = load_spec(file_path)
+        return self.documents[file_path]
+
+    def _report(self, key: Any, message: str):
+        if key not in self._reported:
+            self._reported.add(key)
+            self.issues.append(message)
+
+    def target(self, base_file: str, ref: str) -> Optional[Located]:
+        """The node a single $ref points at (without following further refs)"""
+        key = (base_file, ref)
+        if key in self._targets:
+            return self._targets[key]
+
+        file_part, pointer = split_ref(ref)
+        located = None
+        if '://' in file_part:
+            self._report(key, f"Remote $ref '{ref}' can't be resolved locally in {self.name(base_file)}")
+        else:
+            file_path = os.path.normpath(os.path.join(os.path.dirname(base_file), file_part)) if file_part else base_file
+            try:
+                node = self.document(file_path)
+                for token in pointer_tokens(pointer):
+                    if isinstance(node, list):
+                        node = node[int(token)]
+                    else:
+                        node = node[token]
+                located = (file_path, node)
+            except (OSError, ValueError) as e:
+                self._report(key, f"Unresolved $ref '{ref}' in {self.name(base_file)}: {e}")
+            except (KeyError, IndexError, TypeError):
+                self._report(key, f"Unresolved $ref '{ref}' in {self.name(base_file)}")
+        self._targets[key] = located
+        return located
+
+    def deref(self, file_path: str, node: Any) -> Located:
+        """Follow a chain of $ref objects to the node it ends at"""
+        chain: List[Tuple[str, str]] = []
+        while isinstance(node, dict) and isinstance(node.get('$ref'), str):
+            key = (file_path, node['$ref'])
+            if key in chain:
+                # Report each cycle once, whichever of its references it was entered from
+                cycle = chain[chain.index(key):]
+                refs = " -> ".join(ref for _, ref in cycle + [key])
+                self._report(frozenset(cycle), f"Circular $ref {refs} in {self.name(file_path)}")
+                break
+            chain.append(key)
+            located = self.target(file_path, node['$ref'])
+            if located is None:
+                break
+            file_path, node = located
+        return file_path, node
+
+    def check_refs(self, file_path: str) -> int:
+        """Resolve every $ref reachable from a document once, recording the broken ones
+
+        Each node is walked at most once, including fragments of other files
+        that the document references, so the cost is linear in the size of
+        the specs however often their components are reused.
+        """
+        absolute = os.path.abspath(file_path)
+        stack: List[Located] = [(absolute, self.document(absolute))]
+        visited = set()
+        count = 0
+        while stack:
+            current_file, node = stack.pop()
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+            if isinstance(node, dict):
+                if isinstance(node.get('$ref'), str):
+                    count += 1
+                    target_file, target = self.deref(current_file, node)
+                    if target is not node:
+                        stack.append((target_file, target))
+                stack.extend((current_file, child) for child in node.values() if isinstance(child, (dict, list)))
+            elif isinstance(node, list):
+                stack.extend((current_file, child) for child in node if isinstance(child, (dict, list)))
+        return count
+
+    def view(self, file_path: str, node: Any) -> Any:
+        """The resolved, read-only view of a node"""
+        file_path, node = self.deref(file_path, node)
+        if isinstance(node, dict):
+            return ResolvedMapping(self, file_path, node)
+        if isinstance(node, list):
+            return ResolvedList(self, file_path, node)
+        return node
+
+def unwrap(value: Any) -> Located:
+    """The (file, raw node) behind a resolved view; file is None for plain values"""
+    if isinstance(value, (ResolvedMapping, ResolvedList)):
+        return value._file, value._node
+    return None, value
+
+def resolve_spec(file_path: str, document: Any, resolver: Optional[SpecResolver] = None) -> Tuple[Any, SpecResolver]:
+    """A resolved view of a parsed spec, and the resolver collecting its $ref issues
+
+    Pass one ``resolver`` for every spec of a run to share its index of
+    resolved pointers across them.
+    """
+    resolver = resolver if resolver is not None else SpecResolver()
+    absolute = resolver.add_document(file_path, document)
+    return resolver.view(absolute, document), resolver
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Documentation Maintenance Agent - URL Inventory
+Indexes every URL in the documentation once, with the file, line and column of each occurrence
+"""
+
+import re
+import sys
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+URL_PATTERN = re.compile(r'https?://[^\s\'"<>]+')
+
+# (file, line, column), both 1-based
+Occurrence = Tuple[str, int, int]
+
+def url_host(url: str) -> str:
+    try:
+        return (urlsplit(url).hostname or "").lower()
+    except ValueError:
+        return ""
+
+class UrlInventory:
+    """Deduplicated URLs mapped to where they occur
+
+    URLs and file paths are interned, so a URL repeated across hundreds of
+    pages is stored once and its occurrences share the file strings. Checks
+    iterate ``urls`` and look at each distinct URL once, whatever its
+    number of occurrences.
+    """
+
+    def __init__(self):
+        self._occurrences: Dict[str, List[Occurrence]] = {}
+
+    def add(self, file_path: str, text: str):
+        """Index the URLs of one file in a single pass over its text"""
+        file_path = sys.intern(file_path)
+        line = 1
+        line_start = 0
+        position = 0
+        for match in URL_PATTERN.finditer(text):
+            start = match.start()
+            newlines = text.count('\n', position, start)
+            if newlines:
+                line += newlines
+                line_start = text.rfind('\n', position, start) + 1
+            position = start
+
+            url = sys.intern(match.group())
+            occurrences = self._occurrences.get(url)
+            if occurrences is None:
+                occurrences = self._occurrences[url] = []
+            occurrences.append((file_path, line, start - line_start + 1))
+
+    @property
+    def urls(self) -> List[str]:
+        """Distinct URLs, in the order they were first seen"""
+        return list(self._occurrences)
+
+    def occurrences(self, url: str) -> List[Occurrence]:
+        return self._occurrences.get(url, [])
+
+    def first(self, url: str) -> Optional[Occurrence]:
+        occurrences = self._occurrences.get(url)
+        return occurrences[0] if occurrences else None
+
+    @property
+    def total(self) -> int:
+        """Number of occurrences, counting repeats"""
+        return sum(len(occurrences) for occurrences in self._occurrences.values())
+
+    def __len__(self):
+        return len(self._occurrences)
+
+    def __contains__(self, url):
+        return url in self._occurrences
+
+    def __iter__(self):
+        return iter(self._occurrences)
@@ -3,16 +3,17 @@
 API Specification Validator Script
 """
 
+import argparse
 import sys
 import json
-import yaml
 from pathlib import Path
 
+from spec_loader import find_spec_files, load_spec, map_specs
+
 def validate_yaml_syntax(spec_file):
     """Validate YAML syntax"""
     try:
-        with open(spec_file, 'r') as f:
-            yaml.safe_load(f)
+        load_spec(spec_file)
         return True, "YAML syntax valid"
     except Exception as e:
         return False, f"YAML syntax error: {e}"
@@ -20,8 +21,7 @@ def validate_yaml_syntax(spec_file):
 def validate_openapi_structure(spec_file):
     """Validate OpenAPI structure"""
     try:
-        with open(spec_file, 'r') as f:
-            doc = yaml.safe_load(f)
+        doc = load_spec(spec_file)
         
         errors = []
         if 'openapi' not in doc:
@@ -42,8 +42,7 @@ def validate_openapi_spec(spec_file):
     """Validate with openapi-spec-validator"""
     try:
         from openapi_spec_validator import validate_spec
-        with open(spec_file, 'r') as f:
-            spec = yaml.safe_load(f)
+        spec = load_spec(spec_file)
         validate_spec(spec)
         return True, "✅ OpenAPI specification valid"
     except Exception as e:
@@ -70,43 +69,73 @@ def validate_fhir_profile(profile_file):
     except Exception as e:
         return False, f"❌ FHIR validation error: {e}"
 
-def main():
-    """Main validation function"""
-    if len(sys.argv) < 2:
-        print("Usage: python validate-api.py <file>")
-        sys.exit(1)
-    
-    file_path = sys.argv[1]
-    file_path = Path(file_path)
-    
-    if not file_path.exists():
-        print(f"❌ File not found: {file_path}")
-        sys.exit(1)
-    
-    print(f"Validating: {file_path}")
+def validate_file(file_path):
+    """Run every check that applies to one file; returns (valid, messages)
+
+    The YAML checks share one parse of the spec through the spec loader.
+    """
+    messages = []
     
-    # Determine file type and validate accordingly
     if file_path.suffix == '.yaml' or file_path.suffix == '.yml':
         # YAML API specification
         valid, message = validate_yaml_syntax(file_path)
-        print(message)
+        messages.append(message)
         
         if valid:
             valid, message = validate_openapi_structure(file_path)
-            print(message)
+            messages.append(message)
             
             if valid:
                 valid, message = validate_openapi_spec(file_path)
-                print(message)
+                messages.append(message)
     
     elif file_path.suffix == '.json':
         # JSON FHIR profile
         valid, message = validate_fhir_profile(file_path)
-        print(message)
+        messages.append(message)
     
     else:
-        print(f"❌ Unsupported file type: {file_path.suffix}")
+        valid = False
+        messages.append(f"❌ Unsupported file type: {file_path.suffix}")
+    
+    return valid, messages
+
+def main():
+    """Main validation function"""
+    parser = argparse.ArgumentParser(description="Validate API specifications and FHIR profiles")
+    parser.add_argument("paths", nargs="+", help="Files to validate; directories are searched for YAML specs")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Number of worker processes for multiple files (default: 1)")
+    args = parser.parse_args()
+    
+    files = []
+    for path in map(Path, args.paths):
+        if path.is_dir():
+            files.extend(map(Path, find_spec_files(str(path))))
+        elif path.exists():
+            files.append(path)
+        else:
+            print(f"❌ File not found: {path}")
+            sys.exit(1)
+    
+    results = map_specs(validate_file, files, args.jobs)
+    for file_path, (valid, messages) in zip(files, results):
+        print(f"Validating: {file_path}")
+        for message in messages:
+            print(message)
+    
+    if len(files) == 1:
+        # A single unsupported file is a usage error, as before
+        if files[0].suffix not in ('.yaml', '.yml', '.json'):
+            sys.exit(1)
+        return
+    
+    failed = [file_path for file_path, (valid, _) in zip(files, results) if not valid]
+    print("")
+    if failed:
+        print(f"❌ {len(failed)} of {len(files)} files failed validation")
         sys.exit(1)
+    print(f"✅ All {len(files)} files passed validation")
 
 if __name__ == "__main__":
     main()
@@ -4,13 +4,18 @@ API Documentation Validator
 Validates API documentation structure and completeness
 """
 
+import argparse
 import os
 import sys
 import yaml
 import json
 from pathlib import Path
 
-def validate_api_docs(api_dir):
+from corpus_scanner import Checker, scan
+from spec_loader import find_spec_files, map_specs, parse_spec
+from spec_resolver import SpecResolver, resolve_spec
+
+def validate_api_docs(api_dir, jobs=1):
     """Validate API documentation structure"""
     print("🔍 Validating API documentation structure...")
     
@@ -21,40 +26,77 @@ def validate_api_docs(api_dir):
         issues.append(f"API directory not found: {api_dir}")
         return issues
     
-    # Find all YAML files
-    yaml_files = []
-    for root, dirs, files in os.walk(api_dir):
-        for file in files:
-            if file.endswith(('.yaml', '.yml')):
-                yaml_files.append(os.path.join(root, file))
+    if jobs > 1:
+        files = find_spec_files(api_dir)
+        file_issues = [issue for found in map_specs(validate_api_file, files, jobs) for issue in found]
+    else:
+        checker = ApiDocsChecker()
+        scan(api_dir, checker)
+        files, file_issues = checker.files, checker.issues
     
-    if not yaml_files:
+    if not files:
         issues.append("No API specification files found")
         return issues
     
-    print(f"📁 Found {len(yaml_files)} API specification files")
+    print(f"📁 Found {len(files)} API specification files")
+    
+    return file_issues
+
+class ApiDocsChecker(Checker):
+    """Corpus scanner plugin validating API specification structure"""
     
-    for yaml_file in yaml_files:
-        file_issues = validate_api_file(yaml_file)
-        issues.extend(file_issues)
+    name = "api-docs"
+    extensions = ('.yaml', '.yml')
     
-    return issues
+    def __init__(self, subdir=None):
+        super().__init__(subdir)
+        self.files = []
+        self.issues = []
+        # One resolver for the whole run shares resolved $ref targets across specs
+        self.resolver = SpecResolver()
+    
+    def visit(self, file):
+        self.files.append(file.path)
+        try:
+            content = file.text
+        except Exception as e:
+            self.issues.append(f"Error reading {file.path}: {e}")
+            return
+        self.issues.extend(validate_api_content(file.path, content, self.resolver))
+    
+    def report(self):
+        return report_issues(self.issues, "✅ API documentation validation passed!")
 
 def validate_api_file(file_path):
     """Validate a single API specification file"""
-    issues = []
-    
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
-        
+    except Exception as e:
+        return [f"Error reading {file_path}: {e}"]
+    
+    return validate_api_content(file_path, content)
+
+def validate_api_content(file_path, content, resolver=None):
+    """Validate the contents of a single API specification file
+    
+    Operations, path items and responses are checked through their $refs,
+    whether they point into ``components`` or into another file.
+    """
+    issues = []
+    
+    try:
         # Try to parse as YAML
         try:
-            data = yaml.safe_load(content)
+            data = parse_spec(content)
         except yaml.YAMLError as e:
             issues.append(f"Invalid YAML in {file_path}: {e}")
             return issues
         
+        data, resolver = resolve_spec(file_path, data, resolver)
+        ref_issues_before = len(resolver.issues)
+        resolver.check_refs(file_path)
+        
         # Validate OpenAPI structure
         if 'openapi' not in data:
             issues.append(f"Missing 'openapi' version in {file_path}")
@@ -104,6 +146,8 @@ def validate_api_file(file_path):
                 
                 if not path.startswith('/v'):
                     issues.append(f"Server URL should be versioned: {url} in {file_path}")
+        
+        issues.extend(resolver.issues[ref_issues_before:])
     
     except Exception as e:
         issues.append(f"Error reading {file_path}: {e}")
@@ -112,21 +156,27 @@ def validate_api_file(file_path):
 
 def main():
     """Main function"""
-    if len(sys.argv) < 2:
-        print("Usage: python validate_api_docs.py <api_directory>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Validate API documentation structure")
+    parser.add_argument("api_dir", help="Directory holding the API specifications")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Number of worker processes (default: 1)")
+    args = parser.parse_args()
     
-    api_dir = sys.argv[1]
-    issues = validate_api_docs(api_dir)
+    issues = validate_api_docs(args.api_dir, jobs=args.jobs)
     
+    success = report_issues(issues, "✅ API documentation validation passed!")
+    sys.exit(0 if success else 1)
+
+def report_issues(issues, success_message):
+    """Print issues, or the success message when there are none"""
     if issues:
         print(f"❌ Found {len(issues)} issues:")
         for issue in issues:
             print(f"  • {issue}")
-        sys.exit(1)
+        return False
     else:
-        print("✅ API documentation validation passed!")
-        sys.exit(0)
+        print(success_message)
+        return True
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Documentation Maintenance Agent - Form Metadata Validator
+Cross-checks the derived CSV tables against the form definitions they come from
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Set, Tuple
+
+from form_registry import FormRegistry
+from form_snapshot import FORMS_DIR
+from verify_directory_structure import report_issues
+
+METADATA_DIR = "05-metadata-forms"
+ANSWER_CONCEPTS_CSV = os.path.join(METADATA_DIR, "value-sets", "answer-concepts.csv")
+FORMS_CATALOG_CSV = os.path.join(METADATA_DIR, "form-metadata", "forms-catalog.csv")
+ENCOUNTER_TYPES_CSV = os.path.join(METADATA_DIR, "form-metadata", "encounter-types.csv")
+
+MAIN_QUESTION = "Main Question Concept"
+ANSWER_OPTION = "Answer Option"
+
+# (concept type, question label, answer label) -> concept UUIDs
+ConceptKey = Tuple[str, str, str]
+ConceptTable = Dict[ConceptKey, Set[str]]
+
+def read_csv(path: str) -> List[Dict[str, str]]:
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+def form_concepts(form: Dict) -> ConceptTable:
+    """Concept rows a form contributes to answer-concepts.csv
+
+    Mirrors how the table was extracted: the labelled top-level questions of
+    every section, one row for the question concept and one per answer option.
+    """
+    concepts: ConceptTable = defaultdict(set)
+    for page in form.get('pages') or []:
+        for section in page.get('sections') or []:
+            for question in section.get('questions') or []:
+                label = question.get('label')
+                if not label:
+                    continue
+                options = question.get('questionOptions') or {}
+                if 'concept' in options:
+                    concepts[(MAIN_QUESTION, label, label)].add(options['concept'] or '')
+                for answer in options.get('answers') or []:
+                    if 'concept' in answer:
+                        concepts[(ANSWER_OPTION, label, answer.get('label') or '')].add(answer['concept'] or '')
+    return concepts
+
+def describe(key: ConceptKey) -> str:
+    concept_type, question, answer = key
+    return question if concept_type == MAIN_QUESTION else f"{question} = {answer}"
+
+class FormMetadataValidator:
+    """Validates the form metadata CSVs against the forms registry
+
+    The CSVs are loaded once into dictionaries keyed the way they are
+    looked up, then every form is parsed exactly once and checked against
+    them, so the whole run is a single linear pass over the registry.
+    """
+
+    def __init__(self, docs_root: str = "."):
+        self.docs_root = docs_root
+        self.registry = FormRegistry(os.path.join(docs_root, FORMS_DIR))
+        self.issues: List[str] = []
+
+    def _path(self, relative_path: str) -> str:
+        return os.path.join(self.docs_root, relative_path)
+
+    def load_tables(self):
+        """Index the CSVs by form file and encounter type"""
+        self.concepts: Dict[str, ConceptTable] = defaultdict(lambda: defaultdict(set))
+        for row in read_csv(self._path(ANSWER_CONCEPTS_CSV)):
+            key = (row['Concept Type'], row['Question Label'], row['Answer Label'])
+            self.concepts[row['Source Form']][key].add(row['Concept UUID'])
+
+        self.catalog: Dict[str, Dict[str, str]] = {}
+        for row in read_csv(self._path(FORMS_CATALOG_CSV)):
+            if row['Source File'] in self.catalog:
+                self.issues.append(f"forms-catalog.csv: {row['Source File']} is listed more than once")
+            self.catalog[row['Source File']] = row
+
+        self.encounter_types: Dict[str, Dict[str, str]] = {
+            row['Encounter Type Name']: row for row in read_csv(self._path(ENCOUNTER_TYPES_CSV))
+        }
+
+    def check_catalog_entry(self, filename: str, form: Dict):
+        entry = self.catalog.get(filename)
+        if entry is None:
+            self.issues.append(f"forms-catalog.csv: no entry for {filename}")
+            return
+        for column, value in (('Form UUID', form.get('uuid')), ('Form Name', form.get('name')),
+                              ('Encounter Type', form.get('encounter'))):
+            if entry[column] != (value or ''):
+                self.issues.append(f"forms-catalog.csv: {filename} {column} is "
+                                   f"'{entry[column]}', form has '{value or ''}'")
+
+    def check_concepts(self, filename: str, form: Dict):
+        expected = form_concepts(form)
+        listed = self.concepts.pop(filename, {})
+
+        for key, uuids in expected.items():
+            if key not in listed:
+                for uuid in sorted(uuids):
+                    self.issues.append(f"answer-concepts.csv: {filename} missing {key[0]} "
+                                       f"{uuid or '(no concept)'} ({describe(key)})")
+            elif listed[key] != uuids:
+                self.issues.append(f"answer-concepts.csv: {filename} {key[0]} UUID mismatch for "
+                                   f"'{describe(key)}': listed {', '.join(sorted(listed[key]))}, "
+                                   f"form has {', '.join(sorted(uuids))}")
+
+        for key in sorted(listed.keys() - expected.keys()):
+            for uuid in sorted(listed[key]):
+                self.issues.append(f"answer-concepts.csv: {filename} lists extra {key[0]} "
+                                   f"{uuid or '(no concept)'} ({describe(key)})")
+
+    def check_encounter_counts(self, counts: Counter):
+        for name, row in self.encounter_types.items():
+            if row['Form Count'] != str(counts.get(name, 0)):
+                self.issues.append(f"encounter-types.csv: '{name}' Form Count is {row['Form Count']}, "
+                                   f"{counts.get(name, 0)} forms use it")
+        for name in sorted(counts.keys() - self.encounter_types.keys()):
+            self.issues.append(f"encounter-types.csv: no entry for '{name}' ({counts[name]} forms)")
+
+    def check_orphans(self, filenames: Set[str]):
+        for source_file in sorted(self.catalog.keys() - filenames):
+            self.issues.append(f"forms-catalog.csv: source file {source_file} does not exist")
+        for source_form in sorted(self.concepts):
+            self.issues.append(f"answer-concepts.csv: {len(self.concepts[source_form])} rows "
+                               f"reference missing source file {source_form}")
+
+    def validate(self) -> List[str]:
+        """Run every check and return the issues found"""
+        self.issues = []
+        self.load_tables()
+
+        filenames = set()
+        encounter_counts: Counter = Counter()
+
+        def invalid(filename: str, error: Exception):
+            filenames.add(filename)
+            reason = "unreadable" if isinstance(error, OSError) else "invalid JSON"
+            self.issues.append(f"{filename}: {reason} ({error})")
+
+        for filename, form in self.registry.forms(on_error=invalid):
+            filenames.add(filename)
+            if not isinstance(form, dict):
+                self.issues.append(f"{filename}: form definition is not a JSON object")
+                continue
+            if form.get('encounter'):
+                encounter_counts[form['encounter']] += 1
+            self.check_catalog_entry(filename, form)
+            self.check_concepts(filename, form)
+
+        self.check_encounter_counts(encounter_counts)
+        self.check_orphans(filenames)
+        self.form_count = len(filenames)
+        return self.issues
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Cross-validate form metadata CSVs against the forms registry")
+    parser.add_argument("docs_root", nargs="?", default=".", help="Documentation root directory")
+    args = parser.parse_args()
+
+    print("🧾 Cross-validating form metadata...")
+    start = time.perf_counter()
+    validator = FormMetadataValidator(args.docs_root)
+    issues = validator.validate()
+    print(f"📊 Checked {validator.form_count} forms in {time.perf_counter() - start:.2f}s")
+
+    success = report_issues(issues, "✅ Form metadata is in sync with the forms registry!")
+    sys.exit(0 if success else 1)
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,19 @@ Documentation Maintenance Agent - Link Validator
 Checks for broken internal links in all markdown files
 """
 
+import argparse
+import hashlib
 import os
+from concurrent.futures import ProcessPoolExecutor
 import re
 import sys
+import unicodedata
 from pathlib import Path
+from urllib.parse import unquote
+
+from corpus_scanner import Checker, scan
+from link_cache import LinkCache
+from link_graph import LinkGraph, report_graph, resolve_page
 
 def extract_links_from_file(file_path):
     """Extract all relative links from a markdown file"""
@@ -15,21 +24,25 @@ def extract_links_from_file(file_path):
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Find markdown links: [text](link)
-        link_pattern = r'\[([^\]]*)\]\(([^)]+)\)'
-        matches = re.findall(link_pattern, content)
-        
-        links = []
-        for text, link in matches:
-            # Skip external links (http://, https://, mailto:, etc.)
-            if not link.startswith(('http://', 'https://', 'mailto:', '#', 'ftp://')):
-                links.append((text, link))
-        
-        return links
+        return extract_links(content)
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
         return []
 
+def extract_links(content):
+    """Extract all relative links from markdown content"""
+    # Find markdown links: [text](link)
+    link_pattern = r'\[([^\]]*)\]\(([^)]+)\)'
+    matches = re.findall(link_pattern, content)
+    
+    links = []
+    for text, link in matches:
+        # Skip external links (http://, https://, mailto:, etc.)
+        if not link.startswith(('http://', 'https://', 'mailto:', '#', 'ftp://')):
+            links.append((text, link))
+    
+    return links
+
 def resolve_link_path(base_file, link):
     """Resolve relative link to absolute path"""
     base_dir = os.path.dirname(base_file)
@@ -46,61 +59,280 @@ def check_file_exists(file_path):
     """Check if a file or directory exists"""
     return os.path.exists(file_path)
 
-def check_anchor_exists(file_path, anchor):
-    """Check if an anchor exists in a markdown file"""
-    if not os.path.isfile(file_path):
-        return False
+HEADING_PATTERN = re.compile(r'^ {0,3}(#{1,6})\s+(.*?)(?:\s+#+)?\s*$')
+CUSTOM_ID_PATTERN = re.compile(r'\s*\{#([^}\s]+)\}\s*$')
+HTML_ID_PATTERN = re.compile(r'<[a-z][^>]*?\s(?:id|name)=["\']([^"\']+)["\']', re.IGNORECASE)
+FENCE_PATTERN = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+INLINE_LINK_PATTERN = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+def slugify_github(text):
+    """Slugify heading text the way GitHub and Docusaurus do"""
+    slug = text.strip().lower()
+    slug = re.sub(r'[^\w\- ]', '', slug)
+    return slug.replace(' ', '-')
+
+def slugify_mkdocs(text):
+    """Slugify heading text the way MkDocs' default toc extension does"""
+    slug = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    slug = re.sub(r'[^\w\s-]', '', slug).strip().lower()
+    return re.sub(r'[-\s]+', '-', slug)
+
+def heading_text(raw):
+    """Strip inline markdown from a heading so it slugifies like rendered text"""
+    text = INLINE_LINK_PATTERN.sub(r'\1', raw)
+    return HTML_TAG_PATTERN.sub('', text)
+
+def extract_anchors(content):
+    """Return the set of anchors a markdown document defines"""
+    anchors = set()
+    github_counts = {}
+    fence = None
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    for line in content.splitlines():
+        fence_match = FENCE_PATTERN.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence):
+                fence = None
+            continue
+        if fence is not None:
+            continue
         
-        # Convert anchor to match markdown header format
-        # Headers become #header-name-with-dashes
-        anchor_search = anchor.lower().replace(' ', '-')
+        anchors.update(HTML_ID_PATTERN.findall(line))
         
-        # Look for headers matching the anchor
-        header_pattern = rf'^#+\s+.*{re.escape(anchor_search)}.*$'
-        return bool(re.search(header_pattern, content, re.MULTILINE))
-    except Exception:
-        return False
+        heading = HEADING_PATTERN.match(line)
+        if not heading:
+            continue
+        
+        raw = heading.group(2)
+        custom_id = CUSTOM_ID_PATTERN.search(raw)
+        if custom_id:
+            anchors.add(custom_id.group(1))
+            raw = raw[:custom_id.start()]
+        
+        text = heading_text(raw)
+        
+        # GitHub de-duplicates repeated headings with -1, -2, ... suffixes
+        slug = slugify_github(text)
+        count = github_counts.get(slug, 0)
+        github_counts[slug] = count + 1
+        anchors.add(slug if count == 0 else f"{slug}-{count}")
+        
+        anchors.add(slugify_mkdocs(text))
+    
+    return frozenset(anchors)
 
-def validate_links(root_dir):
-    """Validate all internal links in markdown files"""
-    print("🔍 Checking internal links...")
+class HeadingIndex:
+    """In-memory index of slugified heading anchors per markdown file"""
     
-    broken_links = []
-    total_links = 0
+    def __init__(self):
+        self._anchors = {}
     
-    # Find all markdown files
-    for root, dirs, files in os.walk(root_dir):
-        for file in files:
-            if file.endswith('.md'):
-                file_path = os.path.join(root, file)
-                links = extract_links_from_file(file_path)
-                
-                for text, link in links:
-                    total_links += 1
-                    resolved_path, anchor = resolve_link_path(file_path, link)
-                    
-                    # Check if file exists
-                    if not check_file_exists(resolved_path):
-                        broken_links.append({
-                            'file': file_path,
-                            'link': link,
-                            'type': 'file_not_found',
-                            'text': text
-                        })
-                    # Check if anchor exists (if specified)
-                    elif anchor and not check_anchor_exists(resolved_path, anchor):
-                        broken_links.append({
-                            'file': file_path,
-                            'link': link,
-                            'type': 'anchor_not_found',
-                            'text': text
-                        })
+    def add(self, file_path, content):
+        """Index a file whose content has already been read"""
+        self.set(file_path, extract_anchors(content))
     
-    # Report results
+    def set(self, file_path, anchors):
+        """Record precomputed anchors for a file"""
+        self._anchors[os.path.normpath(file_path)] = anchors
+    
+    def get(self, file_path):
+        """Return the anchors defined by a file, reading it on first touch"""
+        key = os.path.normpath(file_path)
+        anchors = self._anchors.get(key)
+        if anchors is None:
+            try:
+                with open(key, 'r', encoding='utf-8') as f:
+                    anchors = extract_anchors(f.read())
+            except Exception:
+                anchors = frozenset()
+            self._anchors[key] = anchors
+        return anchors
+    
+    def has_anchor(self, file_path, anchor):
+        """Check whether an anchor exists in a markdown file"""
+        if not os.path.isfile(file_path):
+            return False
+        
+        anchors = self.get(file_path)
+        anchor = unquote(anchor)
+        return anchor in anchors or anchor.lower().replace(' ', '-') in anchors
+
+_heading_index = HeadingIndex()
+
+def check_anchor_exists(file_path, anchor, heading_index=None):
+    """Check if an anchor exists in a markdown file"""
+    index = heading_index if heading_index is not None else _heading_index
+    return index.has_anchor(file_path, anchor)
+
+def check_link(file_path, text, link, heading_index=None):
+    """Check a single link, returning a broken-link record or None"""
+    resolved_path, anchor = resolve_link_path(file_path, link)
+    
+    # Check if file exists
+    if not check_file_exists(resolved_path):
+        return {
+            'file': file_path,
+            'link': link,
+            'type': 'file_not_found',
+            'text': text
+        }
+    # Check if anchor exists (if specified)
+    elif anchor and not check_anchor_exists(resolved_path, anchor, heading_index):
+        return {
+            'file': file_path,
+            'link': link,
+            'type': 'anchor_not_found',
+            'text': text
+        }
+    return None
+
+class LinkChecker(Checker):
+    """Corpus scanner plugin that validates internal markdown links
+    
+    With a ``LinkCache`` the checker runs incrementally: files whose size and
+    mtime (or, failing that, content hash) match the cache are not re-parsed,
+    and their cached link results are reused unless the link points at a
+    file that changed, disappeared or is not tracked by the cache.
+    """
+    
+    name = "internal-links"
+    extensions = ('.md',)
+    
+    def __init__(self, subdir=None, cache=None, root_dir="."):
+        super().__init__(subdir)
+        self.heading_index = HeadingIndex()
+        self.pending = []
+        self.pages = []
+        self.broken_links = []
+        self.total_links = 0
+        self.cache = cache
+        self.root_dir = root_dir
+        self.cached = cache.load() if cache is not None else {}
+        self.entries = {}
+        self.changed = set()
+        self.revalidated = 0
+        # Cached links rechecked because their target (a missing file, a directory or
+        # a non-markdown file) is not tracked by the cache
+        self.untracked = 0
+    
+    def visit(self, file):
+        if self.cache is not None:
+            stat = os.stat(file.path)
+            entry = self.cached.get(file.relative_path)
+            if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                self._reuse(file, entry)
+                return
+        
+        try:
+            content = file.text
+        except Exception as e:
+            print(f"Error reading {file.path}: {e}")
+            return
+        
+        if self.cache is not None:
+            digest = hashlib.sha256(file.data).hexdigest()
+            if entry and entry["hash"] == digest:
+                self._reuse(file, dict(entry, mtime_ns=stat.st_mtime_ns, size=stat.st_size))
+                return
+            self.changed.add(os.path.normpath(file.path))
+            self.entries[file.relative_path] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "hash": digest,
+                "anchors": extract_anchors(content),
+                "links": None
+            }
+            self.heading_index.set(file.path, self.entries[file.relative_path]["anchors"])
+        else:
+            # Index headings now so anchor checks never re-read scanned files
+            self.heading_index.add(file.path, content)
+        
+        self.pending.append((file.path, file.relative_path, extract_links(content), None))
+    
+    def _reuse(self, file, entry):
+        """Take a file's anchors and link results from the cache"""
+        # A copy, so rechecked links show up as a change to save in finish()
+        self.entries[file.relative_path] = dict(entry)
+        self.heading_index.set(file.path, entry["anchors"])
+        links = [(text, link) for text, link, _ in entry["links"]]
+        results = [error for _, _, error in entry["links"]]
+        self.pending.append((file.path, file.relative_path, links, results))
+    
+    def finish(self):
+        tracked = {os.path.normpath(path) for path, _, _, _ in self.pending}
+        
+        for file_path, relative_path, links, results in self.pending:
+            checked = []
+            for i, (text, link) in enumerate(links):
+                self.total_links += 1
+                error = results[i] if results is not None else None
+                reason = "new" if results is None else self._recheck_reason(file_path, link, tracked)
+                if reason:
+                    self.revalidated += 1
+                    if reason == "untracked":
+                        self.untracked += 1
+                    broken = check_link(file_path, text, link, self.heading_index)
+                    error = broken['type'] if broken else None
+                if error:
+                    self.broken_links.append({
+                        'file': file_path,
+                        'link': link,
+                        'type': error,
+                        'text': text
+                    })
+                checked.append((text, link, error))
+            
+            entry = self.entries.get(relative_path)
+            if entry is not None:
+                entry["links"] = checked
+            self.pages.append((file_path, links))
+        
+        self.pending = []
+        
+        if self.cache is not None:
+            removed = set(self.cached) - set(self.entries)
+            updated = {path: entry for path, entry in self.entries.items()
+                       if self.cached.get(path) != entry}
+            self.cache.save(updated, removed)
+    
+    def _recheck_reason(self, file_path, link, tracked):
+        """Why a cached link result is stale ("changed" or "untracked" target), or None"""
+        resolved_path, _ = resolve_link_path(file_path, link)
+        target = os.path.normpath(resolved_path)
+        if target in self.changed:
+            return "changed"
+        if target not in tracked:
+            return "untracked"
+        return None
+    
+    def link_graph(self):
+        """Page-to-page graph of the links seen during the scan"""
+        return build_link_graph(self.root_dir, self.pages)
+    
+    def report(self):
+        return report_links(self.total_links, self.broken_links)
+
+def build_link_graph(root_dir, pages):
+    """Build the page graph from (file_path, links) pairs in scan order"""
+    nodes = {os.path.normpath(path): node for node, (path, _) in enumerate(pages)}
+    labels = [os.path.relpath(path, root_dir) for path, _ in pages]
+    
+    def edges():
+        for source, (path, links) in enumerate(pages):
+            for _, link in links:
+                resolved_path, _ = resolve_link_path(path, link)
+                target = resolve_page(os.path.normpath(resolved_path), nodes)
+                if target is not None:
+                    yield source, target
+    
+    return LinkGraph.build(labels, edges())
+
+def report_links(total_links, broken_links):
+    """Print link validation results"""
     print(f"📊 Checked {total_links} links")
     
     if broken_links:
@@ -113,7 +345,136 @@ def validate_links(root_dir):
         print("✅ All links are valid!")
         return True
 
+class PathCollector(Checker):
+    """Corpus scanner plugin that only records markdown paths"""
+    
+    name = "markdown-paths"
+    extensions = ('.md',)
+    
+    def __init__(self, subdir=None):
+        super().__init__(subdir)
+        self.paths = []
+    
+    def visit(self, file):
+        self.paths.append(file.path)
+
+def chunked(items, jobs):
+    """Split items into contiguous chunks, a few per worker"""
+    size = max(1, len(items) // (jobs * 4) + 1)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _index_chunk(paths):
+    """Worker: read files and extract their anchors and links"""
+    results = []
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except Exception as e:
+            results.append((path, None, None, f"Error reading {path}: {e}"))
+            continue
+        results.append((path, extract_anchors(content), extract_links(content), None))
+    return results
+
+_worker_index = None
+
+def _init_check_worker(anchors):
+    """Worker initializer: install the heading index built by the first pass"""
+    global _worker_index
+    _worker_index = HeadingIndex()
+    for path, file_anchors in anchors.items():
+        _worker_index.set(path, file_anchors)
+
+def _check_chunk(items):
+    """Worker: check the links of a chunk of files"""
+    total = 0
+    broken_links = []
+    for file_path, links in items:
+        for text, link in links:
+            total += 1
+            broken = check_link(file_path, text, link, _worker_index)
+            if broken:
+                broken_links.append(broken)
+    return total, broken_links
+
+def validate_links_parallel(root_dir, jobs):
+    """Validate links across worker processes, returning results in scan order"""
+    collector = PathCollector()
+    scan(root_dir, collector)
+    
+    # Pass 1: build the heading index and extract links
+    anchors = {}
+    pending = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for chunk in pool.map(_index_chunk, chunked(collector.paths, jobs)):
+            for path, file_anchors, links, error in chunk:
+                if error:
+                    print(error)
+                    continue
+                anchors[os.path.normpath(path)] = file_anchors
+                pending.append((path, links))
+    
+    # Pass 2: check links against the shared index
+    total_links = 0
+    broken_links = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_check_worker,
+                             initargs=(anchors,)) as pool:
+        for total, broken in pool.map(_check_chunk, chunked(pending, jobs)):
+            total_links += total
+            broken_links.extend(broken)
+    
+    return total_links, broken_links, pending
+
+def validate_links(root_dir, incremental=False, cache_dir=None, jobs=1,
+                   graph_path=None, graph_report=False):
+    """Validate all internal links in markdown files"""
+    print("🔍 Checking internal links...")
+    
+    if jobs > 1 and not incremental:
+        total_links, broken_links, pages = validate_links_parallel(root_dir, jobs)
+    else:
+        cache = LinkCache.for_root(root_dir, cache_dir) if incremental else None
+        try:
+            checker = LinkChecker(cache=cache, root_dir=root_dir)
+            scan(root_dir, checker)
+        finally:
+            if cache is not None:
+                cache.close()
+        
+        if incremental:
+            print(f"♻️  {len(checker.changed)} changed files; revalidated {checker.revalidated} links "
+                  f"({checker.untracked} point outside the cached markdown files and are always rechecked)")
+        total_links, broken_links, pages = checker.total_links, checker.broken_links, checker.pages
+    
+    # Report results
+    success = report_links(total_links, broken_links)
+    
+    if graph_path or graph_report:
+        graph = build_link_graph(root_dir, pages)
+        if graph_path:
+            graph.save(graph_path)
+            print(f"✅ Link graph saved to: {graph_path}")
+        if graph_report:
+            print("")
+            report_graph(graph)
+    
+    return success
+
 if __name__ == "__main__":
-    root_dir = sys.argv[1] if len(sys.argv) > 1 else "."
-    success = validate_links(root_dir)
+    parser = argparse.ArgumentParser(description="Check for broken internal links in markdown files")
+    parser.add_argument("root_dir", nargs="?", default=".", help="Documentation root directory")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only revalidate changed files, using the cache under <root_dir>/.cache")
+    parser.add_argument("--cache-dir", help="Directory for the incremental cache")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Number of worker processes for full runs; incremental runs stay serial (default: 1)")
+    parser.add_argument("--graph", metavar="PATH",
+                        help="Export the page link graph (.json, or compact binary for any other extension)")
+    parser.add_argument("--graph-report", action="store_true",
+                        help="Print orphan, hub and strongly connected page reports")
+    args = parser.parse_args()
+    
+    success = validate_links(args.root_dir, incremental=args.incremental,
+                             cache_dir=args.cache_dir, jobs=args.jobs,
+                             graph_path=args.graph, graph_report=args.graph_report)
     sys.exit(0 if success else 1)
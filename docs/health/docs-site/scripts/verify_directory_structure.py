@@ -8,6 +8,8 @@ import os
 import sys
 from pathlib import Path
 
+from corpus_scanner import Checker, scan
+
 # Expected directory structure
 EXPECTED_STRUCTURE = {
     "00-core-architecture": {
@@ -135,42 +137,57 @@ def check_file_types(root_dir):
     """Check that files are in correct directories"""
     print("📁 Verifying file locations...")
     
+    checker = FileLocationChecker()
+    scan(root_dir, checker)
+    
+    return checker.issues
+
+def check_file_location(file, relative_path):
+    """Check that a single file is in the correct directory"""
     issues = []
     
-    for root, dirs, files in os.walk(root_dir):
-        # Skip hidden directories
-        dirs[:] = [d for d in dirs if not d.startswith('.')]
+    # Check file type locations
+    if file.endswith('.json'):
+        # JSON files should be in forms-registry, except .markdownlint.json, .spectral.yml, and monitoring files
+        allowed_json_files = ['.markdownlint.json', 'compliance-metrics.json', 'event-architecture-data.json', 'api-standards-validation.json', 'ui-components-catalog.json', 'package.json', 'ig.json']
+        # Allow ZARISH FHIR IG files in 05-metadata-forms
+        zarish_ig_files = ['ig-zarish-his.json', 'StructureDefinition-zarish-', 'ValueSet-zarish-', 'CodeSystem-zarish-', 'Extension-', 'patient-zarish.json', 'observation-vitals.json']
         
-        for file in files:
-            file_path = os.path.join(root, file)
-            relative_path = os.path.relpath(file_path, root_dir)
-            
-            # Check file type locations
-            if file.endswith('.json'):
-                # JSON files should be in forms-registry, except .markdownlint.json, .spectral.yml, and monitoring files
-                allowed_json_files = ['.markdownlint.json', 'compliance-metrics.json', 'event-architecture-data.json', 'api-standards-validation.json', 'ui-components-catalog.json', 'package.json', 'ig.json']
-                # Allow ZARISH FHIR IG files in 05-metadata-forms
-                zarish_ig_files = ['ig-zarish-his.json', 'StructureDefinition-zarish-', 'ValueSet-zarish-', 'CodeSystem-zarish-', 'Extension-', 'patient-zarish.json', 'observation-vitals.json']
-                
-                if 'forms-registry' in relative_path:
-                    # Allow all JSON files in forms-registry
-                    pass
-                elif '05-metadata-forms' not in relative_path and not any(file.endswith(allowed) for allowed in allowed_json_files):
-                    issues.append(f"JSON file in unexpected location: {relative_path}")
-                elif '05-metadata-forms' in relative_path and not any(file.endswith(allowed) for allowed in allowed_json_files) and not any(pattern in file for pattern in zarish_ig_files):
-                    issues.append(f"Unexpected JSON file in 05-metadata-forms: {relative_path}")
-            
-            elif file.endswith('.yml') or file.endswith('.yaml'):
-                # YAML files should be in api-specifications, except .spectral.yml and mkdocs.yml
-                if 'api-specifications' not in relative_path and not file.endswith(('.spectral.yml', 'mkdocs.yml')):
-                    issues.append(f"YAML file in unexpected location: {relative_path}")
-            
-            elif file.endswith('.md'):
-                # Markdown files are generally okay anywhere
-                pass
+        if 'forms-registry' in relative_path:
+            # Allow all JSON files in forms-registry
+            pass
+        elif '05-metadata-forms' not in relative_path and not any(file.endswith(allowed) for allowed in allowed_json_files):
+            issues.append(f"JSON file in unexpected location: {relative_path}")
+        elif '05-metadata-forms' in relative_path and not any(file.endswith(allowed) for allowed in allowed_json_files) and not any(pattern in file for pattern in zarish_ig_files):
+            issues.append(f"Unexpected JSON file in 05-metadata-forms: {relative_path}")
+    
+    elif file.endswith('.yml') or file.endswith('.yaml'):
+        # YAML files should be in api-specifications, except .spectral.yml and mkdocs.yml
+        if 'api-specifications' not in relative_path and not file.endswith(('.spectral.yml', 'mkdocs.yml')):
+            issues.append(f"YAML file in unexpected location: {relative_path}")
+    
+    elif file.endswith('.md'):
+        # Markdown files are generally okay anywhere
+        pass
     
     return issues
 
+class FileLocationChecker(Checker):
+    """Corpus scanner plugin checking file locations (never reads contents)"""
+    
+    name = "file-locations"
+    skip_hidden_dirs = True
+    
+    def __init__(self, subdir=None):
+        super().__init__(subdir)
+        self.issues = []
+    
+    def visit(self, file):
+        self.issues.extend(check_file_location(file.name, file.relative_path))
+    
+    def report(self):
+        return report_issues(self.issues, "✅ All files are in the correct locations!")
+
 def verify_directory_structure():
     """Main verification function"""
     root_dir = sys.argv[1] if len(sys.argv) > 1 else "."
@@ -185,13 +202,17 @@ def verify_directory_structure():
     
     all_issues = structure_issues + file_type_issues
     
-    if all_issues:
-        print(f"❌ Found {len(all_issues)} issues:")
-        for issue in all_issues:
+    return report_issues(all_issues, "✅ Directory structure is correct!")
+
+def report_issues(issues, success_message):
+    """Print issues, or the success message when there are none"""
+    if issues:
+        print(f"❌ Found {len(issues)} issues:")
+        for issue in issues:
             print(f"  • {issue}")
         return False
     else:
-        print("✅ Directory structure is correct!")
+        print(success_message)
         return True
 
 if __name__ == "__main__":
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+StructureDefinition profile compiler for ZARISH HIS
+
+Compiles the differentials of the StructureDefinitions shipped with the
+implementation guide, together with the ValueSets and CodeSystems they bind
+to, into validation plans covering cardinality, fixed and pattern values,
+choice types, terminology bindings and slices. Compiled plans are persisted
+as JSON next to a fingerprint of their sources, so validator start-up only
+re-derives them when a conformance resource changes.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from fhir_terminology import DEFAULT_CACHE as TERMINOLOGY_CACHE
+from fhir_terminology import TerminologyService, canonical, fingerprint, load_conformance
+
+COMPILER_VERSION = 1
+DEFAULT_PROFILES_DIR = Path(__file__).resolve().parent.parent / "05-metadata-forms"
+DEFAULT_CACHE = Path(__file__).resolve().parent.parent / ".cache" / "fhir-profiles.json"
+
+# Bindings weaker than these are informative only
+BINDING_SEVERITY = {"required": "error", "extensible": "warning"}
+
+# Element path below the resource root, e.g. ("address", "country")
+ElementPath = Tuple[str, ...]
+
+def as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+def children(value: Any, name: str) -> List[Any]:
+    """Values of a child element; ``name[x]`` matches every type of a choice element"""
+    if not isinstance(value, dict):
+        return []
+    if not name.endswith("[x]"):
+        return as_list(value.get(name))
+    prefix = name[:-3]
+    found = []
+    for key, child in value.items():
+        if key.startswith(prefix) and key[len(prefix):len(prefix) + 1].isupper():
+            found.extend(as_list(child))
+    return found
+
+def navigate(value: Any, path: ElementPath) -> List[Any]:
+    """All values reached by following ``path`` from ``value``"""
+    values = [value]
+    for name in path:
+        values = [child for parent in values for child in children(parent, name)]
+    return values
+
+def codings(value: Any) -> List[Tuple[Optional[str], Any]]:
+    """(system, code) pairs of a code, Coding, CodeableConcept or CodeableReference"""
+    if isinstance(value, str):
+        return [(None, value)]
+    if not isinstance(value, dict):
+        return []
+    if isinstance(value.get("concept"), dict):
+        value = value["concept"]
+    if "coding" in value:
+        return [(coding.get("system"), coding.get("code"))
+                for coding in as_list(value["coding"]) if isinstance(coding, dict)]
+    if "code" in value:
+        return [(value.get("system"), value.get("code"))]
+    return []
+
+def matches_pattern(value: Any, pattern: Any) -> bool:
+    """FHIR pattern[x] semantics: every element of the pattern must appear in the value"""
+    if isinstance(pattern, dict):
+        return isinstance(value, dict) and all(
+            matches_pattern(value.get(key), expected) for key, expected in pattern.items())
+    if isinstance(pattern, list):
+        return isinstance(value, list) and all(
+            any(matches_pattern(item, expected) for item in value) for expected in pattern)
+    return value == pattern
+
+def _value_element(element: Dict[str, Any], prefix: str) -> Optional[Tuple[str, Any]]:
+    """The (type suffix, value) of a fixed[x] or pattern[x] entry"""
+    for key, value in element.items():
+        if key.startswith(prefix) and key[len(prefix):len(prefix) + 1].isupper():
+            return key[len(prefix):], value
+    return None
+
+class ProfilePlan:
+    """Compiled validation rules of one StructureDefinition
+
+    Every rule carries the element path relative to the resource (or
+    extension) root, so checking an instance is a walk along precomputed
+    paths rather than an interpretation of the differential.
+    """
+
+    __slots__ = ("url", "type", "name", "cardinality", "values", "types",
+                 "bindings", "slicings", "notes")
+
+    def __init__(self, url: str, type_: str, name: str):
+        self.url = url
+        self.type = type_
+        self.name = name
+        self.cardinality: List[Tuple[ElementPath, str, int, Optional[int]]] = []
+        self.values: List[Tuple[ElementPath, str, bool, Any]] = []
+        self.types: List[Tuple[ElementPath, str, FrozenSet[str]]] = []
+        self.bindings: List[Tuple[ElementPath, str, str, str]] = []
+        self.slicings: List[Tuple[ElementPath, str, Tuple[str, ...], bool, List[Tuple[str, Tuple, int, Optional[int]]]]] = []
+        self.notes: List[str] = []
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "type": self.type,
+            "name": self.name,
+            "cardinality": [[list(path), label, low, high] for path, label, low, high in self.cardinality],
+            "values": [[list(path), label, exact, value] for path, label, exact, value in self.values],
+            "types": [[list(path), label, sorted(allowed)] for path, label, allowed in self.types],
+            "bindings": [[list(path), label, strength, valueset] for path, label, strength, valueset in self.bindings],
+            "slicings": [[list(path), label, list(discriminators), closed,
+                          [[name, list(values), low, high] for name, values, low, high in slices]]
+                         for path, label, discriminators, closed, slices in self.slicings],
+            "notes": self.notes
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "ProfilePlan":
+        plan = cls(data["url"], data["type"], data["name"])
+        plan.cardinality = [(tuple(path), label, low, high) for path, label, low, high in data["cardinality"]]
+        plan.values = [(tuple(path), label, exact, value) for path, label, exact, value in data["values"]]
+        plan.types = [(tuple(path), label, frozenset(allowed)) for path, label, allowed in data["types"]]
+        plan.bindings = [(tuple(path), label, strength, valueset) for path, label, strength, valueset in data["bindings"]]
+        plan.slicings = [(tuple(path), label, tuple(discriminators), closed,
+                          [(name, tuple(values), low, high) for name, values, low, high in slices])
+                         for path, label, discriminators, closed, slices in data["slicings"]]
+        plan.notes = data["notes"]
+        return plan
+
+    def check(self, instance: Dict[str, Any], errors: List[str], warnings: List[str], prefix: str,
+              terminology: Optional[TerminologyService] = None):
+        """Append this profile's violations for ``instance`` to ``errors`` and ``warnings``
+
+        Bindings are only checked with a ``terminology`` service to expand them.
+        """
+        for path, label, low, high in self.cardinality:
+            for parent in navigate(instance, path[:-1]):
+                count = len(children(parent, path[-1]))
+                if count < low:
+                    if count == 0:
+                        errors.append(f"{prefix}: Missing required element '{label}'")
+                    else:
+                        errors.append(f"{prefix}: '{label}' requires at least {low} (found {count})")
+                elif high is not None and count > high:
+                    errors.append(f"{prefix}: '{label}' allows at most {high} (found {count})")
+
+        for path, label, exact, expected in self.values:
+            for value in navigate(instance, path):
+                if exact and value != expected:
+                    errors.append(f"{prefix}: '{label}' must be {json.dumps(expected)}")
+                elif not exact and not matches_pattern(value, expected):
+                    errors.append(f"{prefix}: '{label}' must match {json.dumps(expected)}")
+
+        for path, label, allowed in self.types:
+            choice = path[-1][:-3]
+            for parent in navigate(instance, path[:-1]):
+                if not isinstance(parent, dict):
+                    continue
+                for key in parent:
+                    suffix = key[len(choice):]
+                    if key.startswith(choice) and suffix[:1].isupper() and suffix not in allowed:
+                        errors.append(f"{prefix}: '{label}' must be of type {', '.join(sorted(allowed))}, "
+                                      f"found {suffix}")
+
+        for path, label, strength, valueset in self.bindings:
+            expansion = terminology.expand(valueset) if terminology is not None else None
+            if expansion is None:
+                continue
+            for value in navigate(instance, path):
+                pairs = codings(value)
+                if not pairs or any(expansion.contains(system, code) for system, code in pairs):
+                    continue
+                shown = ", ".join(str(code) for _, code in pairs)
+                message = f"{prefix}: '{label}' code {shown} is not in value set {valueset}"
+                (errors if BINDING_SEVERITY[strength] == "error" else warnings).append(message)
+
+        for path, label, discriminators, closed, slices in self.slicings:
+            for parent in navigate(instance, path[:-1]):
+                items = children(parent, path[-1])
+                counts = [0] * len(slices)
+                for item in items:
+                    key = tuple(navigate(item, tuple(d.split("."))) for d in discriminators)
+                    key = tuple(found[0] if found else None for found in key)
+                    matched = False
+                    for index, (_, values, _, _) in enumerate(slices):
+                        if key == values:
+                            counts[index] += 1
+                            matched = True
+                            break
+                    if closed and not matched:
+                        errors.append(f"{prefix}: '{label}' has an element matching no slice (slicing is closed)")
+                for (name, _, low, high), count in zip(slices, counts):
+                    if count < low:
+                        errors.append(f"{prefix}: Slice '{label}:{name}' requires at least {low} (found {count})")
+                    elif high is not None and count > high:
+                        errors.append(f"{prefix}: Slice '{label}:{name}' allows at most {high} (found {count})")
+
+class ProfileCompiler:
+    """Compiles StructureDefinition differentials into ProfilePlans"""
+
+    def __init__(self, resources: List[Dict[str, Any]], terminology: Optional[TerminologyService] = None):
+        self.structure_definitions = [r for r in resources if r.get("resourceType") == "StructureDefinition"]
+        self.terminology = terminology if terminology is not None else TerminologyService(resources)
+
+    def compile_all(self) -> List[ProfilePlan]:
+        return [self.compile(sd) for sd in self.structure_definitions
+                if sd.get("differential", {}).get("element")]
+
+    def compile(self, sd: Dict[str, Any]) -> ProfilePlan:
+        plan = ProfilePlan(sd.get("url", ""), sd.get("type", ""), sd.get("name", sd.get("id", "")))
+        slicings: Dict[str, Tuple[ElementPath, str, Tuple[str, ...], bool, list]] = {}
+
+        for element in sd["differential"]["element"]:
+            element_id = element.get("id", element.get("path", ""))
+            path = tuple(element["path"].split(".")[1:])
+            label = element["path"]
+            if not path:
+                continue
+
+            if "slicing" in element:
+                slicing = element["slicing"]
+                discriminators = tuple(d["path"] for d in slicing.get("discriminator", [])
+                                       if d.get("type") in ("value", "pattern"))
+                if len(discriminators) != len(slicing.get("discriminator", [])):
+                    plan.notes.append(f"{element_id}: only value/pattern discriminators are checked")
+                slicings[element_id] = (path, label, discriminators, slicing.get("rules") == "closed", [])
+
+            if "sliceName" in element:
+                base_id = element_id.rsplit(":", 1)[0]
+                if base_id not in slicings:
+                    plan.notes.append(f"{element_id}: slice without slicing definition skipped")
+                    continue
+                _, _, discriminators, _, slices = slicings[base_id]
+                values = tuple(self._slice_value(element, d) for d in discriminators)
+                if None in values:
+                    plan.notes.append(f"{element_id}: no discriminator value, slice skipped")
+                    continue
+                high = element.get("max", "*")
+                slices.append((element["sliceName"], values, element.get("min", 0),
+                               None if high == "*" else int(high)))
+                continue
+
+            if ":" in element_id:
+                plan.notes.append(f"{element_id}: constraints inside slices are not checked")
+                continue
+
+            low = element.get("min", 0)
+            high = element.get("max", "*")
+            if low > 0 or high != "*":
+                plan.cardinality.append((path, label, low, None if high == "*" else int(high)))
+
+            fixed = _value_element(element, "fixed")
+            pattern = _value_element(element, "pattern")
+            if fixed:
+                plan.values.append((path, label, True, fixed[1]))
+            elif pattern:
+                plan.values.append((path, label, False, pattern[1]))
+
+            if path[-1].endswith("[x]") and element.get("type"):
+                allowed = frozenset(t["code"][0].upper() + t["code"][1:] for t in element["type"])
+                plan.types.append((path, label, allowed))
+
+            binding = element.get("binding")
+            if binding and binding.get("valueSet") and binding.get("strength") in BINDING_SEVERITY:
+                if self.terminology.expand(binding["valueSet"]) is None:
+                    plan.notes.append(f"{element_id}: value set {binding['valueSet']} can't be expanded locally")
+                plan.bindings.append((path, label, binding["strength"], canonical(binding["valueSet"])))
+
+        plan.slicings = [s for s in slicings.values() if s[4]]
+        return plan
+
+    @staticmethod
+    def _slice_value(element: Dict[str, Any], discriminator: str) -> Any:
+        """The value a slice's members carry at the discriminator path"""
+        if discriminator == "url":
+            for type_ in element.get("type", []):
+                if type_.get("code") == "Extension" and type_.get("profile"):
+                    return type_["profile"][0]
+        found = _value_element(element, "fixed") or _value_element(element, "pattern")
+        if found is None:
+            return None
+        values = navigate(found[1], tuple(discriminator.split(".")))
+        return values[0] if values else None
+
+class ProfileSet:
+    """Compiled profiles, looked up by canonical URL or resource type"""
+
+    def __init__(self, plans: List[ProfilePlan], terminology: Optional[TerminologyService] = None):
+        self.plans = plans
+        self.terminology = terminology
+        self.by_url = {plan.url: plan for plan in plans}
+        self.by_type = {}
+        self.extensions = {}
+        for plan in plans:
+            if plan.type == "Extension":
+                self.extensions[plan.url] = plan
+            else:
+                self.by_type.setdefault(plan.type, plan)
+
+    def for_resource(self, resource: Dict[str, Any]) -> Optional[ProfilePlan]:
+        """The profile the resource claims in meta.profile, else the default profile for its type"""
+        for url in resource.get("meta", {}).get("profile", []) if isinstance(resource.get("meta"), dict) else []:
+            plan = self.by_url.get(canonical(url))
+            if plan is not None:
+                return plan
+        return self.by_type.get(resource.get("resourceType"))
+
+    def check_extensions(self, value: Any, errors: List[str], warnings: List[str], prefix: str):
+        """Check every extension in ``value`` that has a compiled Extension profile"""
+        if isinstance(value, list):
+            for item in value:
+                self.check_extensions(item, errors, warnings, prefix)
+        elif isinstance(value, dict):
+            url = value.get("url")
+            plan = self.extensions.get(url) if isinstance(url, str) else None
+            if plan is not None:
+                plan.check(value, errors, warnings, f"{prefix} extension {plan.name}", self.terminology)
+            for child in value.values():
+                if isinstance(child, (list, dict)):
+                    self.check_extensions(child, errors, warnings, prefix)
+
+def load_profiles(directory: str = DEFAULT_PROFILES_DIR, cache_path: Optional[str] = DEFAULT_CACHE,
+                  terminology_cache: Optional[str] = TERMINOLOGY_CACHE) -> ProfileSet:
+    """Load compiled profiles, recompiling and persisting them only when the sources changed
+
+    The profiles share one terminology service, whose expansions are
+    persisted to ``terminology_cache`` the same way.
+    """
+    resources = load_conformance(directory)
+    terminology = TerminologyService.from_directory(directory, terminology_cache, resources)
+    key = fingerprint(directory, COMPILER_VERSION)
+    plans = None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get("fingerprint") == key:
+                plans = [ProfilePlan.from_json(plan) for plan in cached["plans"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    if plans is not None:
+        # Expand every bound value set up front so it is persisted for the next run
+        for plan in plans:
+            for binding in plan.bindings:
+                terminology.expand(binding[3])
+        terminology.save()
+        return ProfileSet(plans, terminology)
+
+    plans = ProfileCompiler(resources, terminology).compile_all()
+    terminology.save()
+    if cache_path:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"fingerprint": key, "plans": [plan.to_json() for plan in plans]}, f)
+        os.replace(tmp_path, cache_path)
+    return ProfileSet(plans, terminology)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Streaming readers for FHIR resources
+
+Reads single-resource JSON files, FHIR Bulk Data NDJSON exports and Bundles
+one resource at a time, so multi-GB exports never have to fit in memory.
+Every resource is reported with its source: ``file.ndjson:12`` for NDJSON
+lines and ``bundle.json#entry[3]`` for Bundle entries.
+"""
+
+import json
+import re
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+CHUNK_SIZE = 64 * 1024
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+RESOURCE_EXTENSIONS = (".json",) + NDJSON_EXTENSIONS
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# (source, resource, error): exactly one of resource and error is set
+Record = Tuple[str, Optional[Any], Optional[str]]
+
+class JsonStream:
+    """Incremental JSON reader over a text file
+
+    Values are handed to the C scanner with ``raw_decode``; when a value runs
+    past the buffered text the read size doubles on every retry, so even a
+    large value is decoded in linear time. Consumed text is dropped on every
+    read, so memory is bounded by the largest single value.
+    """
+
+    def __init__(self, f, chunk_size: int = CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.consumed = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def error(self, message: str, pos: int) -> ValueError:
+        """Parse error with its offset in the whole document"""
+        return ValueError(f"{message} at char {self.consumed + pos}")
+
+    def _fill(self, size: Optional[int] = None):
+        if self.eof:
+            raise self.error("Unexpected end of JSON document", len(self.buffer))
+        chunk = self.f.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+        self.consumed += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+
+    def peek(self) -> str:
+        """Next non-whitespace character"""
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            self._fill()
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if char not in chars:
+            raise self.error(f"Expected one of {chars!r}", self.pos)
+        self.pos += 1
+        return char
+
+    def decode(self) -> Any:
+        """Decode one complete value at the current position"""
+        size = self.chunk_size
+        while True:
+            self.peek()
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise self.error(e.msg, e.pos) from None
+                self._fill(size)
+                size *= 2
+                continue
+            # A number may continue in the next chunk
+            if end == len(self.buffer) and not self.eof:
+                self._fill(size)
+                continue
+            self.pos = end
+            return value
+
+    def items(self) -> Iterator[Tuple[str, "JsonStream"]]:
+        """Walk the keys of an object; the caller must consume each value"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.decode()
+            self.expect(':')
+            yield key, self
+            if self.expect(',}') == '}':
+                return
+
+    def elements(self) -> Iterator[Any]:
+        """Decode the elements of an array one at a time"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.decode()
+            if self.expect(',]') == ']':
+                return
+
+def _bundle_records(source: str, entries) -> Iterator[Record]:
+    for index, entry in entries:
+        resource = entry.get("resource") if isinstance(entry, dict) else None
+        if resource is not None:
+            yield f"{source}#entry[{index}]", resource, None
+
+def read_json(f, source: str) -> Iterator[Record]:
+    """Yield a single resource, or each ``entry[].resource`` of a Bundle
+
+    Bundle entries are parsed one at a time as they are read. An ``entry``
+    key that appears before ``resourceType`` can't be known to belong to a
+    Bundle yet, so it is decoded whole and split afterwards.
+    """
+    stream = JsonStream(f)
+    if stream.peek() != '{':
+        yield source, stream.decode(), None
+        return
+
+    resource: Dict[str, Any] = {}
+    streamed = False
+    for key, value in stream.items():
+        if key == "entry" and resource.get("resourceType") == "Bundle" and stream.peek() == '[':
+            yield from _bundle_records(source, enumerate(value.elements()))
+            streamed = True
+        else:
+            resource[key] = value.decode()
+
+    if streamed:
+        return
+    if resource.get("resourceType") == "Bundle" and isinstance(resource.get("entry"), list):
+        yield from _bundle_records(source, enumerate(resource["entry"]))
+    else:
+        yield source, resource, None
+
+def read_ndjson(f, source: str, first_line: int = 1, line_count: Optional[int] = None) -> Iterator[Record]:
+    """Yield one resource per line of a binary file; blank lines are skipped but still counted"""
+    lines = f if line_count is None else islice(f, line_count)
+    for line_no, line in enumerate(lines, first_line):
+        if not line.strip():
+            continue
+        try:
+            yield f"{source}:{line_no}", json.loads(line), None
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            yield f"{source}:{line_no}", None, f"Invalid JSON - {e}"
+
+def is_ndjson(path: str) -> bool:
+    return str(path).endswith(NDJSON_EXTENSIONS)
+
+def find_resource_files(directory: str) -> Iterator[Path]:
+    """Lazily find every JSON and NDJSON file under a directory"""
+    for path in Path(directory).rglob("*"):
+        if path.suffix in RESOURCE_EXTENSIONS and path.is_file():
+            yield path
+
+def read_resources(path: str, offset: int = 0, first_line: int = 1,
+                   line_count: Optional[int] = None) -> Iterator[Record]:
+    """Stream every resource in a file; NDJSON can be read from a line offset"""
+    path = str(path)
+    try:
+        if is_ndjson(path):
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                yield from read_ndjson(f, path, first_line, line_count)
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                yield from read_json(f, path)
+    except UnicodeDecodeError as e:
+        yield path, None, str(e)
+    except ValueError as e:
+        yield path, None, f"Invalid JSON - {e}"
+    except OSError as e:
+        yield path, None, str(e)
+
+def ndjson_segments(path: str, lines_per_segment: int) -> Iterator[Tuple[int, int, int]]:
+    """Split an NDJSON file into (byte offset, first line, line count) segments"""
+    offset = 0
+    start_offset = 0
+    first_line = 1
+    count = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            count += 1
+            offset += len(line)
+            if count == lines_per_segment:
+                yield start_offset, first_line, count
+                start_offset = offset
+                first_line += count
+                count = 0
+    if count:
+        yield start_offset, first_line, count
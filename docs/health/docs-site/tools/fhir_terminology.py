@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Local terminology service for ZARISH HIS
+
+Expands the ValueSets shipped with the implementation guide - including
+``compose.include`` filters, value set imports and excludes - into hashed
+membership sets over the shipped CodeSystems, so a ``$validate-code`` style
+check is a set lookup per coding. Expansions are kept in an LRU cache and
+persisted to disk next to a fingerprint of their sources.
+"""
+
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Set
+
+CACHE_VERSION = 1
+CONFORMANCE_TYPES = ("StructureDefinition", "ValueSet", "CodeSystem")
+DEFAULT_CACHE = Path(__file__).resolve().parent.parent / ".cache" / "fhir-terminology.json"
+
+def load_conformance(directory: str) -> List[Dict[str, Any]]:
+    """StructureDefinitions, ValueSets and CodeSystems at the top level of a directory"""
+    resources = []
+    for path in sorted(Path(directory).glob("*.json")):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                resource = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if isinstance(resource, dict) and resource.get("resourceType") in CONFORMANCE_TYPES:
+            resources.append(resource)
+    return resources
+
+def fingerprint(directory: str, version: int) -> str:
+    """Hash of a format version and the name, size and mtime of every source file"""
+    digest = hashlib.sha256(f"v{version}".encode())
+    for path in sorted(Path(directory).glob("*.json")):
+        stat = path.stat()
+        digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+def canonical(url: str) -> str:
+    """Drop a ``|version`` suffix from a canonical URL"""
+    return url.split("|")[0]
+
+def compile_filter(value: str) -> Optional["re.Pattern"]:
+    """A regex filter value compiled, or None if Python can't compile it"""
+    try:
+        return re.compile(value)
+    except re.error:
+        return None
+
+class Expansion:
+    """Membership sets of an expanded ValueSet"""
+
+    __slots__ = ("url", "codes", "bare_codes")
+
+    def __init__(self, url: str, codes: Set[str]):
+        self.url = url
+        # "system|code" for codings with a system, bare codes for plain ``code`` values
+        self.codes: FrozenSet[str] = frozenset(codes)
+        self.bare_codes: FrozenSet[str] = frozenset(code.split("|", 1)[1] for code in codes)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def contains(self, system: Optional[str], code: Any) -> bool:
+        if not isinstance(code, str):
+            return False
+        if system is None:
+            return code in self.bare_codes
+        return f"{system}|{code}" in self.codes
+
+class CodeSystemIndex:
+    """Codes, hierarchy and properties of one CodeSystem, for filter evaluation
+
+    A CodeSystem with malformed concepts is treated as incomplete, so value
+    sets drawing on it are left to a full terminology server.
+    """
+
+    def __init__(self, codesystem: Dict[str, Any]):
+        self.url = codesystem.get("url")
+        self.complete = codesystem.get("content", "complete") == "complete"
+        self.codes: List[str] = []
+        self.children: Dict[str, List[str]] = {}
+        self.properties: Dict[str, Dict[str, List[Any]]] = {}
+        self._add(codesystem.get("concept", []), None)
+
+    def _add(self, concepts: Any, parent: Optional[str]):
+        if not isinstance(concepts, list):
+            self.complete = False
+            return
+        for concept in concepts:
+            if not isinstance(concept, dict) or not isinstance(concept.get("code"), str):
+                self.complete = False
+                continue
+            code = concept["code"]
+            self.codes.append(code)
+            properties = self.properties.setdefault(code, {})
+            props = concept.get("property", [])
+            if not isinstance(props, list):
+                self.complete = False
+                props = []
+            for prop in props:
+                if not isinstance(prop, dict) or not isinstance(prop.get("code"), str):
+                    self.complete = False
+                    continue
+                value = next((v for k, v in prop.items() if k.startswith("value")), None)
+                properties.setdefault(prop["code"], []).append(value)
+                if prop["code"] in ("parent", "subsumedBy") and isinstance(value, str):
+                    self.children.setdefault(value, []).append(code)
+            if parent is not None:
+                self.children.setdefault(parent, []).append(code)
+            self._add(concept.get("concept", []), code)
+
+    def descendants(self, code: str) -> Set[str]:
+        found: Set[str] = set()
+        stack = list(self.children.get(code, []))
+        while stack:
+            child = stack.pop()
+            if child not in found:
+                found.add(child)
+                stack.extend(self.children.get(child, []))
+        return found
+
+    def filter(self, prop: str, op: str, value: str) -> Optional[Set[str]]:
+        """Codes matching one ``compose.include.filter``; None for unsupported filters"""
+        if not isinstance(prop, str):
+            return None
+        if prop in ("concept", "code"):
+            if op == "is-a":
+                return {value} | self.descendants(value) if value in self.properties else set()
+            if op == "descendent-of":
+                return self.descendants(value)
+            if op == "is-not-a":
+                return set(self.codes) - {value} - self.descendants(value)
+            if op == "=":
+                return {value} if value in self.properties else set()
+            if op == "in":
+                return {code.strip() for code in value.split(",")} & set(self.codes)
+            if op == "not-in":
+                return set(self.codes) - {code.strip() for code in value.split(",")}
+            if op == "regex":
+                pattern = compile_filter(value)
+                if pattern is None:
+                    return None
+                return {code for code in self.codes if pattern.fullmatch(code)}
+            return None
+
+        values = {code: self.properties[code].get(prop) for code in self.codes}
+        if op == "exists":
+            wanted = value == "true"
+            return {code for code, found in values.items() if (found is not None) == wanted}
+        if op == "=":
+            return {code for code, found in values.items() if found and any(str(v) == value for v in found)}
+        if op == "in":
+            options = {option.strip() for option in value.split(",")}
+            return {code for code, found in values.items() if found and any(str(v) in options for v in found)}
+        if op == "regex":
+            pattern = compile_filter(value)
+            if pattern is None:
+                return None
+            return {code for code, found in values.items() if found and any(pattern.fullmatch(str(v)) for v in found)}
+        return None
+
+class TerminologyService:
+    """Expands ValueSets and validates codes against them and the shipped CodeSystems"""
+
+    def __init__(self, resources: List[Dict[str, Any]], cache_path: Optional[str] = None,
+                 cache_key: Optional[str] = None, cache_size: int = 128):
+        self.valuesets = {canonical(r["url"]): r for r in resources
+                          if r.get("resourceType") == "ValueSet" and isinstance(r.get("url"), str)}
+        self.codesystems = {r["url"]: CodeSystemIndex(r) for r in resources
+                            if r.get("resourceType") == "CodeSystem" and isinstance(r.get("url"), str)}
+        self.cache_path = cache_path
+        self.cache_key = cache_key
+        self.cache_size = cache_size
+        self._stored: Dict[str, Optional[List[str]]] = {}
+        self._dirty = False
+        self._load_cache()
+        self._cached_expand = lru_cache(maxsize=cache_size)(self._expand)
+
+    def __getstate__(self):
+        # The LRU wrapper can't be pickled; worker processes rebuild their own
+        state = self.__dict__.copy()
+        del state["_cached_expand"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cached_expand = lru_cache(maxsize=self.cache_size)(self._expand)
+
+    @classmethod
+    def from_directory(cls, directory: str, cache_path: Optional[str] = DEFAULT_CACHE,
+                       resources: Optional[List[Dict[str, Any]]] = None) -> "TerminologyService":
+        """Service over a directory's conformance resources, persisted under its fingerprint"""
+        if resources is None:
+            resources = load_conformance(directory)
+        key = fingerprint(directory, CACHE_VERSION) if cache_path else None
+        return cls(resources, cache_path, key)
+
+    def _load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(cached, dict) and cached.get("fingerprint") == self.cache_key:
+            self._stored = cached.get("expansions", {})
+
+    def save(self):
+        """Persist every expansion computed so far"""
+        if not self.cache_path or not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"fingerprint": self.cache_key, "expansions": self._stored}, f)
+        os.replace(tmp_path, self.cache_path)
+        self._dirty = False
+
+    def expand(self, url: Any) -> Optional[Expansion]:
+        """Expansion of a ValueSet, or None if it can't be expanded from local resources"""
+        if not isinstance(url, str):
+            return None
+        return self._cached_expand(url)
+
+    def _expand(self, url: str) -> Optional[Expansion]:
+        """Uncached ``expand``; computed expansions are also kept for ``save``"""
+        url = canonical(url)
+        if url not in self._stored:
+            codes = self._compute(url, ())
+            self._stored[url] = sorted(codes) if codes is not None else None
+            self._dirty = True
+        codes = self._stored[url]
+        return Expansion(url, set(codes)) if codes is not None else None
+
+    def _compute(self, url: str, visiting: tuple) -> Optional[Set[str]]:
+        valueset = self.valuesets.get(url)
+        if valueset is None or url in visiting:
+            return None
+        visiting += (url,)
+
+        # Anything malformed below means the ValueSet can't be expanded locally
+        compose = valueset.get("compose")
+        if not compose:
+            expansion = valueset.get("expansion")
+            contains = expansion.get("contains") if isinstance(expansion, dict) else None
+            if not isinstance(contains, list):
+                return None
+            codes = set()
+            return codes if self._contains_codes(contains, codes) else None
+        if not isinstance(compose, dict):
+            return None
+
+        includes = compose.get("include", [])
+        excludes = compose.get("exclude", [])
+        if not isinstance(includes, list) or not isinstance(excludes, list):
+            return None
+        codes: Set[str] = set()
+        for include in includes:
+            included = self._include(include, visiting)
+            if included is None:
+                return None
+            codes |= included
+        for exclude in excludes:
+            excluded = self._include(exclude, visiting)
+            if excluded is None:
+                return None
+            codes -= excluded
+        return codes
+
+    def _contains_codes(self, contains: List[Dict[str, Any]], codes: Set[str]) -> bool:
+        """Collect the codes of an expansion's ``contains`` tree; False if it is malformed"""
+        for entry in contains:
+            if not isinstance(entry, dict):
+                return False
+            if "code" in entry:
+                if not isinstance(entry["code"], str):
+                    return False
+                codes.add(f"{entry.get('system')}|{entry['code']}")
+            children = entry.get("contains", [])
+            if not isinstance(children, list) or not self._contains_codes(children, codes):
+                return False
+        return True
+
+    def _include(self, include: Any, visiting: tuple) -> Optional[Set[str]]:
+        """Codes selected by one compose.include (or exclude) entry; None if it can't be evaluated"""
+        if not isinstance(include, dict):
+            return None
+        system = include.get("system")
+        selected: Optional[Set[str]] = None
+
+        if system is not None:
+            if not isinstance(system, str):
+                return None
+            concepts = include.get("concept")
+            if concepts:
+                if not isinstance(concepts, list) or not all(
+                        isinstance(concept, dict) and isinstance(concept.get("code"), str) for concept in concepts):
+                    return None
+                selected = {f"{system}|{concept['code']}" for concept in concepts}
+            else:
+                codesystem = self.codesystems.get(system)
+                if codesystem is None or not codesystem.complete:
+                    return None
+                filters = include.get("filter", [])
+                if not isinstance(filters, list):
+                    return None
+                codes = set(codesystem.codes)
+                for rule in filters:
+                    if not isinstance(rule, dict):
+                        return None
+                    matched = codesystem.filter(rule.get("property"), rule.get("op"), str(rule.get("value")))
+                    if matched is None:
+                        return None
+                    codes &= matched
+                selected = {f"{system}|{code}" for code in codes}
+
+        # Imported value sets intersect with each other and with the system selection
+        imports = include.get("valueSet", [])
+        if not isinstance(imports, list) or not all(isinstance(imported, str) for imported in imports):
+            return None
+        for imported in imports:
+            codes = self._compute(canonical(imported), visiting)
+            if codes is None:
+                return None
+            selected = codes if selected is None else selected & codes
+        return selected if selected is not None else set()
+
+    def validate_code(self, valueset: str, system: Optional[str], code: Any) -> Optional[bool]:
+        """``$validate-code`` against a ValueSet; None if the ValueSet can't be expanded"""
+        expansion = self.expand(valueset)
+        return expansion.contains(system, code) if expansion is not None else None
+
+    def known_code(self, system: Optional[str], code: Any) -> Optional[bool]:
+        """Whether a code exists in a shipped, complete CodeSystem; None if the system isn't known"""
+        codesystem = self.codesystems.get(system) if isinstance(system, str) else None
+        if codesystem is None or not codesystem.complete:
+            return None
+        return code in codesystem.properties if isinstance(code, str) else False
+
+    def check_codings(self, value: Any, errors: List[str], prefix: str):
+        """Flag every Coding in ``value`` whose code is missing from its shipped CodeSystem"""
+        if isinstance(value, list):
+            for item in value:
+                self.check_codings(item, errors, prefix)
+        elif isinstance(value, dict):
+            system = value.get("system")
+            if "code" in value and isinstance(system, str) and system in self.codesystems:
+                if self.known_code(system, value["code"]) is False:
+                    errors.append(f"{prefix}: Unknown code '{value['code']}' in code system {system}")
+            for child in value.values():
+                if isinstance(child, (list, dict)):
+                    self.check_codings(child, errors, prefix)
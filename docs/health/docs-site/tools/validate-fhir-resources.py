@@ -7,8 +7,11 @@ ensuring compliance with Bangladesh healthcare context and standards.
 
 Usage:
     python validate-fhir-resources.py --file <path-to-fhir-resource>
-    python validate-fhir-resources.py --directory <path-to-fhir-resources>
+    python validate-fhir-resources.py --directory <path-to-fhir-resources> [--jobs N]
     python validate-fhir-resources.py --help
+
+Files may hold a single resource, a Bundle (every entry's resource is
+validated) or Bulk Data NDJSON (.ndjson, one resource per line).
 """
 
 import json
@@ -16,10 +19,15 @@ import sys
 import os
 import argparse
 import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple, Union
 import re
 
+from fhir_profiles import DEFAULT_PROFILES_DIR, ProfileSet, load_profiles
+from fhir_stream import find_resource_files, is_ndjson, ndjson_segments, read_resources
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,12 +35,191 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class ValidationResult:
+    """Immutable outcome of validating one resource"""
+
+    __slots__ = ("source", "resource_type", "errors", "warnings")
+
+    def __init__(self, source: str, resource_type: Optional[str],
+                 errors: Tuple[str, ...] = (), warnings: Tuple[str, ...] = ()):
+        object.__setattr__(self, "source", source)
+        object.__setattr__(self, "resource_type", resource_type)
+        object.__setattr__(self, "errors", tuple(errors))
+        object.__setattr__(self, "warnings", tuple(warnings))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        # Rebuild through __init__ so results can cross process boundaries
+        return (ValidationResult, (self.source, self.resource_type, self.errors, self.warnings))
+
+    def __repr__(self):
+        return (f"ValidationResult({self.source!r}, {self.resource_type!r}, "
+                f"errors={len(self.errors)}, warnings={len(self.warnings)})")
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+    def report(self) -> str:
+        """Errors and warnings of this resource, in the validator's report format"""
+        return format_report(self.errors, self.warnings)
+
+class ValidationSummary:
+    """Running totals over a stream of results, in constant memory"""
+
+    def __init__(self):
+        self.total = 0
+        self.passed = 0
+        self.errors = 0
+        self.warnings = 0
+        self.by_type: Dict[str, int] = {}
+
+    def add(self, result: ValidationResult):
+        self.total += 1
+        self.passed += result.valid
+        self.errors += len(result.errors)
+        self.warnings += len(result.warnings)
+        resource_type = result.resource_type or "unknown"
+        self.by_type[resource_type] = self.by_type.get(resource_type, 0) + 1
+
+    @property
+    def failed(self) -> int:
+        return self.total - self.passed
+
+    @property
+    def success_rate(self) -> float:
+        return (self.passed / self.total) * 100 if self.total else 100.0
+
+def format_report(errors: Iterable[str], warnings: Iterable[str]) -> str:
+    """Render errors and warnings as a validation report"""
+    errors, warnings = list(errors), list(warnings)
+    report = []
+    
+    if errors:
+        report.append("❌ ERRORS:")
+        for error in errors:
+            report.append(f"  - {error}")
+    
+    if warnings:
+        report.append("⚠️  WARNINGS:")
+        for warning in warnings:
+            report.append(f"  - {warning}")
+    
+    if not errors and not warnings:
+        report.append("✅ Validation passed successfully!")
+    
+    return "\n".join(report)
+
+# Identifier formats by nationality code:
+# ({identifier type: (pattern, error message)}, warning when none is present)
+IDENTIFIER_RULES = {
+    "BD": ({"NID": (re.compile(r"^\d{13}$"), "Patient: Invalid NID format '{}' (must be 13 digits)")},
+           "Patient: Bangladeshi citizen should have NID identifier"),
+    "ROH": ({"PROGRESS_ID": (re.compile(r"^PROG\d{9}$"), "Patient: Invalid ProGress ID format '{}'"),
+             "MRC": (re.compile(r"^MRC\d{9}$"), "Patient: Invalid MRC format '{}'"),
+             "FCN": (re.compile(r"^FCN-[A-Z]{3}-BLOCK-[A-Z]-\d{3}$"), "Patient: Invalid FCN format '{}'")},
+            "Patient: Rohingya refugee should have at least one refugee identifier"),
+}
+
+ADMIN_BOUNDARY_PATTERN = re.compile(r"^BD\.\d+(\.\d+(\.\d+(\.\d+)?)?)?$")
+
+# Resource-specific checks, by FHIRValidator method name
+RESOURCE_CHECKS = {
+    "Patient": "_validate_patient",
+    "Practitioner": "_validate_practitioner",
+    "Encounter": "_validate_encounter",
+    "Observation": "_validate_observation",
+    "MedicationRequest": "_validate_medication_request",
+    "Procedure": "_validate_procedure",
+    "Appointment": "_validate_appointment",
+    "DiagnosticReport": "_validate_diagnostic_report"
+}
+
+# ZARISH rules that the StructureDefinitions can't express; they run after a compiled profile
+PROFILE_EXTRA_CHECKS = {
+    "Patient": "_validate_patient_nationality"
+}
+
+NO_CODE = object()
+
+def is_member(value: Any, codes) -> bool:
+    """Set membership that treats non-string values (including unhashable ones) as absent"""
+    return isinstance(value, str) and value in codes
+
+def json_objects(value: Any) -> List[Dict[str, Any]]:
+    """The objects of a JSON array, skipping other items; empty if ``value`` isn't an array"""
+    if not isinstance(value, list):
+        return []
+    return [item for item in value if isinstance(item, dict)]
+
+def first_coding(concept: Any) -> Optional[Dict[str, Any]]:
+    """First coding of a CodeableConcept, or None if it has none or is malformed"""
+    if not isinstance(concept, dict):
+        return None
+    coding = concept.get("coding")
+    if not isinstance(coding, list) or not coding or not isinstance(coding[0], dict):
+        return None
+    return coding[0]
+
+def first_code(concept: Any) -> Any:
+    """Code of the first coding of a CodeableConcept, or NO_CODE if it has none"""
+    coding = first_coding(concept)
+    return coding.get("code") if coding is not None else NO_CODE
+
+class RulePlan:
+    """Precompiled rules for one resource type
+
+    Built once from a ``zarish_profiles`` entry: code lists become frozensets,
+    ``*_pattern`` strings become compiled regexes and the required extension
+    markers are folded into a single regex, so a resource's extension list
+    is scanned once however many rules look at it.
+    """
+
+    __slots__ = ("resource_type", "required_fields", "required_extensions", "codes",
+                 "patterns", "extension_pattern", "check")
+
+    def __init__(self, resource_type: str, profile: Dict[str, Any], check=None):
+        self.resource_type = resource_type
+        self.required_fields = tuple(profile.get("required_fields", ()))
+        self.required_extensions = tuple(profile.get("required_extensions", ()))
+        self.codes = {key: frozenset(values) for key, values in profile.items()
+                      if isinstance(values, list) and key not in ("required_fields", "required_extensions")}
+        self.patterns = {key: re.compile(value) for key, value in profile.items() if key.endswith("_pattern")}
+        markers = sorted(self.required_extensions, key=len, reverse=True)
+        self.extension_pattern = re.compile("|".join(map(re.escape, markers))) if markers else None
+        self.check = check
+
+    def index_extensions(self, extensions: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Map each extension marker to the first extension whose URL contains it"""
+        index: Dict[str, Dict[str, Any]] = {}
+        if self.extension_pattern is None:
+            return index
+        search = self.extension_pattern.search
+        for ext in json_objects(extensions):
+            url = ext.get("url")
+            if not isinstance(url, str):
+                continue
+            match = search(url)
+            if match and match.group() not in index:
+                index[match.group()] = ext
+        return index
+
 class FHIRValidator:
-    """FHIR Resource Validator for ZARISH HIS"""
+    """FHIR Resource Validator for ZARISH HIS
     
-    def __init__(self):
+    With ``profiles``, resources whose type has a compiled StructureDefinition
+    are validated against it; the hardcoded ``zarish_profiles`` rules remain
+    for the resource types the implementation guide doesn't profile.
+    Profiled resources also have every coding checked against the shipped
+    CodeSystems through the profiles' terminology service.
+    """
+    
+    def __init__(self, profiles: Optional[ProfileSet] = None):
         self.errors = []
         self.warnings = []
+        self.profiles = profiles
         
         # ZARISH HIS specific validation rules
         self.zarish_profiles = {
@@ -83,166 +270,176 @@ class FHIRValidator:
                 "category_codes": ["LAB", "RAD", "PATH", "MICRO"]
             }
         }
+        
+        self.plans = self.compile_profiles()
+    
+    def compile_profiles(self) -> Dict[str, RulePlan]:
+        """Compile ``zarish_profiles`` into a rule plan per resource type"""
+        plans = {}
+        for resource_type, profile in self.zarish_profiles.items():
+            check = RESOURCE_CHECKS.get(resource_type)
+            plans[resource_type] = RulePlan(resource_type, profile, getattr(type(self), check) if check else None)
+        return plans
+    
+    def validate(self, resource: Dict[str, Any], source: str = "") -> ValidationResult:
+        """Validate a single FHIR resource and return its own result
+        
+        ``errors`` and ``warnings`` are reset for every resource, so they
+        always describe the most recently validated one.
+        """
+        self.errors = []
+        self.warnings = []
+        resource_type = resource.get("resourceType") if isinstance(resource, dict) else None
+        
+        if not isinstance(resource, dict):
+            self.errors.append("Resource is not a JSON object")
+        else:
+            self._check_resource(resource)
+        
+        return ValidationResult(source, resource_type, self.errors, self.warnings)
     
     def validate_resource(self, resource: Dict[str, Any]) -> bool:
         """Validate a single FHIR resource"""
+        return self.validate(resource).valid
+    
+    def validate_records(self, records) -> Iterator[ValidationResult]:
+        """Validate (source, resource, error) records from the streaming readers"""
+        for source, resource, error in records:
+            if error is not None:
+                yield ValidationResult(source, None, (error,))
+                continue
+            try:
+                yield self.validate(resource, source)
+            except Exception as e:
+                # One malformed resource must not abort the rest of the run; keep
+                # what was found before the failure and report the failure with it
+                resource_type = resource.get("resourceType") if isinstance(resource, dict) else None
+                self.errors.append(f"Validation error: {e}")
+                yield ValidationResult(source, resource_type, self.errors, self.warnings)
+    
+    def validate_files(self, paths: Iterable[Path]) -> Iterator[ValidationResult]:
+        """Validate every resource in the given files, yielding each result as it is produced
+        
+        A file may hold one resource, a Bundle (each ``entry[].resource`` is
+        validated) or NDJSON (one resource per line); all three are streamed.
+        """
+        for path in paths:
+            yield from self.validate_records(read_resources(path))
+    
+    def _check_resource(self, resource: Dict[str, Any]):
+        """Run every rule that applies to the resource"""
         resource_type = resource.get("resourceType")
         
         if not resource_type:
             self.errors.append("Missing resourceType")
-            return False
+            return
+        
+        profile = self.profiles.for_resource(resource) if self.profiles is not None else None
+        if profile is not None:
+            terminology = self.profiles.terminology
+            profile.check(resource, self.errors, self.warnings, resource_type, terminology)
+            self.profiles.check_extensions(resource, self.errors, self.warnings, resource_type)
+            if terminology is not None:
+                terminology.check_codings(resource, self.errors, resource_type)
+            extra_check = PROFILE_EXTRA_CHECKS.get(resource_type)
+            if extra_check:
+                getattr(self, extra_check)(resource)
+            return
         
-        if resource_type not in self.zarish_profiles:
+        plan = self.plans.get(resource_type)
+        if plan is None:
             self.warnings.append(f"Unknown resource type: {resource_type}")
-            return True
-        
-        profile = self.zarish_profiles[resource_type]
-        
-        # Validate required fields
-        self._validate_required_fields(resource, profile, resource_type)
-        
-        # Validate extensions based on resource type
-        self._validate_extensions(resource, profile, resource_type)
-        
-        # Resource-specific validations
-        if resource_type == "Patient":
-            self._validate_patient(resource)
-        elif resource_type == "Practitioner":
-            self._validate_practitioner(resource)
-        elif resource_type == "Encounter":
-            self._validate_encounter(resource)
-        elif resource_type == "Observation":
-            self._validate_observation(resource)
-        elif resource_type == "MedicationRequest":
-            self._validate_medication_request(resource)
-        elif resource_type == "Procedure":
-            self._validate_procedure(resource)
-        elif resource_type == "Appointment":
-            self._validate_appointment(resource)
-        elif resource_type == "DiagnosticReport":
-            self._validate_diagnostic_report(resource)
-        
-        return len(self.errors) == 0
-    
-    def _validate_required_fields(self, resource: Dict[str, Any], profile: Dict[str, Any], resource_type: str):
-        """Validate required fields for a resource"""
-        required_fields = profile.get("required_fields", [])
-        
-        for field in required_fields:
+            return
+        
+        for field in plan.required_fields:
             if field not in resource:
                 self.errors.append(f"{resource_type}: Missing required field '{field}'")
-    
-    def _validate_extensions(self, resource: Dict[str, Any], profile: Dict[str, Any], resource_type: str):
-        """Validate required extensions for a resource"""
-        required_extensions = profile.get("required_extensions", [])
-        extensions = resource.get("extension", [])
         
-        extension_urls = [ext.get("url", "") for ext in extensions]
+        if not isinstance(resource.get("extension", []), list):
+            self.errors.append(f"{resource_type}: 'extension' must be an array")
         
-        for required_ext in required_extensions:
-            if not any(required_ext in url for url in extension_urls):
+        # One pass over the extension list serves every extension rule below
+        extensions = plan.index_extensions(resource.get("extension", []))
+        for required_ext in plan.required_extensions:
+            if required_ext not in extensions:
                 self.errors.append(f"{resource_type}: Missing required extension '{required_ext}'")
+        
+        if plan.check is not None:
+            plan.check(self, resource, plan, extensions)
     
-    def _validate_patient(self, resource: Dict[str, Any]):
+    def _validate_patient(self, resource: Dict[str, Any], plan: RulePlan, extensions: Dict[str, Dict]):
         """Validate Patient resource with ZARISH extensions"""
-        profile = self.zarish_profiles["Patient"]
-        
-        # Validate nationality extension
-        extensions = resource.get("extension", [])
-        nationality_ext = None
-        
-        for ext in extensions:
-            if "patient-nationality" in ext.get("url", ""):
-                nationality_ext = ext
-                break
-        
+        nationality_ext = extensions.get("patient-nationality")
         if not nationality_ext:
             self.errors.append("Patient: Missing patient-nationality extension")
             return
         
-        nationality_value = nationality_ext.get("valueCodeableConcept", {})
-        nationality_coding = nationality_value.get("coding", [])
-        
-        if not nationality_coding:
+        nationality_coding = first_coding(nationality_ext.get("valueCodeableConcept"))
+        if nationality_coding is None:
             self.errors.append("Patient: Invalid nationality extension format")
             return
         
-        nationality_code = nationality_coding[0].get("code")
-        if nationality_code not in profile["nationality_codes"]:
+        nationality_code = nationality_coding.get("code")
+        if not is_member(nationality_code, plan.codes["nationality_codes"]):
             self.errors.append(f"Patient: Invalid nationality code '{nationality_code}'")
         
-        # Validate identifiers based on nationality
-        identifiers = resource.get("identifier", [])
-        
-        if nationality_code == "BD":
-            self._validate_bangladeshi_identifiers(identifiers)
-        elif nationality_code == "ROH":
-            self._validate_rohingya_identifiers(identifiers)
+        self._validate_nationality_rules(resource, nationality_code)
+    
+    def _validate_patient_nationality(self, resource: Dict[str, Any]):
+        """Apply the nationality rules to a profiled Patient, if it states a nationality"""
+        for ext in json_objects(resource.get("extension")):
+            url = ext.get("url")
+            if isinstance(url, str) and "patient-nationality" in url:
+                code = ext.get("valueCode")
+                if code is None:
+                    code = first_code(ext.get("valueCodeableConcept"))
+                self._validate_nationality_rules(resource, code)
+                return
+    
+    def _validate_nationality_rules(self, resource: Dict[str, Any], nationality_code: Any):
+        """Identifier and address rules that depend on the patient's nationality"""
+        if is_member(nationality_code, IDENTIFIER_RULES):
+            self._validate_identifiers(resource.get("identifier", []), *IDENTIFIER_RULES[nationality_code])
         
-        # Validate address based on nationality
         addresses = resource.get("address", [])
-        if addresses:
-            if nationality_code == "BD":
+        if isinstance(addresses, list) and addresses:
+            if not isinstance(addresses[0], dict):
+                self.errors.append("Patient: Invalid address format")
+            elif nationality_code == "BD":
                 self._validate_bangladeshi_address(addresses[0])
             elif nationality_code == "ROH":
                 self._validate_rohingya_address(addresses[0])
     
-    def _validate_bangladeshi_identifiers(self, identifiers: List[Dict[str, Any]]):
-        """Validate Bangladeshi patient identifiers"""
-        has_nid = False
-        
-        for identifier in identifiers:
-            identifier_type = identifier.get("type", {})
-            coding = identifier_type.get("coding", [])
+    def _validate_identifiers(self, identifiers: List[Dict[str, Any]], formats: Dict[str, Tuple[Any, str]],
+                              missing_warning: str):
+        """Check identifier values against their type's format in one pass"""
+        found = False
+        
+        for identifier in json_objects(identifiers):
+            coding = first_coding(identifier.get("type"))
+            if coding is None:
+                continue
+            code = coding.get("code")
+            if not is_member(code, formats):
+                continue
             
-            if coding and coding[0].get("code") == "NID":
-                nid_value = identifier.get("value", "")
-                if not re.match(r"^\d{13}$", nid_value):
-                    self.errors.append(f"Patient: Invalid NID format '{nid_value}' (must be 13 digits)")
-                has_nid = True
-        
-        if not has_nid:
-            self.warnings.append("Patient: Bangladeshi citizen should have NID identifier")
-    
-    def _validate_rohingya_identifiers(self, identifiers: List[Dict[str, Any]]):
-        """Validate Rohingya refugee identifiers"""
-        has_progress_id = False
-        has_mrc = False
-        has_fcn = False
-        
-        for identifier in identifiers:
-            identifier_type = identifier.get("type", {})
-            coding = identifier_type.get("coding", [])
-            
-            if coding:
-                code = coding[0].get("code")
-                value = identifier.get("value", "")
-                
-                if code == "PROGRESS_ID":
-                    if not re.match(r"^PROG\d{9}$", value):
-                        self.errors.append(f"Patient: Invalid ProGress ID format '{value}'")
-                    has_progress_id = True
-                elif code == "MRC":
-                    if not re.match(r"^MRC\d{9}$", value):
-                        self.errors.append(f"Patient: Invalid MRC format '{value}'")
-                    has_mrc = True
-                elif code == "FCN":
-                    if not re.match(r"^FCN-[A-Z]{3}-BLOCK-[A-Z]-\d{3}$", value):
-                        self.errors.append(f"Patient: Invalid FCN format '{value}'")
-                    has_fcn = True
-        
-        if not (has_progress_id or has_mrc or has_fcn):
-            self.warnings.append("Patient: Rohingya refugee should have at least one refugee identifier")
+            pattern, message = formats[code]
+            value = identifier.get("value", "")
+            if not isinstance(value, str) or not pattern.match(value):
+                self.errors.append(message.format(value))
+            found = True
+        
+        if not found:
+            self.warnings.append(missing_warning)
     
     def _validate_bangladeshi_address(self, address: Dict[str, Any]):
         """Validate Bangladeshi address format"""
-        extensions = address.get("extension", [])
-        
         has_admin_boundary = False
-        for ext in extensions:
-            if "administrative-boundaries" in ext.get("url", ""):
+        for ext in json_objects(address.get("extension")):
+            url = ext.get("url")
+            if isinstance(url, str) and "administrative-boundaries" in url:
                 boundary_value = ext.get("valueString", "")
-                if not re.match(r"^BD\.\d+(\.\d+(\.\d+(\.\d+)?)?)?$", boundary_value):
+                if not isinstance(boundary_value, str) or not ADMIN_BOUNDARY_PATTERN.match(boundary_value):
                     self.errors.append(f"Address: Invalid administrative boundary format '{boundary_value}'")
                 has_admin_boundary = True
         
@@ -251,38 +448,20 @@ class FHIRValidator:
     
     def _validate_rohingya_address(self, address: Dict[str, Any]):
         """Validate Rohingya camp address format"""
-        extensions = address.get("extension", [])
-        
-        has_camp_info = False
-        for ext in extensions:
-            if "camp-information" in ext.get("url", ""):
-                has_camp_info = True
-        
-        if not has_camp_info:
+        if not any(isinstance(ext.get("url"), str) and "camp-information" in ext["url"]
+                   for ext in json_objects(address.get("extension"))):
             self.warnings.append("Address: Rohingya refugee address should include camp information")
     
-    def _validate_practitioner(self, resource: Dict[str, Any]):
+    def _validate_practitioner(self, resource: Dict[str, Any], plan: RulePlan, extensions: Dict[str, Dict]):
         """Validate Practitioner resource with BMDC registration"""
-        profile = self.zarish_profiles["Practitioner"]
-        
-        # Validate BMDC registration extension
-        extensions = resource.get("extension", [])
-        bmdc_ext = None
-        
-        for ext in extensions:
-            if "bmdc-registration" in ext.get("url", ""):
-                bmdc_ext = ext
-                break
-        
+        bmdc_ext = extensions.get("bmdc-registration")
         if not bmdc_ext:
             self.errors.append("Practitioner: Missing bmdc-registration extension")
             return
         
         # Extract BMDC number from extension
-        bmdc_extensions = bmdc_ext.get("extension", [])
         bmdc_number = None
-        
-        for ext in bmdc_extensions:
+        for ext in json_objects(bmdc_ext.get("extension")):
             if ext.get("url") == "bmdcNumber":
                 bmdc_number = ext.get("valueString")
                 break
@@ -291,45 +470,28 @@ class FHIRValidator:
             self.errors.append("Practitioner: Missing BMDC number in extension")
             return
         
-        if not re.match(profile["bmdc_pattern"], bmdc_number):
+        if not isinstance(bmdc_number, str) or not plan.patterns["bmdc_pattern"].match(bmdc_number):
             self.errors.append(f"Practitioner: Invalid BMDC number format '{bmdc_number}'")
     
-    def _validate_encounter(self, resource: Dict[str, Any]):
+    def _validate_encounter(self, resource: Dict[str, Any], plan: RulePlan, extensions: Dict[str, Dict]):
         """Validate Encounter resource"""
-        profile = self.zarish_profiles["Encounter"]
-        
-        # Validate service type extension
-        extensions = resource.get("extension", [])
-        service_type_ext = None
-        
-        for ext in extensions:
-            if "service-type" in ext.get("url", ""):
-                service_type_ext = ext
-                break
-        
+        service_type_ext = extensions.get("service-type")
         if not service_type_ext:
             self.errors.append("Encounter: Missing service-type extension")
             return
         
-        service_type_value = service_type_ext.get("valueCodeableConcept", {})
-        service_type_coding = service_type_value.get("coding", [])
-        
-        if service_type_coding:
-            service_type_code = service_type_coding[0].get("code")
-            if service_type_code not in profile["service_types"]:
+        service_type_coding = first_coding(service_type_ext.get("valueCodeableConcept"))
+        if service_type_coding is not None:
+            service_type_code = service_type_coding.get("code")
+            if not is_member(service_type_code, plan.codes["service_types"]):
                 self.errors.append(f"Encounter: Invalid service type '{service_type_code}'")
     
-    def _validate_observation(self, resource: Dict[str, Any]):
+    def _validate_observation(self, resource: Dict[str, Any], plan: RulePlan, extensions: Dict[str, Dict]):
         """Validate Observation resource"""
-        profile = self.zarish_profiles["Observation"]
-        
-        # Validate code system
-        code = resource.get("code", {})
-        coding = code.get("coding", [])
-        
-        if coding:
-            code_system = coding[0].get("system", "")
-            if code_system not in profile["code_systems"]:
+        coding = first_coding(resource.get("code"))
+        if coding is not None:
+            code_system = coding.get("system", "")
+            if not is_member(code_system, plan.codes["code_systems"]):
                 self.warnings.append(f"Observation: Unknown code system '{code_system}'")
         
         # Validate value type
@@ -342,120 +504,182 @@ class FHIRValidator:
             if not isinstance(value, dict) or "coding" not in value:
                 self.errors.append("Observation: Invalid valueCodeableConcept structure")
     
-    def _validate_medication_request(self, resource: Dict[str, Any]):
+    def _validate_medication_request(self, resource: Dict[str, Any], plan: RulePlan, extensions: Dict[str, Dict]):
         """Validate MedicationRequest resource"""
-        profile = self.zarish_profiles["MedicationRequest"]
-        
-        # Validate intent
-        intent = resource.get("intent", {})
-        if isinstance(intent, dict):
-            intent_coding = intent.get("coding", [])
-            if intent_coding:
-                intent_code = intent_coding[0].get("code")
-                if intent_code not in profile["intent_codes"]:
-                    self.errors.append(f"MedicationRequest: Invalid intent code '{intent_code}'")
-        
-        # Validate category
-        category = resource.get("category", {})
-        if isinstance(category, dict):
-            category_coding = category.get("coding", [])
-            if category_coding:
-                category_code = category_coding[0].get("code")
-                if category_code not in profile["category_codes"]:
-                    self.warnings.append(f"MedicationRequest: Unknown category code '{category_code}'")
-    
-    def _validate_procedure(self, resource: Dict[str, Any]):
-        """Validate Procedure resource"""
-        profile = self.zarish_profiles["Procedure"]
+        intent_code = first_code(resource.get("intent", {}))
+        if intent_code is not NO_CODE and not is_member(intent_code, plan.codes["intent_codes"]):
+            self.errors.append(f"MedicationRequest: Invalid intent code '{intent_code}'")
         
-        # Validate status
+        category_code = first_code(resource.get("category", {}))
+        if category_code is not NO_CODE and not is_member(category_code, plan.codes["category_codes"]):
+            self.warnings.append(f"MedicationRequest: Unknown category code '{category_code}'")
+    
+    def _validate_procedure(self, resource: Dict[str, Any], plan: RulePlan, extensions: Dict[str, Dict]):
+        """Validate Procedure resource"""
         status = resource.get("status")
-        if status not in profile["status_codes"]:
+        if not is_member(status, plan.codes["status_codes"]):
             self.errors.append(f"Procedure: Invalid status '{status}'")
         
-        # Validate code system
-        code = resource.get("code", {})
-        coding = code.get("coding", [])
-        
-        if coding:
-            code_system = coding[0].get("system", "")
-            if code_system not in profile["category_codes"]:
+        coding = first_coding(resource.get("code"))
+        if coding is not None:
+            code_system = coding.get("system", "")
+            if not is_member(code_system, plan.codes["category_codes"]):
                 self.warnings.append(f"Procedure: Unknown code system '{code_system}'")
     
-    def _validate_appointment(self, resource: Dict[str, Any]):
+    def _validate_appointment(self, resource: Dict[str, Any], plan: RulePlan, extensions: Dict[str, Dict]):
         """Validate Appointment resource"""
-        profile = self.zarish_profiles["Appointment"]
-        
-        # Validate status
         status = resource.get("status")
-        if status not in profile["status_codes"]:
+        if not is_member(status, plan.codes["status_codes"]):
             self.errors.append(f"Appointment: Invalid status '{status}'")
         
-        # Validate participants
         participants = resource.get("participant", [])
         if not participants:
             self.errors.append("Appointment: Missing participants")
-        else:
-            # Check if at least one participant is required
-            has_required = False
-            for participant in participants:
-                if participant.get("status") == "accepted":
-                    has_required = True
-                    break
-            
-            if not has_required:
-                self.warnings.append("Appointment: No accepted participants found")
+        elif not any(participant.get("status") == "accepted" for participant in json_objects(participants)):
+            self.warnings.append("Appointment: No accepted participants found")
     
-    def _validate_diagnostic_report(self, resource: Dict[str, Any]):
+    def _validate_diagnostic_report(self, resource: Dict[str, Any], plan: RulePlan, extensions: Dict[str, Dict]):
         """Validate DiagnosticReport resource"""
-        profile = self.zarish_profiles["DiagnosticReport"]
-        
-        # Validate status
         status = resource.get("status")
-        if status not in profile["status_codes"]:
+        if not is_member(status, plan.codes["status_codes"]):
             self.errors.append(f"DiagnosticReport: Invalid status '{status}'")
         
-        # Validate category
         category = resource.get("category", [])
-        if category:
-            category_coding = category[0].get("coding", [])
-            if category_coding:
-                category_code = category_coding[0].get("code")
-                if category_code not in profile["category_codes"]:
-                    self.warnings.append(f"DiagnosticReport: Unknown category code '{category_code}'")
-    
+        if isinstance(category, list) and category:
+            category_code = first_code(category[0])
+            if category_code is not NO_CODE and not is_member(category_code, plan.codes["category_codes"]):
+                self.warnings.append(f"DiagnosticReport: Unknown category code '{category_code}'")
+
     def get_validation_report(self) -> str:
-        """Generate validation report"""
-        report = []
-        
-        if self.errors:
-            report.append("❌ ERRORS:")
-            for error in self.errors:
-                report.append(f"  - {error}")
-        
-        if self.warnings:
-            report.append("⚠️  WARNINGS:")
-            for warning in self.warnings:
-                report.append(f"  - {warning}")
-        
-        if not self.errors and not self.warnings:
-            report.append("✅ Validation passed successfully!")
+        """Generate validation report for the last validated resource"""
+        return format_report(self.errors, self.warnings)
+
+CHUNK_SIZE = 64
+NDJSON_SEGMENT_LINES = 1024
+
+# A file path, or an NDJSON (path, byte offset, first line, line count) segment
+WorkUnit = Union[str, Tuple[str, int, int, int]]
+
+_worker_validator = None
+
+def _init_worker(profiles: Optional[ProfileSet]):
+    """Worker initializer: build the process's validator around the compiled profiles"""
+    global _worker_validator
+    _worker_validator = FHIRValidator(profiles)
+
+def _validate_chunk(units: List[WorkUnit]) -> List[ValidationResult]:
+    """Worker: validate a batch of work units with the process's own validator"""
+    results = []
+    for unit in units:
+        if isinstance(unit, str):
+            records = read_resources(unit)
+        else:
+            path, offset, first_line, line_count = unit
+            records = read_resources(path, offset, first_line, line_count)
+        results.extend(_worker_validator.validate_records(records))
+    return results
+
+def plan_chunks(paths: Iterable[Path], chunk_size: int = CHUNK_SIZE,
+                segment_lines: int = NDJSON_SEGMENT_LINES) -> Iterator[List[WorkUnit]]:
+    """Batch files into chunks; NDJSON files are split into line segments of their own"""
+    chunk: List[WorkUnit] = []
+    for path in paths:
+        path = str(path)
+        if not is_ndjson(path):
+            chunk.append(path)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+            continue
+        if chunk:
+            yield chunk
+            chunk = []
+        for offset, first_line, line_count in ndjson_segments(path, segment_lines):
+            yield [(path, offset, first_line, line_count)]
+    if chunk:
+        yield chunk
+
+def validate_files_parallel(paths: Iterable[Path], jobs: int, profiles: Optional[ProfileSet] = None,
+                            chunk_size: int = CHUNK_SIZE) -> Iterator[ValidationResult]:
+    """Validate files across worker processes, yielding results in input order
+
+    Paths are batched lazily and only ``2 * jobs`` batches are in flight, so
+    memory stays bounded however many files there are; large NDJSON exports
+    are split by line so they spread across workers too. Closing the iterator
+    early (``--fail-fast``/``--max-errors``) cancels the batches not yet started.
+    """
+    chunks = plan_chunks(paths, chunk_size)
+    in_flight = deque()
+    pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(profiles,))
+    try:
+        while True:
+            while len(in_flight) < 2 * jobs:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                in_flight.append(pool.submit(_validate_chunk, chunk))
+            if not in_flight:
+                return
+            yield from in_flight.popleft().result()
+    finally:
+        for future in in_flight:
+            future.cancel()
+        pool.shutdown(wait=True)
+
+def report_results(results: Iterator[ValidationResult], args) -> int:
+    """Print failed resources and a summary; return the exit code"""
+    summary = ValidationSummary()
+    stopped = False
+    
+    for result in results:
+        summary.add(result)
+        name = Path(result.source).name
         
-        return "\n".join(report)
+        if result.valid:
+            logger.info(f"✅ {name}")
+        else:
+            logger.error(f"❌ {name}")
+            print(f"\nValidation errors in {name}:")
+            print(result.report())
+            print("-" * 50)
+        
+        if (args.fail_fast and summary.failed) or (args.max_errors and summary.errors >= args.max_errors):
+            stopped = True
+            break
+    results.close()
+    
+    print(f"\n📊 Summary:")
+    if stopped:
+        print(f"  Stopped early after {summary.total} resources")
+    print(f"  Total resources: {summary.total}")
+    print(f"  Passed: {summary.passed}")
+    print(f"  Failed: {summary.failed}")
+    print(f"  Success rate: {summary.success_rate:.1f}%")
+    
+    return 0 if summary.failed == 0 and not stopped else 1
 
 def main():
     """Main function"""
     parser = argparse.ArgumentParser(description="Validate FHIR resources for ZARISH HIS")
-    parser.add_argument("--file", help="Path to FHIR resource file")
+    parser.add_argument("--file", help="Path to a FHIR resource, Bundle or NDJSON file")
     parser.add_argument("--directory", help="Path to directory containing FHIR resources")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Number of worker processes for --directory runs (default: 1)")
+    parser.add_argument("--fail-fast", action="store_true", help="Stop at the first resource that fails")
+    parser.add_argument("--max-errors", type=int, help="Stop once this many errors have been reported")
+    parser.add_argument("--profiles", default=str(DEFAULT_PROFILES_DIR),
+                        help="Directory of StructureDefinition, ValueSet and CodeSystem files")
+    parser.add_argument("--no-profiles", action="store_true",
+                        help="Only apply the built-in rules, ignoring the StructureDefinitions")
     
     args = parser.parse_args()
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    validator = FHIRValidator()
+    profiles = None if args.no_profiles else load_profiles(args.profiles)
+    validator = FHIRValidator(profiles)
     
     if args.file:
         # Validate single file
@@ -464,17 +688,25 @@ def main():
             sys.exit(1)
         
         try:
-            with open(args.file, 'r', encoding='utf-8') as f:
-                resource = json.load(f)
+            results = validator.validate_files([args.file])
+            first = next(results, None)
             
-            success = validator.validate_resource(resource)
-            print(validator.get_validation_report())
+            if first is None:
+                # An empty Bundle or NDJSON file: nothing failed, as before streaming
+                print(format_report((), (f"No resources found in {args.file}",)))
+                sys.exit(0)
             
-            sys.exit(0 if success else 1)
+            if first.source == args.file:
+                # A single resource: print its report as is
+                print(first.report())
+                sys.exit(0 if first.valid else 1)
             
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in {args.file}: {e}")
-            sys.exit(1)
+            def all_results():
+                # Bundle entries or NDJSON lines: report each resource
+                yield first
+                yield from results
+            
+            sys.exit(report_results(all_results(), args))
         except Exception as e:
             logger.error(f"Error processing {args.file}: {e}")
             sys.exit(1)
@@ -485,39 +717,13 @@ def main():
             logger.error(f"Directory not found: {args.directory}")
             sys.exit(1)
         
-        total_files = 0
-        passed_files = 0
-        
-        for file_path in Path(args.directory).rglob("*.json"):
-            total_files += 1
-            
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    resource = json.load(f)
-                
-                success = validator.validate_resource(resource)
-                
-                if success:
-                    passed_files += 1
-                    logger.info(f"✅ {file_path.name}")
-                else:
-                    logger.error(f"❌ {file_path.name}")
-                    print(f"\nValidation errors in {file_path.name}:")
-                    print(validator.get_validation_report())
-                    print("-" * 50)
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"❌ {file_path.name}: Invalid JSON - {e}")
-            except Exception as e:
-                logger.error(f"❌ {file_path.name}: {e}")
-        
-        print(f"\n📊 Summary:")
-        print(f"  Total files: {total_files}")
-        print(f"  Passed: {passed_files}")
-        print(f"  Failed: {total_files - passed_files}")
-        print(f"  Success rate: {(passed_files/total_files)*100:.1f}%")
-        
-        sys.exit(0 if passed_files == total_files else 1)
+        # The file walk and the validators are lazy, so only a bounded number of resources are held at a time
+        paths = find_resource_files(args.directory)
+        if args.jobs > 1:
+            results = validate_files_parallel(paths, args.jobs, profiles)
+        else:
+            results = validator.validate_files(paths)
+        sys.exit(report_results(results, args))
     
     else:
         parser.print_help()